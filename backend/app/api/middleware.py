@@ -7,6 +7,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+STREAMING_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson")
+
 async def catch_exceptions_middleware(request: Request, call_next):
     try:
         return await call_next(request)
@@ -46,8 +48,9 @@ def setup_middleware(app):
         
         response = await call_next(request)
         
-        # Ensure JSON content type for API responses
-        if request.url.path.startswith("/api/"):
+        # Ensure JSON content type for API responses (streams keep theirs)
+        content_type = response.headers.get("Content-Type", "")
+        if request.url.path.startswith("/api/") and not content_type.startswith(STREAMING_CONTENT_TYPES):
             response.headers["Content-Type"] = "application/json"
         
         duration = time.time() - start_time
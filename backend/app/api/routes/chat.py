@@ -1,14 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Tuple
-from app.services.graph import get_chat_graph, State, visualize_graph
+from app.services.graph import (
+    get_chat_graph,
+    get_graph_nodes,
+    get_node_connections,
+    State,
+    visualize_graph,
+    GRAPH_NODES
+)
 from app.services.state import StateManager
+from app.services.database import mongodb
 from app.core.config import get_settings, settings
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from app.services.llm import get_llm
 from app.core.exceptions import ValidationError, AgentError
 from app.services.rate_limit import RateLimiter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.core.metrics import GRAPH_HOPS, GRAPH_NODE_LATENCY
+from app.services.agents.cascade import ACCEPTED_EVENT, is_held_run, run_tier
+from typing import AsyncIterator
+import json
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,16 +49,12 @@ class ChatResponse(BaseModel):
     requires_action: Optional[bool] = False
     action_type: Optional[str] = None
     graph_state: Optional[GraphState] = None
+    node_timings: Optional[List[Dict[str, Any]]] = None
 
 def get_chat_model():
     """Initialize and return the chat model."""
     try:
-        model = ChatOpenAI(
-            model=settings.DEFAULT_MODEL,
-            temperature=settings.DEFAULT_TEMPERATURE,
-            api_key=settings.OPENAI_API_KEY
-        )
-        return model
+        return get_llm(settings.DEFAULT_MODEL, settings.DEFAULT_TEMPERATURE)
     except Exception as e:
         logger.error(f"Error initializing chat model: {e}")
         raise HTTPException(
@@ -60,26 +69,7 @@ def get_chat_model():
 async def get_graph_structure():
     """Get the graph structure for visualization"""
     try:
-        # Create a static graph structure
-        graph_state = GraphState(
-            current_node="ROUTER",
-            next_node="",
-            nodes=["ROUTER", "PRODUCT", "TECHNICAL", "CUSTOMER_SERVICE", "HUMAN"],
-            edges=[
-                ["ROUTER", "PRODUCT"],
-                ["ROUTER", "TECHNICAL"],
-                ["ROUTER", "CUSTOMER_SERVICE"],
-                ["ROUTER", "HUMAN"],
-                ["PRODUCT", "CUSTOMER_SERVICE"],
-                ["PRODUCT", "TECHNICAL"],
-                ["TECHNICAL", "PRODUCT"],
-                ["TECHNICAL", "HUMAN"],
-                ["CUSTOMER_SERVICE", "HUMAN"],
-                ["CUSTOMER_SERVICE", "PRODUCT"],
-                ["HUMAN", "ROUTER"]
-            ],
-            requires_action=False
-        )
+        graph_state = GraphState(**_build_graph_state([], None))
 
         # Log the response for debugging
         logger.debug(f"Graph structure response: {graph_state.model_dump()}")
@@ -101,11 +91,8 @@ async def chat(request: ChatRequest):
         # Log the incoming request for debugging
         logger.debug(f"Received chat request: {request}")
         
-        # Initialize chat model
-        chat_model = ChatOpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            model=settings.OPENAI_MODEL
-        )
+        # Enforce per-user rate limits (raises 429 with Retry-After)
+        await rate_limiter.check_rate_limit(request.user_id)
 
         # Validate messages
         if not request.messages:
@@ -114,33 +101,20 @@ async def chat(request: ChatRequest):
                 details={"code": "NO_MESSAGES"}
             )
 
-        # Get the last message only
-        last_message = request.messages[-1]
-        
-        # Convert to LangChain format
-        langchain_messages = [HumanMessage(content=last_message.content)]
-
-        # Get response from model
-        response = await chat_model.ainvoke(langchain_messages)
+        # Run the full conversation through the agent graph
+        initial_state = _initial_state(request)
+        final_state, path, timings = await _run_graph(initial_state)
+        await _persist_turn(initial_state, final_state)
 
-        # Format response
         result = {
             "messages": [
-                {"role": msg.role, "content": msg.content} for msg in request.messages
-            ] + [{"role": "assistant", "content": response.content}],
-            "requires_action": False,
-            "graph_state": {
-                "current_node": "ROUTER",
-                "next_node": "",
-                "nodes": ["ROUTER", "PRODUCT", "TECHNICAL", "CUSTOMER_SERVICE", "HUMAN"],
-                "edges": [
-                    ["ROUTER", "PRODUCT"],
-                    ["ROUTER", "TECHNICAL"],
-                    ["ROUTER", "CUSTOMER_SERVICE"],
-                    ["ROUTER", "HUMAN"]
-                ],
-                "requires_action": False
-            }
+                {"role": role, "content": content}
+                for role, content in final_state.get("messages", [])
+            ],
+            "requires_action": final_state.get("requires_action", False),
+            "action_type": final_state.get("action_type"),
+            "graph_state": _build_graph_state(path, final_state),
+            "node_timings": timings
         }
 
         # Log the response for debugging
@@ -148,6 +122,8 @@ async def chat(request: ChatRequest):
 
         return JSONResponse(content=result)
 
+    except HTTPException:
+        raise
     except ValidationError as e:
         logger.warning(f"Validation error: {e}")
         return JSONResponse(
@@ -161,6 +137,180 @@ async def chat(request: ChatRequest):
             content={"detail": str(e)}
         )
 
+def _initial_state(request: ChatRequest) -> Dict[str, Any]:
+    """Build the graph input from a chat request."""
+    return {
+        "messages": [(msg.role, msg.content) for msg in request.messages],
+        "context": {**(request.context or {}), "user_id": request.user_id},
+        "dialog_state": []
+    }
+
+def _record_node_timing(node: str, seconds: float) -> Dict[str, Any]:
+    """Export a node's execution time and describe it for the client."""
+    GRAPH_NODE_LATENCY.labels(node=node).observe(seconds)
+    logger.info(f"Graph node {node} finished in {seconds * 1000:.1f}ms")
+    return {"node": node, "duration_ms": round(seconds * 1000, 1)}
+
+def _record_hops(path: List[str]) -> None:
+    """Export how many nodes a turn took and whether it skipped the assistant."""
+    if path:
+        entry = "assistant" if path[0] == "ASSISTANT" else "fast_path"
+        GRAPH_HOPS.labels(entry=entry).observe(len(path))
+
+async def _persist_turn(initial_state: Dict[str, Any], final_state: Dict[str, Any]) -> None:
+    """Store the turn's user message and replies when the client names a conversation.
+
+    Writes go through the MongoDB message buffer, so they do not add a
+    database round trip per message to the response.
+    """
+    conversation_id = initial_state.get("context", {}).get("conversation_id")
+    sent = initial_state.get("messages", [])
+    if not conversation_id or not sent or mongodb.db is None:
+        return
+    try:
+        for role, content in sent[-1:] + final_state.get("messages", [])[len(sent):]:
+            await mongodb.add_message(conversation_id, role, content)
+    except Exception as e:
+        logger.error(f"Error storing messages for conversation {conversation_id}: {e}")
+
+async def _run_graph(
+    initial_state: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[str], List[Dict[str, Any]]]:
+    """Run the chat graph, returning the final state, node path and timings.
+
+    Nodes run one after another, so each update's arrival time closes the
+    previous node's timing; timings are recorded as each node finishes.
+    """
+    graph = get_chat_graph()
+    state = dict(initial_state)
+    path: List[str] = []
+    timings: List[Dict[str, Any]] = []
+
+    started = time.perf_counter()
+    async for update in graph.astream(initial_state, stream_mode="updates"):
+        finished = time.perf_counter()
+        for node, values in update.items():
+            if node not in GRAPH_NODES:
+                continue
+            path.append(node)
+            timings.append(_record_node_timing(node, finished - started))
+            state.update(values or {})
+        started = finished
+
+    _record_hops(path)
+    return state, path, timings
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _build_graph_state(path: List[str], final_state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Describe where a graph run ended up for the frontend."""
+    final_state = final_state or {}
+    current_node = path[-1] if path else "ASSISTANT"
+    next_node = final_state.get("next") or ""
+    return {
+        "current_node": current_node,
+        "next_node": next_node if next_node in GRAPH_NODES and next_node != current_node else "",
+        "nodes": get_graph_nodes(),
+        "edges": [list(edge) for edge in get_node_connections()],
+        "requires_action": bool(final_state.get("requires_action", False))
+    }
+
+async def _stream_graph_events(initial_state: Dict[str, Any]) -> AsyncIterator[str]:
+    """Run the chat graph and translate its events into SSE frames."""
+    graph = get_chat_graph()
+    path: List[str] = []
+    timings: List[Dict[str, Any]] = []
+    node_started: Dict[str, float] = {}
+    # Runs the cascade may still discard are held until it keeps one of them,
+    # so rejected tiers and losing hedges never reach the client; every other
+    # run streams live
+    held: Dict[str, List[str]] = {}
+    final_state: Optional[Dict[str, Any]] = None
+
+    try:
+        async for event in graph.astream_events(initial_state, version="v2"):
+            kind = event["event"]
+            name = event.get("name")
+            node = event.get("metadata", {}).get("langgraph_node")
+
+            if kind == "on_chat_model_stream":
+                chunk = event["data"].get("chunk")
+                if chunk is None or not chunk.content:
+                    continue
+                tags = event.get("tags", [])
+                if is_held_run(tags):
+                    held.setdefault(str(event["run_id"]), []).append(chunk.content)
+                    continue
+                token = {"node": node, "content": chunk.content}
+                tier = run_tier(tags)
+                if tier is not None:
+                    token["tier"] = tier
+                yield _sse_event("token", token)
+            elif kind == "on_custom_event" and name == ACCEPTED_EVENT:
+                accepted = event["data"]
+                for content in held.pop(accepted["run_id"], []):
+                    yield _sse_event("token", {"node": node, "content": content, "tier": accepted["tier"]})
+            elif kind == "on_chain_start" and name in GRAPH_NODES and node == name:
+                path.append(name)
+                node_started[name] = time.perf_counter()
+                yield _sse_event("node_start", {"node": name})
+            elif kind == "on_chain_end" and name in GRAPH_NODES and node == name:
+                elapsed = time.perf_counter() - node_started.pop(name, time.perf_counter())
+                timing = _record_node_timing(name, elapsed)
+                timings.append(timing)
+                held.clear()
+                yield _sse_event("node_end", timing)
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # End of the top-level graph run carries the final state
+                final_state = event["data"].get("output")
+
+        final_state = final_state or {}
+        _record_hops(path)
+        await _persist_turn(initial_state, final_state)
+        yield _sse_event("done", {
+            "messages": [
+                {"role": role, "content": content}
+                for role, content in final_state.get("messages", [])
+            ],
+            "requires_action": final_state.get("requires_action", False),
+            "action_type": final_state.get("action_type"),
+            "graph_state": _build_graph_state(path, final_state),
+            "node_timings": timings
+        })
+
+    except Exception as e:
+        logger.error(f"Error streaming chat response: {e}", exc_info=True)
+        yield _sse_event("error", {"detail": str(e)})
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """Process chat messages and stream the response as Server-Sent Events.
+
+    Emits ``node_start``/``node_end`` as agents run (``node_end`` carries
+    the node's ``duration_ms``), ``token`` for each generated chunk and a
+    closing ``done`` event with the final messages, ``graph_state`` and
+    ``node_timings``. Tokens from cascade runs are sent once the cascade
+    accepts that run's answer.
+    """
+    if not request.messages:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": {"code": "NO_MESSAGES", "message": "No messages provided"}}
+        )
+
+    await rate_limiter.check_rate_limit(request.user_id)
+
+    return StreamingResponse(
+        _stream_graph_events(_initial_state(request)),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 @router.get("/visualization")
 async def get_graph_visualization():
     """Get the current graph visualization"""
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, Optional
+from bson import ObjectId
+from app.services.database import mongodb
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+def _encode(document: Dict) -> Any:
+    """Make a Mongo document JSON-serializable."""
+    return jsonable_encoder(document, custom_encoder={ObjectId: str})
+
+def _page_response(page: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "items": [_encode(item) for item in page["items"]],
+        "next_cursor": page["next_cursor"]
+    }
+
+def _invalid(code: str, message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"code": code, "message": message}
+    )
+
+async def _ndjson(documents: AsyncIterator[Dict]) -> AsyncIterator[str]:
+    """Serialize documents as newline-delimited JSON."""
+    try:
+        async for document in documents:
+            yield json.dumps(_encode(document)) + "\n"
+    except Exception as e:
+        logger.error(f"Export stream failed: {e}")
+        yield json.dumps({"error": str(e)}) + "\n"
+
+@router.get("/conversations/{conversation_id}/messages")
+async def list_conversation_messages(
+    conversation_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200)
+) -> Dict[str, Any]:
+    """Page through a conversation's messages, oldest first."""
+    try:
+        page = await mongodb.get_conversation_messages_page(conversation_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise _invalid("INVALID_CURSOR", str(e))
+    return _page_response(page)
+
+@router.get("/conversations/{conversation_id}/messages/export")
+async def export_conversation_messages(conversation_id: str) -> StreamingResponse:
+    """Stream a full conversation as NDJSON without loading it into memory."""
+    return StreamingResponse(
+        _ndjson(mongodb.stream_conversation_messages(conversation_id)),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/users/{user_id}/bookings/{booking_type}")
+async def list_user_bookings(
+    user_id: str,
+    booking_type: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200)
+) -> Dict[str, Any]:
+    """Page through a user's bookings of one type, newest first."""
+    if booking_type not in mongodb.BOOKING_COLLECTIONS:
+        raise _invalid("INVALID_BOOKING_TYPE", f"Invalid booking type: {booking_type}")
+    try:
+        page = await mongodb.get_user_bookings_page(user_id, booking_type, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise _invalid("INVALID_CURSOR", str(e))
+    return _page_response(page)
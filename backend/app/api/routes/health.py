@@ -1,80 +1,25 @@
 from fastapi import APIRouter, Depends
 from typing import Dict
-from datetime import datetime
-from app.services.database import get_db
-from app.services.cache import get_redis
-from motor.motor_asyncio import AsyncIOMotorClient
-from redis import Redis
+from app.services.health import HealthService, get_health_service
 
 router = APIRouter()
 
 @router.get("/health")
-async def health_check() -> Dict:
+async def health_check(health: HealthService = Depends(get_health_service)) -> Dict:
     """Overall system health check"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
-    }
+    return await health.check_all()
 
 @router.get("/health/db")
-async def db_health(db: AsyncIOMotorClient = Depends(get_db)) -> Dict:
+async def db_health(health: HealthService = Depends(get_health_service)) -> Dict:
     """MongoDB health check"""
-    try:
-        # Ping MongoDB
-        await db.admin.command('ping')
-        return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "details": {
-                "connected": True,
-                "latency_ms": 0  # You could implement actual latency measurement
-            }
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "error": str(e)
-        }
+    return await health.run("database", health.check_database)
 
 @router.get("/health/cache")
-async def cache_health(redis: Redis = Depends(get_redis)) -> Dict:
+async def cache_health(health: HealthService = Depends(get_health_service)) -> Dict:
     """Redis health check"""
-    try:
-        # Ping Redis
-        redis.ping()
-        info = redis.info()
-        return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "details": {
-                "connected": True,
-                "used_memory": info["used_memory_human"],
-                "connected_clients": info["connected_clients"],
-                "uptime_days": info["uptime_in_days"]
-            }
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "error": str(e)
-        }
+    return await health.run("cache", health.check_cache)
 
 @router.get("/health/agents")
-async def agents_health() -> Dict:
+async def agents_health(health: HealthService = Depends(get_health_service)) -> Dict:
     """Agent system health check"""
-    # This could be expanded to actually check agent availability
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "agents": {
-            "router": "available",
-            "flight_booking": "available",
-            "hotel_booking": "available",
-            "car_rental": "available",
-            "excursion": "available",
-            "sensitive_workflow": "available"
-        }
-    } 
\ No newline at end of file
+    return await health.run("agents", health.check_agents)
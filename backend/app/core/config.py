@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, validator
 import os
@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     OPENAI_API_KEY: str = Field(..., description="OpenAI API key")
     OPENAI_MODEL: str = Field("gpt-4-turbo-preview", description="OpenAI model to use")
+    OPENAI_BASE_URL: Optional[str] = Field(None, description="Override the OpenAI API base URL (proxies, local fakes)")
 
     # Redis Configuration
     REDIS_ENABLED: bool = False
@@ -24,6 +25,19 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = Field(None, description="Redis password")
     REDIS_TTL: int = Field(3600, description="Redis TTL in seconds")
     REDIS_URL: str = Field("redis://localhost:6379", description="Redis URL")
+    REDIS_MAX_CONNECTIONS: int = Field(50, description="Maximum connections in the Redis pool")
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(30, description="Seconds idle before a pooled connection is re-checked")
+    REDIS_SOCKET_KEEPALIVE: bool = Field(True, description="Enable TCP keepalive on Redis connections")
+    REDIS_SOCKET_TIMEOUT: float = Field(5.0, description="Redis socket connect/read timeout in seconds")
+    REDIS_PROTOCOL: int = Field(2, description="Redis wire protocol (2 = RESP2, 3 = RESP3)")
+    CACHE_SERIALIZER: str = Field("msgpack", description="Cache value serializer (json, orjson, msgpack)")
+    CACHE_COMPRESSION: str = Field("zstd", description="Cache value compression (none, zlib, zstd, lz4)")
+    CACHE_COMPRESSION_THRESHOLD: int = Field(1024, description="Minimum serialized size in bytes before compressing")
+    CACHE_LOCAL_ENABLED: bool = Field(True, description="Keep an in-process cache tier in front of Redis")
+    CACHE_LOCAL_MAX_ENTRIES: int = Field(10000, description="Entries held in the in-process cache tier")
+    CACHE_LOCAL_TTL: float = Field(30.0, description="Seconds an entry may live in the in-process cache tier")
+    CACHE_INVALIDATION_CHANNEL: str = Field("cache:invalidate", description="Redis pub/sub channel for cross-worker invalidation")
+    STATE_MAX_MESSAGES: int = Field(200, description="Messages kept in each user's state log")
 
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = Field(60, description="Rate limit per minute")
@@ -51,6 +65,64 @@ class Settings(BaseSettings):
     MAX_RETRIES: int = Field(3, description="Maximum retries for failed operations")
     CACHE_TTL: int = Field(3600, description="Cache TTL in seconds")
 
+    # LLM Client Configuration
+    LLM_MAX_CONNECTIONS: int = Field(100, description="Maximum open connections to the LLM API")
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = Field(20, description="Idle keep-alive connections to retain")
+    LLM_KEEPALIVE_EXPIRY: float = Field(30.0, description="Seconds an idle connection is kept alive")
+    LLM_REQUEST_TIMEOUT: float = Field(60.0, description="LLM request timeout in seconds")
+    LLM_COALESCE_ENABLED: bool = Field(True, description="Share one upstream call between identical concurrent prompts")
+
+    # LLM Admission Control
+    LLM_MAX_CONCURRENCY: int = Field(32, description="Maximum LLM calls in flight across all models")
+    LLM_MODEL_MAX_CONCURRENCY: int = Field(16, description="Default maximum LLM calls in flight per model")
+    LLM_MODEL_CONCURRENCY: Dict[str, int] = Field({}, description="Per-model overrides of the in-flight cap, as JSON")
+    LLM_TOKENS_PER_MINUTE: int = Field(90000, description="Rolling token budget per minute; 0 disables it")
+    LLM_QUEUE_TIMEOUT: float = Field(30.0, description="Seconds a call may wait for admission before failing")
+
+    # LLM Resilience (retry count is MAX_RETRIES)
+    LLM_RETRY_BASE_DELAY: float = Field(0.5, description="Base delay in seconds for jittered exponential backoff")
+    LLM_RETRY_MAX_DELAY: float = Field(8.0, description="Maximum delay in seconds between retries")
+    LLM_HEDGE_ENABLED: bool = Field(False, description="Send a second request when the first runs past the p95 latency")
+    LLM_HEDGE_MIN_DELAY: float = Field(1.0, description="Minimum seconds before sending a hedged request")
+    LLM_HEDGE_MIN_SAMPLES: int = Field(20, description="Latency samples needed per model before hedging")
+    LLM_BREAKER_FAILURE_THRESHOLD: int = Field(5, description="Consecutive failures that open a model's circuit")
+    LLM_BREAKER_RESET_TIMEOUT: float = Field(30.0, description="Seconds a circuit stays open before a trial call")
+
+    # LLM Model Cascade
+    LLM_CASCADE_ENABLED: bool = Field(True, description="Retry rejected small-model answers on a larger model")
+    LLM_CASCADE_MODEL: Optional[str] = Field(None, description="Escalation model; defaults to OPENAI_MODEL")
+    LLM_CASCADE_MIN_LENGTH: int = Field(10, description="Answers shorter than this many characters are escalated")
+    LLM_MODEL_PRICES: Dict[str, List[float]] = Field(
+        {
+            "gpt-3.5-turbo": [0.0005, 0.0015],
+            "gpt-4-turbo-preview": [0.01, 0.03]
+        },
+        description="Dollar price per 1K [input, output] tokens, used for cost metrics"
+    )
+
+    # LLM Response Cache
+    LLM_CACHE_ENABLED: bool = Field(True, description="Cache LLM responses in Redis")
+    LLM_CACHE_TTL: int = Field(3600, description="Default response cache TTL in seconds")
+    LLM_CACHE_MAX_ENTRIES: int = Field(1000, description="Default cached responses kept per agent type")
+    LLM_CACHE_SEMANTIC_ENABLED: bool = Field(False, description="Enable embedding-similarity cache layer")
+    LLM_CACHE_SIMILARITY_THRESHOLD: float = Field(0.95, description="Minimum cosine similarity for a semantic hit")
+    LLM_CACHE_SEMANTIC_CANDIDATES: int = Field(50, description="Most recent questions per prompt scope compared on a semantic lookup")
+    LLM_CACHE_EMBEDDING_MODEL: str = Field("text-embedding-3-small", description="Embedding model for the semantic layer")
+
+    # Local Routing
+    ROUTER_MODEL_PATH: str = Field("models/router.json", description="Trained routing classifier; empty disables the local tier")
+    ROUTER_CONFIDENCE_THRESHOLD: float = Field(0.9, description="Minimum classifier confidence to route without the LLM")
+    ROUTER_DECISION_LOG: str = Field("logs/routing_decisions.jsonl", description="JSONL log of routing decisions used for training; empty disables it")
+
+    # Agent Graph
+    GRAPH_FAST_PATH_ENABLED: bool = Field(True, description="Enter specialist nodes directly when keyword routing picks one")
+
+    # Conversation Memory
+    MEMORY_MAX_TOKENS: int = Field(2000, description="Token budget for each conversation's memory window")
+    MEMORY_MAX_CONVERSATIONS: int = Field(1000, description="Conversations kept in memory per process")
+    MEMORY_IDLE_TTL: int = Field(3600, description="Seconds before an idle conversation is dropped")
+    MEMORY_SUMMARY_ENABLED: bool = Field(False, description="Summarise messages that leave the window")
+
     # MongoDB Configuration
     MONGODB_HOST: str = Field("localhost", description="MongoDB host")
     MONGODB_PORT: int = Field(27017, description="MongoDB port")
@@ -58,6 +130,9 @@ class Settings(BaseSettings):
     MONGODB_PASSWORD: str = Field("password123", description="MongoDB password")
     MONGODB_DB_NAME: str = Field("agenthub", description="MongoDB database name")
     MONGODB_URL: Optional[str] = None
+    MESSAGE_BATCH_SIZE: int = Field(100, description="Messages written per insert_many batch")
+    MESSAGE_FLUSH_INTERVAL: float = Field(0.5, description="Seconds between write-behind message flushes")
+    MESSAGE_BUFFER_MAX: int = Field(10000, description="Most messages held for writing; the oldest are dropped beyond it")
 
     # Security
     ENCRYPTION_KEY: str = Field(..., description="32-byte encryption key for sensitive data")
@@ -67,6 +142,10 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = Field("development", description="Environment (development/production)")
     DEBUG: bool = Field(True, description="Debug mode")
 
+    # Health Checks
+    HEALTH_CHECK_TIMEOUT: float = Field(2.0, description="Seconds before a single health check is reported as failed")
+    HEALTH_INFO_TTL: float = Field(10.0, description="Seconds to reuse Redis INFO and MongoDB server info between probes")
+
     @validator("OPENAI_API_KEY")
     def validate_openai_api_key(cls, v: str) -> str:
         if not v or v == "your-api-key-here":
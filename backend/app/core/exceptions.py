@@ -19,6 +19,26 @@ class AgentError(BaseError):
     """Errors related to agent operations"""
     pass
 
+class CircuitOpenError(AgentError):
+    """Raised without calling upstream while a model's circuit is open"""
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(
+            message=f"LLM calls to {model} are paused after repeated failures",
+            code="LLM_UNAVAILABLE",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"model": model, "retry_after": round(retry_after, 1)}
+        )
+
+class AdmissionTimeoutError(AgentError):
+    """Raised when an LLM call waits too long for local admission"""
+    def __init__(self, model: str, waited: float):
+        super().__init__(
+            message=f"LLM calls to {model} are queued beyond capacity",
+            code="LLM_OVERLOADED",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"model": model, "waited": round(waited, 1)}
+        )
+
 class StateError(BaseError):
     """Errors related to state management"""
     pass
@@ -36,6 +36,131 @@ LLM_LATENCY = Histogram(
     ['agent_type']
 )
 
+LLM_COALESCED = Counter(
+    'app_llm_coalesced_total',
+    'LLM calls that joined an identical in-flight call instead of calling upstream',
+    ['agent_type']
+)
+
+LLM_QUEUE_WAIT = Histogram(
+    'app_llm_queue_wait_seconds',
+    'Time LLM calls wait for admission, by priority class',
+    ['priority'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+LLM_IN_FLIGHT = Gauge(
+    'app_llm_in_flight',
+    'LLM calls currently admitted'
+)
+
+LLM_RETRIES = Counter(
+    'app_llm_retries_total',
+    'LLM call retries by model and error type',
+    ['model', 'reason']
+)
+
+LLM_HEDGES = Counter(
+    'app_llm_hedges_total',
+    'Hedged LLM requests sent after the first ran past the p95 latency',
+    ['model']
+)
+
+LLM_CIRCUIT_STATE = Gauge(
+    'app_llm_circuit_state',
+    'LLM circuit breaker state per model (0 closed, 1 half-open, 2 open)',
+    ['model']
+)
+
+LLM_TIER_LATENCY = Histogram(
+    'app_llm_tier_latency_seconds',
+    'LLM call latency per cascade tier, including queueing and retries',
+    ['agent_type', 'model']
+)
+
+LLM_TIER_COST = Counter(
+    'app_llm_cost_dollars_total',
+    'Estimated LLM spend per cascade tier',
+    ['agent_type', 'model']
+)
+
+LLM_CASCADE_ESCALATIONS = Counter(
+    'app_llm_cascade_escalations_total',
+    'Answers rejected by the cascade verifier and retried on a larger model',
+    ['agent_type', 'reason']
+)
+
+GRAPH_NODE_LATENCY = Histogram(
+    'app_graph_node_latency_seconds',
+    'Execution time of each agent graph node',
+    ['node']
+)
+
+GRAPH_HOPS = Histogram(
+    'app_graph_hops_per_turn',
+    'Graph nodes executed for one conversation turn',
+    ['entry'],
+    buckets=(1, 2, 3, 4, 5, 10)
+)
+
+MESSAGE_BUFFER_DEPTH = Gauge(
+    'app_message_buffer_depth',
+    'Messages waiting in the write-behind buffer'
+)
+
+MESSAGES_FLUSHED = Counter(
+    'app_messages_flushed_total',
+    'Messages flushed from the write-behind buffer',
+    ['status']
+)
+
+CACHE_LOOKUPS = Counter(
+    'app_cache_lookups_total',
+    'Cache lookups by tier (local, redis) and result (hit, miss)',
+    ['tier', 'result']
+)
+
+STATE_WRITES = Counter(
+    'app_state_writes_total',
+    'Conversation state writes by result (ok, conflict)',
+    ['result']
+)
+
+STATE_LOCK_WAIT = Histogram(
+    'app_state_lock_wait_seconds',
+    'Time spent waiting for a per-conversation state lock',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+
+LLM_CACHE_HITS = Counter(
+    'app_llm_cache_hits_total',
+    'Total number of LLM response cache hits',
+    ['agent_type', 'layer']
+)
+
+LLM_CACHE_MISSES = Counter(
+    'app_llm_cache_misses_total',
+    'Total number of LLM response cache misses',
+    ['agent_type']
+)
+
+ROUTER_CONFIDENCE = Histogram(
+    'app_router_confidence',
+    'Local routing classifier confidence by outcome (local, fallback)',
+    ['outcome'],
+    buckets=(0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99, 1.0)
+)
+
+MEMORY_CONVERSATIONS = Gauge(
+    'app_memory_conversations',
+    'Number of conversations held in agent memory'
+)
+
+MEMORY_TOKENS = Gauge(
+    'app_memory_tokens',
+    'Estimated tokens held in agent memory across all conversations'
+)
+
 def track_request_metrics():
     """Decorator to track request metrics."""
     def decorator(func: Callable) -> Callable:
@@ -1,9 +1,12 @@
 from fastapi import FastAPI
-from app.api.routes import chat, health
+from app.api.routes import chat, conversations, health
 from app.api.middleware import setup_middleware
 from app.core.config import settings
 from app.services.cache import get_cache
 from app.services.database import mongodb
+from app.services.graph import warm_up_graphs
+from app.services.agents.routing_model import close_decision_log, configure_decision_log
+from app.services.llm import close_llm_clients
 import logging
 
 # Configure logging
@@ -21,6 +24,7 @@ setup_middleware(app)
 
 # Include routers
 app.include_router(chat.router, prefix=settings.API_V1_STR)
+app.include_router(conversations.router, prefix=settings.API_V1_STR, tags=["Conversations"])
 app.include_router(health.router, prefix="/api/v1", tags=["Health"])
 
 # Add after router includes
@@ -39,6 +43,13 @@ async def startup_event():
         app.state.cache = cache
         logger.info("Cache service initialized")
         
+        # Start recording routing decisions for classifier training
+        configure_decision_log()
+
+        # Compile agent graphs once so requests skip construction
+        warm_up_graphs()
+        logger.info("Agent graphs compiled")
+        
         # Initialize MongoDB
         await mongodb.connect()
         logger.info("MongoDB connection initialized")
@@ -53,6 +64,10 @@ async def shutdown_event():
         if hasattr(app.state, 'cache'):
             await app.state.cache.close()
             logger.info("Cache connection closed")
+        await close_llm_clients()
+        close_decision_log()
+        # Write buffered chat messages before the client goes away
+        await mongodb.flush_messages()
         await mongodb.close()
         logger.info("MongoDB connection closed")
     except Exception as e:
@@ -0,0 +1,218 @@
+from typing import Counter as CounterType, Deque, Dict, List, Optional
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from app.core.config import settings
+from app.core.exceptions import AdmissionTimeoutError
+from app.core.metrics import LLM_IN_FLIGHT, LLM_QUEUE_WAIT
+import asyncio
+import heapq
+import itertools
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Lower values are admitted first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "model", "tokens", "future")
+
+    def __init__(self, priority: int, seq: int, model: str, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.model = model
+        self.tokens = tokens
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+class Ticket:
+    """An admitted LLM call; reports actual token usage back to the budget."""
+
+    __slots__ = ("_controller", "_entry")
+
+    def __init__(self, controller: "AdmissionController", entry: List[float]):
+        self._controller = controller
+        self._entry = entry
+
+    def record_usage(self, tokens: int) -> None:
+        """Replace the admission-time estimate with the tokens actually used."""
+        self._controller._settle(self._entry, tokens)
+
+class AdmissionController:
+    """Bounds in-flight LLM calls globally, per model and per token budget.
+
+    Calls wait in a priority queue (then arrival order) until there is a
+    free global slot, a free slot for their model and room in the rolling
+    one-minute token budget. A call blocked only by its model's cap does
+    not hold up calls to other models; a call blocked by the token budget
+    holds up everything behind it, so lower priorities cannot starve it.
+    """
+
+    WINDOW = 60.0
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        model_concurrency: Optional[int] = None,
+        model_overrides: Optional[Dict[str, int]] = None,
+        tokens_per_minute: Optional[int] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.model_concurrency = model_concurrency or settings.LLM_MODEL_MAX_CONCURRENCY
+        self.model_overrides = (
+            settings.LLM_MODEL_CONCURRENCY if model_overrides is None else model_overrides
+        )
+        self.tokens_per_minute = (
+            settings.LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        )
+        self.queue_timeout = settings.LLM_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+
+        self._active = 0
+        self._active_by_model: CounterType[str] = Counter()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        # [admitted_at, tokens] per call inside the budget window
+        self._usage: Deque[List[float]] = deque()
+        self._used_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def model_limit(self, model: str) -> int:
+        return self.model_overrides.get(model, self.model_concurrency)
+
+    @asynccontextmanager
+    async def acquire(self, model: str, tokens: int, priority: int = PRIORITY_NORMAL):
+        """Wait for admission, then hold a slot for the duration of the block.
+
+        Raises ``AdmissionTimeoutError`` if not admitted within ``queue_timeout``.
+        This is local congestion, so it is not retried and does not count
+        against the model's circuit breaker.
+        """
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(priority, next(self._seq), model, tokens, future)
+        heapq.heappush(self._waiters, waiter)
+        self._dispatch()
+
+        try:
+            entry = await asyncio.wait_for(future, self.queue_timeout or None)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # Admitted as we gave up: hand the slot straight back
+                self._release(model)
+            else:
+                future.cancel()
+                self._dispatch()
+            if isinstance(e, asyncio.TimeoutError):
+                raise AdmissionTimeoutError(model, time.monotonic() - start) from e
+            raise
+
+        LLM_QUEUE_WAIT.labels(priority=PRIORITY_NAMES.get(priority, str(priority))).observe(
+            time.monotonic() - start
+        )
+        try:
+            yield Ticket(self, entry)
+        finally:
+            self._release(model)
+
+    def _dispatch(self) -> None:
+        """Admit queued calls in priority order while capacity allows."""
+        now = time.monotonic()
+        deferred = []
+        while self._waiters and self._active < self.max_concurrency:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.future.done():
+                continue
+            if self._active_by_model[waiter.model] >= self.model_limit(waiter.model):
+                deferred.append(waiter)
+                continue
+            wait = self._budget_wait(waiter.tokens, now)
+            if wait > 0:
+                deferred.append(waiter)
+                self._schedule(wait)
+                break
+            self._admit(waiter, now)
+
+        for waiter in deferred:
+            heapq.heappush(self._waiters, waiter)
+
+    def _admit(self, waiter: _Waiter, now: float) -> None:
+        self._active += 1
+        self._active_by_model[waiter.model] += 1
+        entry = [now, waiter.tokens]
+        self._usage.append(entry)
+        self._used_tokens += waiter.tokens
+        LLM_IN_FLIGHT.set(self._active)
+        waiter.future.set_result(entry)
+
+    def _release(self, model: str) -> None:
+        self._active -= 1
+        self._active_by_model[model] -= 1
+        if not self._active_by_model[model]:
+            del self._active_by_model[model]
+        LLM_IN_FLIGHT.set(self._active)
+        self._dispatch()
+
+    def _expire(self, now: float) -> None:
+        while self._usage and self._usage[0][0] <= now - self.WINDOW:
+            self._used_tokens -= self._usage.popleft()[1]
+
+    def _budget_wait(self, tokens: int, now: float) -> float:
+        """Seconds until ``tokens`` fit in the budget; 0 when they fit now."""
+        if self.tokens_per_minute <= 0:
+            return 0.0
+        self._expire(now)
+        # A call larger than the whole budget runs alone rather than never
+        if self._used_tokens + tokens <= self.tokens_per_minute or not self._usage:
+            return 0.0
+
+        excess = self._used_tokens + tokens - self.tokens_per_minute
+        for admitted_at, used in self._usage:
+            excess -= used
+            if excess <= 0:
+                return admitted_at + self.WINDOW - now
+        return self.WINDOW
+
+    def _settle(self, entry: List[float], tokens: int) -> None:
+        # Entries that already left the window no longer count
+        if entry[0] > time.monotonic() - self.WINDOW:
+            self._used_tokens += tokens - entry[1]
+            entry[1] = tokens
+            self._dispatch()
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None and not self._timer.cancelled():
+            if self._timer.when() <= asyncio.get_running_loop().time() + delay:
+                return
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "active": self._active,
+            "active_by_model": dict(self._active_by_model),
+            "queued": sum(1 for waiter in self._waiters if not waiter.future.done()),
+            "tokens_in_window": self._used_tokens,
+            "tokens_per_minute": self.tokens_per_minute
+        }
+
+_admission: Optional[AdmissionController] = None
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide LLM admission controller."""
+    global _admission
+
+    if _admission is None:
+        _admission = AdmissionController()
+    return _admission
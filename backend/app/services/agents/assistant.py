@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from app.services.agents.base import BaseAgent
+from app.services.agents.intents import ROUTING_INTENTS
 from datetime import datetime
 import re
 
@@ -22,74 +23,53 @@ class AssistantAgent(BaseAgent):
     Additional context: {additional_context}
     """
 
-    def _determine_next_agent(self, user_message: str) -> str:
+    def determine_next_agent(self, user_message: str) -> str:
         """Determine which specialized agent should handle the request."""
-        message_lower = user_message.lower()
-        
-        # Flight-related keywords
-        if any(keyword in message_lower for keyword in [
-            "flight", "plane", "airport", "airline", "travel"
-        ]):
-            return "FLIGHT"
-            
-        # Hotel-related keywords
-        if any(keyword in message_lower for keyword in [
-            "hotel", "room", "accommodation", "stay", "resort"
-        ]):
-            return "HOTEL"
-            
-        # Car rental keywords
-        if any(keyword in message_lower for keyword in [
-            "car", "vehicle", "rental", "drive"
-        ]):
-            return "CAR_RENTAL"
-            
-        # Excursion keywords
-        if any(keyword in message_lower for keyword in [
-            "tour", "activity", "excursion", "visit", "sightseeing"
-        ]):
-            return "EXCURSION"
-            
-        # Sensitive workflow keywords
-        if any(keyword in message_lower for keyword in [
-            "payment", "credit card", "personal", "sensitive", "private"
-        ]):
-            return "SENSITIVE"
-            
-        return "NONE"  # Handle directly if no specific agent needed
+        # Single pass over the message; FLIGHT > HOTEL > CAR_RENTAL > EXCURSION > SENSITIVE
+        return ROUTING_INTENTS.first(user_message) or "NONE"  # NONE: handle directly
+
+    def handoff_context(self, context: Dict[str, Any], next_agent: str = "NONE") -> Dict[str, Any]:
+        """Record the assistant's interaction, and any delegation, in the context."""
+        updated = {**context, "last_assistant_interaction": datetime.utcnow().isoformat()}
+        if next_agent != "NONE":
+            updated["delegated_to"] = next_agent
+        return updated
 
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         try:
             messages = self.format_messages(state["messages"])
             
             # Update conversation memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Get latest user message
             latest_msg = messages[-1].content if messages else ""
             
             # Determine which agent should handle the request
-            next_agent = self._determine_next_agent(latest_msg)
+            next_agent = self.determine_next_agent(latest_msg)
             
             if next_agent == "NONE":
                 # Handle directly if no specialized agent is needed
                 response = await self._safe_llm_call(
-                    messages,
+                    history,
                     system_override=self.SYSTEM_PROMPT.format(
                         user_id=state.get("context", {}).get("user_id", "Unknown"),
                         interaction_history=self._format_interaction_history(messages),
                         additional_context=self.format_context(state.get("context", {}))
-                    )
+                    ),
+                    prompt_scope=self.prompt_scope(state)
                 )
                 
+                if not response:
+                    response = ("I apologize, but I'm having trouble processing your request. "
+                                "Please try again in a moment.")
+                
                 return {
                     "messages": state["messages"] + [("assistant", response)],
                     "next": "NONE",
                     "requires_action": False,
-                    "context": {
-                        **state.get("context", {}),
-                        "last_assistant_interaction": datetime.utcnow().isoformat()
-                    }
+                    "context": self.handoff_context(state.get("context", {}))
                 }
             
             # Prepare handoff message
@@ -105,11 +85,7 @@ class AssistantAgent(BaseAgent):
                 "messages": state["messages"] + [("assistant", handoff_messages[next_agent])],
                 "next": next_agent,
                 "requires_action": True,
-                "context": {
-                    **state.get("context", {}),
-                    "last_assistant_interaction": datetime.utcnow().isoformat(),
-                    "delegated_to": next_agent
-                }
+                "context": self.handoff_context(state.get("context", {}), next_agent)
             }
             
         except Exception as e:
@@ -1,27 +1,51 @@
-from typing import Dict, Any, List, Optional
-from langchain.memory import ConversationBufferMemory
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, Optional, Tuple
+from langchain_core.language_models import BaseChatModel
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema import SystemMessage, HumanMessage, AIMessage, BaseMessage
 from app.core.config import settings
+from app.services.llm import get_llm
+from app.services.response_cache import get_response_cache
+from app.services.single_flight import get_single_flight, prompt_key
+from app.services.admission import PRIORITY_NORMAL, get_admission_controller
+from app.services.resilience import get_resilient_caller
+from app.core.metrics import LLM_CASCADE_ESCALATIONS, LLM_COALESCED, LLM_TIER_COST, LLM_TIER_LATENCY
+from .cascade import DEFAULT_POLICY, CascadePolicy, announce_accepted, call_cost, cascade_models, run_tags
+from app.services.memory import ConversationMemory, approximate_tokens, conversation_scope, get_conversation_memory
+import json
+import time
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
 class BaseAgent:
-    def __init__(self, system_prompt: str = None):
-        self.llm = ChatOpenAI(
-            model=settings.DEFAULT_MODEL,
-            temperature=settings.DEFAULT_TEMPERATURE
-        )
+    # Response cache policy; None falls back to the LLM_CACHE_* settings
+    # and a TTL of 0 disables caching for the agent type.
+    RESPONSE_CACHE_TTL: Optional[int] = None
+    RESPONSE_CACHE_MAX_ENTRIES: Optional[int] = None
+    # Admission priority for LLM calls (see app.services.admission)
+    LLM_PRIORITY: int = PRIORITY_NORMAL
+    # Small-to-large model escalation; None uses the LLM_CASCADE_* settings
+    CASCADE_POLICY: Optional[CascadePolicy] = None
+    # Context that varies per user or turn without changing the answer;
+    # left out of response-cache keys, like the last_*_interaction stamps
+    UNSTABLE_CONTEXT_KEYS = frozenset({
+        "user_id", "conversation_id", "delegated_to", "routing_reason", "handoff_reason"
+    })
+
+    def __init__(
+        self,
+        system_prompt: str = None,
+        llm: Optional[BaseChatModel] = None,
+        memory: Optional[ConversationMemory] = None
+    ):
+        # Shared, pooled client unless one is injected
+        self.llm = llm or get_llm()
         
         self.system_prompt = system_prompt or "You are a helpful AI assistant."
         
-        # Initialize memory
-        self.memory = ConversationBufferMemory(
-            return_messages=True,
-            memory_key="chat_history"
-        )
+        # Bounded memory, scoped per conversation and shared across agents
+        self.memory = memory or get_conversation_memory()
 
     def format_messages(self, messages: List[tuple[str, str]]) -> List[BaseMessage]:
         """Convert message tuples to LangChain message objects."""
@@ -35,11 +59,49 @@ class BaseAgent:
                 formatted_messages.append(SystemMessage(content=content))
         return formatted_messages
 
-    def update_memory(self, messages: List[BaseMessage]) -> None:
-        """Update conversation memory with new messages."""
-        for message in messages:
-            if isinstance(message, (HumanMessage, AIMessage)):
-                self.memory.chat_memory.add_message(message)
+    def update_memory(self, messages: List[BaseMessage], state: Optional[Dict[str, Any]] = None) -> None:
+        """Update the conversation's memory with new messages."""
+        self.memory.add_messages(conversation_scope(state), messages)
+
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Process a turn and record the agent's reply in conversation memory."""
+        result = await self.process(state)
+        # A failed reply carries no content; keep it out of memory
+        messages = [(role, content) for role, content in result.get("messages", []) if content]
+        self.update_memory(self.format_messages(messages), state)
+        return result
+
+    async def get_memory_messages(self, state: Optional[Dict[str, Any]] = None) -> List[BaseMessage]:
+        """Get the token-bounded message history for the conversation."""
+        return await self.memory.get_messages(conversation_scope(state))
+
+    def clear_memory(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """Forget the conversation's memory."""
+        self.memory.clear(conversation_scope(state))
+
+    def _format_interaction_history(self, messages: List[BaseMessage]) -> str:
+        """Format previous interactions for context."""
+        history = []
+        for msg in messages[-5:]:  # Only include last 5 messages
+            if isinstance(msg, (HumanMessage, AIMessage)):
+                role = "Customer" if isinstance(msg, HumanMessage) else "Agent"
+                history.append(f"{role}: {msg.content}")
+        return "\n".join(history) if history else "No previous interactions"
+
+    def prompt_scope(self, state: Dict[str, Any]) -> str:
+        """Stable identity of the agent's system prompt for a turn.
+
+        Formatted prompts embed the user id, the current time and routing
+        bookkeeping, so they differ on every call. The scope is the prompt
+        template plus the context that actually shapes the answer.
+        """
+        context = {
+            key: value for key, value in (state.get("context") or {}).items()
+            if key not in self.UNSTABLE_CONTEXT_KEYS
+            and not (key.startswith("last_") and key.endswith("_interaction"))
+        }
+        template = getattr(self, "SYSTEM_PROMPT", None) or self.system_prompt
+        return json.dumps([type(self).__name__, template, context], sort_keys=True, default=str)
 
     def format_context(self, context: Dict[str, Any]) -> str:
         """Format additional context for the prompt."""
@@ -50,22 +112,147 @@ class BaseAgent:
     async def _safe_llm_call(
         self, 
         messages: List[BaseMessage], 
-        system_override: Optional[str] = None
+        system_override: Optional[str] = None,
+        prompt_scope: Optional[str] = None
     ) -> Optional[str]:
-        """Make a safe call to the LLM with retries and error handling."""
+        """Make a safe call to the LLM with retries and error handling.
+
+        ``prompt_scope`` identifies a formatted ``system_override`` for
+        caching (see ``prompt_scope()``); without it the prompt text is used.
+        """
         try:
-            # Add system message at the start
-            system_msg = SystemMessage(content=system_override or self.system_prompt)
-            full_messages = [system_msg] + messages
+            system_prompt = system_override or self.system_prompt
+            scope = prompt_scope or system_prompt
+            agent_type = type(self).__name__
+            model = getattr(self.llm, "model_name", "unknown")
+            cache_ttl = self._response_cache_ttl()
+
+            # Serve repeated questions from the response cache
+            response_cache = get_response_cache() if cache_ttl > 0 else None
+            if response_cache:
+                cached = await response_cache.lookup(agent_type, model, scope, messages)
+                if cached is not None:
+                    return cached
+
+            async def call_llm() -> str:
+                # Add system message at the start
+                system_msg = SystemMessage(content=system_prompt)
+                full_messages = [system_msg] + messages
+
+                content = await self._cascade_call(agent_type, full_messages)
+
+                if response_cache and content:
+                    await response_cache.store(
+                        agent_type,
+                        model,
+                        scope,
+                        messages,
+                        content,
+                        ttl=cache_ttl,
+                        max_entries=self.RESPONSE_CACHE_MAX_ENTRIES or settings.LLM_CACHE_MAX_ENTRIES
+                    )
+                return content
 
-            # Call LLM
-            response = await self.llm.ainvoke(full_messages)
-            return response.content
+            if not settings.LLM_COALESCE_ENABLED:
+                return await call_llm()
+
+            # Identical prompts already in flight share one upstream call
+            temperature = getattr(self.llm, "temperature", None)
+            return await get_single_flight().do(
+                prompt_key(f"{model}:{temperature}", scope, messages),
+                call_llm,
+                on_coalesced=LLM_COALESCED.labels(agent_type=agent_type).inc
+            )
 
         except Exception as e:
             logger.error(f"Error in LLM call: {e}")
             return None
 
+    async def _cascade_call(self, agent_type: str, full_messages: List[BaseMessage]) -> str:
+        """Ask the agent's model, escalating to larger ones when the verifier rejects the answer."""
+        policy = self.CASCADE_POLICY or DEFAULT_POLICY
+        tiers = cascade_models(self.llm, policy)
+        content = None
+        accepted: Optional[Tuple[str, int]] = None
+
+        for tier, llm in enumerate(tiers):
+            last = tier == len(tiers) - 1
+            try:
+                # Only a tier the verifier can still reject is provisional
+                content, run_id = await self._call_model(agent_type, llm, full_messages, tier, provisional=not last)
+                accepted = (run_id, tier)
+            except Exception as e:
+                name = getattr(llm, "model_name", "unknown")
+                if content is not None:
+                    logger.error(f"Escalation to {name} failed, keeping the earlier answer: {e}")
+                    break
+                if last:
+                    raise
+                logger.warning(f"{name} failed, trying the next tier: {e}")
+                continue
+
+            if last:
+                break
+            reasons = policy.verify(content)
+            if not reasons:
+                break
+            for reason in reasons:
+                LLM_CASCADE_ESCALATIONS.labels(agent_type=agent_type, reason=reason).inc()
+            logger.info(f"{agent_type} escalating from {getattr(llm, 'model_name', 'unknown')}: {', '.join(reasons)}")
+
+        if accepted:
+            await announce_accepted(*accepted)
+        return content
+
+    async def _call_model(
+        self,
+        agent_type: str,
+        llm: BaseChatModel,
+        full_messages: List[BaseMessage],
+        tier: int = 0,
+        provisional: bool = False
+    ) -> Tuple[str, str]:
+        """One cascade tier: admission, retries and per-tier latency and cost.
+
+        Returns the answer and the id of the LLM run that produced it.
+        Runs are tagged as held when the answer is ``provisional`` or
+        hedged attempts may race, so streams only forward them once kept.
+        """
+        model = getattr(llm, "model_name", "unknown")
+        estimate = sum(approximate_tokens(msg) for msg in full_messages)
+        resilient_caller = get_resilient_caller()
+        held = provisional or resilient_caller.hedge_delay(model) is not None
+
+        async def attempt():
+            # Each attempt (retry or hedge) is its own tagged run
+            run_id = uuid.uuid4()
+            config = {"run_id": run_id, "tags": run_tags(tier, held)}
+            # Call LLM once admitted under the concurrency and token limits
+            async with get_admission_controller().acquire(model, estimate, self.LLM_PRIORITY) as ticket:
+                response = await llm.ainvoke(full_messages, config=config)
+                usage = getattr(response, "usage_metadata", None)
+                if usage and usage.get("total_tokens"):
+                    ticket.record_usage(usage["total_tokens"])
+                return response, str(run_id)
+
+        start = time.monotonic()
+        # Retries, hedging and the per-model circuit breaker
+        response, run_id = await resilient_caller.call(model, attempt)
+        LLM_TIER_LATENCY.labels(agent_type=agent_type, model=model).observe(time.monotonic() - start)
+
+        cost = call_cost(model, getattr(response, "usage_metadata", None))
+        if cost:
+            LLM_TIER_COST.labels(agent_type=agent_type, model=model).inc(cost)
+        return response.content, run_id
+
+    def _response_cache_ttl(self) -> int:
+        """Resolve the response cache TTL for this agent type."""
+        if not settings.LLM_CACHE_ENABLED:
+            return 0
+        if self.RESPONSE_CACHE_TTL is None:
+            return settings.LLM_CACHE_TTL
+        return self.RESPONSE_CACHE_TTL
+
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Process the current state and return updated state."""
         raise NotImplementedError("Subclasses must implement process method")
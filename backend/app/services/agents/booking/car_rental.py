@@ -1,13 +1,17 @@
 from typing import Dict, Any, List, Optional
 from ..base import BaseAgent
+from ..intents import CAR_TYPES, CAR_FEATURES
+from ..patterns import CAR_RENTAL_PREFERENCES
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 import logging
 from datetime import datetime
-import re
 
 logger = logging.getLogger(__name__)
 
 class CarRentalAgent(BaseAgent):
+    RESPONSE_CACHE_TTL = 600
+    RESPONSE_CACHE_MAX_ENTRIES = 500
+
     SYSTEM_PROMPT = """You are a specialized car rental booking assistant.
     Help users find and book rental cars that match their needs.
     Always:
@@ -49,33 +53,15 @@ class CarRentalAgent(BaseAgent):
             "price_range": None
         }
         
-        message_lower = message.lower()
+        found = CAR_RENTAL_PREFERENCES.scan(message.lower())
         
         # Location analysis
-        location_patterns = [
-            r"in\s+([a-zA-Z\s]+)",
-            r"at\s+([a-zA-Z\s]+)",
-            r"near\s+([a-zA-Z\s]+)"
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                preferences["location"] = match.group(1).strip()
-                break
-        
-        # Car type analysis
-        car_types = ["compact", "sedan", "suv", "luxury", "van"]
-        for car_type in car_types:
-            if car_type in message_lower:
-                preferences["car_type"] = car_type
-                break
+        if "location" in found:
+            preferences["location"] = found["location"].groups[0].strip()
         
-        # Features analysis
-        features = ["automatic", "manual", "gps", "bluetooth", "child seat"]
-        preferences["features"] = [
-            feature for feature in features 
-            if feature in message_lower
-        ]
+        # Car type and features analysis
+        preferences["car_type"] = CAR_TYPES.first(message)
+        preferences["features"] = CAR_FEATURES.match(message)
         
         return preferences
     
@@ -84,7 +70,8 @@ class CarRentalAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Format context for the LLM
             context = {
@@ -109,8 +96,9 @@ class CarRentalAgent(BaseAgent):
             
             # Make LLM call
             response = await self._safe_llm_call(
-                messages,
-                system_override=self.SYSTEM_PROMPT.format(**context)
+                history,
+                system_override=self.SYSTEM_PROMPT.format(**context),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
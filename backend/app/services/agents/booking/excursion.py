@@ -1,13 +1,21 @@
 from typing import Dict, Any, List, Optional
 from ..base import BaseAgent
+from app.services.admission import PRIORITY_LOW
+from ..intents import ACTIVITY_TYPES, EXCURSION_INTERESTS
+from ..patterns import EXCURSION_PREFERENCES
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 import logging
 from datetime import datetime
-import re
 
 logger = logging.getLogger(__name__)
 
 class ExcursionAgent(BaseAgent):
+    # Browsing for activities can wait behind bookings and support
+    LLM_PRIORITY = PRIORITY_LOW
+
+    RESPONSE_CACHE_TTL = 1800
+    RESPONSE_CACHE_MAX_ENTRIES = 1000
+
     SYSTEM_PROMPT = """You are a specialized excursion and trip planning assistant.
     Help users discover and book exciting activities and experiences.
     Always:
@@ -51,52 +59,19 @@ class ExcursionAgent(BaseAgent):
             "duration": None
         }
         
-        message_lower = message.lower()
+        found = EXCURSION_PREFERENCES.scan(message.lower())
         
         # Location analysis
-        location_patterns = [
-            r"in\s+([a-zA-Z\s]+)",
-            r"at\s+([a-zA-Z\s]+)",
-            r"near\s+([a-zA-Z\s]+)",
-            r"around\s+([a-zA-Z\s]+)"
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                preferences["location"] = match.group(1).strip()
-                break
-        
-        # Activity type analysis
-        activity_types = [
-            "sightseeing", "adventure", "cultural", "food", 
-            "nature", "sports", "relaxation", "shopping"
-        ]
-        for activity in activity_types:
-            if activity in message_lower:
-                preferences["activity_type"] = activity
-                break
+        if "location" in found:
+            preferences["location"] = found["location"].groups[0].strip()
         
-        # Interest analysis
-        interests = [
-            "history", "art", "music", "outdoor", "wine", 
-            "photography", "architecture", "local"
-        ]
-        preferences["interests"] = [
-            interest for interest in interests 
-            if interest in message_lower
-        ]
+        # Activity type and interest analysis
+        preferences["activity_type"] = ACTIVITY_TYPES.first(message)
+        preferences["interests"] = EXCURSION_INTERESTS.match(message)
         
         # Duration analysis
-        duration_patterns = [
-            r"(\d+)\s*(day|hour|week)s?",
-            r"half[- ]day",
-            r"full[- ]day"
-        ]
-        for pattern in duration_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                preferences["duration"] = match.group(0)
-                break
+        if "duration" in found:
+            preferences["duration"] = found["duration"].text
         
         return preferences
     
@@ -105,7 +80,8 @@ class ExcursionAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Format context for the LLM
             context = {
@@ -130,8 +106,9 @@ class ExcursionAgent(BaseAgent):
             
             # Make LLM call
             response = await self._safe_llm_call(
-                messages,
-                system_override=self.SYSTEM_PROMPT.format(**context)
+                history,
+                system_override=self.SYSTEM_PROMPT.format(**context),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
@@ -1,5 +1,6 @@
 from typing import Dict, Any, List, Optional
 from ..base import BaseAgent
+from ..intents import FLIGHT_BOOKING_INTENTS
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 import logging
 from datetime import datetime
@@ -7,6 +8,10 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 class FlightBookingAgent(BaseAgent):
+    # Fares and availability change quickly
+    RESPONSE_CACHE_TTL = 300
+    RESPONSE_CACHE_MAX_ENTRIES = 500
+
     SYSTEM_PROMPT = """You are a specialized flight booking assistant.
     Help users with flight bookings, updates, and cancellations.
     Always:
@@ -40,37 +45,16 @@ class FlightBookingAgent(BaseAgent):
     
     def _analyze_booking_intent(self, message: str) -> Dict[str, Any]:
         """Analyze booking intent from message."""
-        intents = {
-            "new_booking": False,
-            "modification": False,
-            "cancellation": False,
-            "information": False
-        }
-        
-        # New booking patterns
-        if any(word in message.lower() for word in ["book", "reserve", "new flight", "schedule"]):
-            intents["new_booking"] = True
-            
-        # Modification patterns
-        if any(word in message.lower() for word in ["change", "modify", "reschedule", "update"]):
-            intents["modification"] = True
-            
-        # Cancellation patterns
-        if any(word in message.lower() for word in ["cancel", "refund", "void"]):
-            intents["cancellation"] = True
-            
-        # Information patterns
-        if any(word in message.lower() for word in ["info", "detail", "status", "when", "what time"]):
-            intents["information"] = True
-            
-        return intents
+        matched = FLIGHT_BOOKING_INTENTS.match(message)
+        return {intent: intent in matched for intent in FLIGHT_BOOKING_INTENTS.intents}
     
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         try:
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Format context for the LLM
             context = {
@@ -95,8 +79,9 @@ class FlightBookingAgent(BaseAgent):
             
             # Make LLM call
             response = await self._safe_llm_call(
-                messages,
-                system_override=self.SYSTEM_PROMPT.format(**context)
+                history,
+                system_override=self.SYSTEM_PROMPT.format(**context),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
@@ -1,13 +1,17 @@
 from typing import Dict, Any, List, Optional
 from ..base import BaseAgent
+from ..intents import ROOM_TYPES, HOTEL_AMENITIES
+from ..patterns import HOTEL_PREFERENCES
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 import logging
 from datetime import datetime
-import re
 
 logger = logging.getLogger(__name__)
 
 class HotelBookingAgent(BaseAgent):
+    RESPONSE_CACHE_TTL = 600
+    RESPONSE_CACHE_MAX_ENTRIES = 500
+
     SYSTEM_PROMPT = """You are a specialized hotel booking assistant.
     Help users find and book accommodations that match their preferences.
     Always:
@@ -49,33 +53,15 @@ class HotelBookingAgent(BaseAgent):
             "price_range": None
         }
         
-        message_lower = message.lower()
+        found = HOTEL_PREFERENCES.scan(message.lower())
         
         # Location analysis
-        location_patterns = [
-            r"in\s+([a-zA-Z\s]+)",
-            r"at\s+([a-zA-Z\s]+)",
-            r"near\s+([a-zA-Z\s]+)"
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                preferences["location"] = match.group(1).strip()
-                break
-        
-        # Room type analysis
-        room_types = ["single", "double", "suite", "family"]
-        for room_type in room_types:
-            if room_type in message_lower:
-                preferences["room_type"] = room_type
-                break
+        if "location" in found:
+            preferences["location"] = found["location"].groups[0].strip()
         
-        # Amenities analysis
-        amenities = ["wifi", "pool", "gym", "breakfast", "parking"]
-        preferences["amenities"] = [
-            amenity for amenity in amenities 
-            if amenity in message_lower
-        ]
+        # Room type and amenities analysis
+        preferences["room_type"] = ROOM_TYPES.first(message)
+        preferences["amenities"] = HOTEL_AMENITIES.match(message)
         
         return preferences
     
@@ -84,7 +70,8 @@ class HotelBookingAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Format context for the LLM
             context = {
@@ -109,8 +96,9 @@ class HotelBookingAgent(BaseAgent):
             
             # Make LLM call
             response = await self._safe_llm_call(
-                messages,
-                system_override=self.SYSTEM_PROMPT.format(**context)
+                history,
+                system_override=self.SYSTEM_PROMPT.format(**context),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
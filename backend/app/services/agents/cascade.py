@@ -0,0 +1,111 @@
+from typing import Any, Iterable, List, Optional, Sequence
+from langchain_core.callbacks.manager import adispatch_custom_event
+from langchain_core.language_models import BaseChatModel
+from app.core.config import settings
+from .patterns import CASCADE_VERIFIER, PatternSet
+from app.services.llm import get_llm
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every cascade LLM run is tagged with its tier. Runs whose answer may still
+# be discarded (a tier the verifier can reject, or a hedged race) are also
+# tagged as held and the run whose answer is kept is announced with a custom
+# event, so streams forward other runs' tokens live and only hold back the
+# held ones until the accepted run is known (see app.api.routes.chat)
+TIER_TAG_PREFIX = "cascade_tier:"
+HELD_TAG = "cascade_held"
+ACCEPTED_EVENT = "cascade_accepted"
+
+def tier_tag(tier: int) -> str:
+    return f"{TIER_TAG_PREFIX}{tier}"
+
+def run_tags(tier: int, held: bool) -> List[str]:
+    return [tier_tag(tier), HELD_TAG] if held else [tier_tag(tier)]
+
+def run_tier(tags: Iterable[str]) -> Optional[int]:
+    for tag in tags:
+        if tag.startswith(TIER_TAG_PREFIX):
+            return int(tag[len(TIER_TAG_PREFIX):])
+    return None
+
+def is_held_run(tags: Iterable[str]) -> bool:
+    return HELD_TAG in tags
+
+async def announce_accepted(run_id: str, tier: int) -> None:
+    """Tell event streams which LLM run produced the kept answer."""
+    try:
+        await adispatch_custom_event(ACCEPTED_EVENT, {"run_id": run_id, "tier": tier})
+    except RuntimeError:
+        # Not running inside a traced graph run, so nothing is streaming
+        pass
+
+class CascadePolicy:
+    """How an agent escalates from its own (small) model to larger ones.
+
+    ``models`` are tried in order after the agent's model when the
+    verifier rejects an answer; None uses ``LLM_CASCADE_MODEL`` (or
+    ``OPENAI_MODEL``). ``patterns`` adds agent-specific rejection
+    patterns to the shared refusal and uncertainty checks.
+    """
+
+    def __init__(
+        self,
+        models: Optional[Sequence[str]] = None,
+        min_length: Optional[int] = None,
+        patterns: Optional[PatternSet] = None,
+        enabled: bool = True
+    ):
+        self.models = list(models) if models is not None else None
+        self.min_length = settings.LLM_CASCADE_MIN_LENGTH if min_length is None else min_length
+        self.patterns = patterns
+        self.enabled = enabled
+
+    def escalation_models(self) -> List[str]:
+        if self.models is not None:
+            return self.models
+        return [settings.LLM_CASCADE_MODEL or settings.OPENAI_MODEL]
+
+    def verify(self, answer: Optional[str]) -> List[str]:
+        """Reasons to reject an answer; empty when it can be kept."""
+        text = (answer or "").strip()
+        if not text:
+            return ["empty"]
+
+        reasons = []
+        if len(text) < self.min_length:
+            reasons.append("too_short")
+
+        lowered = text.lower()
+        reasons.extend(CASCADE_VERIFIER.scan(lowered))
+        if self.patterns is not None:
+            reasons.extend(self.patterns.scan(lowered))
+        return reasons
+
+DEFAULT_POLICY = CascadePolicy()
+
+def cascade_models(llm: BaseChatModel, policy: Optional[CascadePolicy]) -> List[BaseChatModel]:
+    """The agent's model followed by the escalation tiers, if enabled."""
+    policy = policy or DEFAULT_POLICY
+    if not settings.LLM_CASCADE_ENABLED or not policy.enabled:
+        return [llm]
+
+    models = [llm]
+    seen = {getattr(llm, "model_name", None)}
+    temperature = getattr(llm, "temperature", None)
+    for name in policy.escalation_models():
+        if name and name not in seen:
+            seen.add(name)
+            models.append(get_llm(name, temperature))
+    return models
+
+def call_cost(model: str, usage: Optional[Any]) -> float:
+    """Dollar cost of a call from its token usage and LLM_MODEL_PRICES."""
+    prices = settings.LLM_MODEL_PRICES.get(model)
+    if not prices or not usage:
+        return 0.0
+    input_price, output_price = prices
+    return (
+        usage.get("input_tokens", 0) * input_price
+        + usage.get("output_tokens", 0) * output_price
+    ) / 1000
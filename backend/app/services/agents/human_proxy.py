@@ -1,12 +1,18 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from langchain_core.language_models import BaseChatModel
 from .base import BaseAgent
+from app.services.admission import PRIORITY_HIGH
 import logging
 
 logger = logging.getLogger(__name__)
 
 class HumanProxyAgent(BaseAgent):
-    def __init__(self):
+    # Handoffs to a person should not queue behind browsing traffic
+    LLM_PRIORITY = PRIORITY_HIGH
+
+    def __init__(self, llm: Optional[BaseChatModel] = None):
         super().__init__(
+            llm=llm,
             system_prompt="""You are a human handoff specialist who:
             - Prepares cases for human review
             - Collects relevant information
@@ -19,7 +25,7 @@ class HumanProxyAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
             
             # Prepare handoff message
             handoff_message = (
@@ -0,0 +1,103 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+import re
+
+# Derived forms a substring scan used to catch: traveller, tourist, visitor
+_DERIVED = r"er|ers|or|ors|ist|ists|ism"
+_VOWELS = set("aeiou")
+
+def _keyword_pattern(keyword: str) -> str:
+    """Regex for a keyword, tolerant of spacing and common inflections."""
+    words = keyword.lower().split()
+    *head, last = words
+    if last.endswith("e"):
+        # reserve -> reserves, reserved, reserving; drive -> driver
+        last_pattern = re.escape(last[:-1]) + r"(?:e|es|ed|ing|er|ers)"
+    elif last.endswith("y") and len(last) > 1 and last[-2] not in _VOWELS:
+        # activity -> activities
+        last_pattern = re.escape(last[:-1]) + r"(?:y|ies|ied)"
+    else:
+        # book -> books, booked, booking; tour -> tours, tourist
+        last_pattern = re.escape(last) + rf"(?:s|es|ed|ing|{_DERIVED})?"
+        if last[-1] not in _VOWELS | set("wxy") and len(last) > 1 and last[-2] in _VOWELS:
+            # cancel -> cancelled, cancelling; travel -> travelling, traveller
+            doubled = re.escape(last + last[-1]) + r"(?:ed|ing|er|ers)"
+            last_pattern = f"(?:{doubled}|{last_pattern})"
+    return r"\s+".join([re.escape(word) for word in head] + [last_pattern])
+
+class IntentMatcher:
+    """Match many keyword groups against a message in a single pass.
+
+    All keywords are compiled into one case-insensitive alternation with
+    word boundaries (so "car" no longer fires on "card" or "scar"), longest
+    keywords first so phrases like "credit card" win over their parts.
+    Intents keep their registration order, which ``first`` uses as
+    priority.
+    """
+
+    def __init__(self, intents: Dict[str, Sequence[str]]):
+        self.intents = list(intents)
+        self._priority = {intent: index for index, intent in enumerate(self.intents)}
+
+        keywords = [(keyword, intent) for intent, group in intents.items() for keyword in group]
+        keywords.sort(key=lambda item: len(item[0]), reverse=True)
+
+        self._group_intents: Dict[str, str] = {}
+        alternatives = []
+        for index, (keyword, intent) in enumerate(keywords):
+            group = f"k{index}"
+            self._group_intents[group] = intent
+            alternatives.append(f"(?P<{group}>{_keyword_pattern(keyword)})")
+
+        self._pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str]) -> "IntentMatcher":
+        """Matcher where every keyword is its own intent."""
+        return cls({keyword: [keyword] for keyword in keywords})
+
+    def match(self, text: str) -> List[str]:
+        """All intents found in the text, in priority order."""
+        found = {self._group_intents[match.lastgroup] for match in self._pattern.finditer(text)}
+        return sorted(found, key=self._priority.__getitem__)
+
+    def first(self, text: str) -> Optional[str]:
+        """The highest-priority intent found in the text, if any."""
+        found = self.match(text)
+        return found[0] if found else None
+
+# Agent routing, in priority order
+ROUTING_INTENTS = IntentMatcher({
+    "FLIGHT": ["flight", "plane", "airport", "airline", "travel"],
+    "HOTEL": ["hotel", "room", "accommodation", "stay", "resort"],
+    "CAR_RENTAL": ["car", "vehicle", "rental", "drive", "driving"],
+    "EXCURSION": ["tour", "activity", "activities", "excursion", "visit", "sightseeing"],
+    "SENSITIVE": ["payment", "credit card", "personal", "sensitive", "private"]
+})
+
+FLIGHT_BOOKING_INTENTS = IntentMatcher({
+    "new_booking": ["book", "reserve", "new flight", "schedule"],
+    "modification": ["change", "modify", "reschedule", "update"],
+    "cancellation": ["cancel", "cancellation", "refund", "void"],
+    "information": ["info", "information", "detail", "status", "when", "what time"]
+})
+
+SENSITIVE_REQUEST_TYPES = IntentMatcher({
+    "PAYMENT": ["payment", "credit", "card", "billing"],
+    "PERSONAL_DATA": ["personal", "private", "data", "information"],
+    "ACCOUNT_SECURITY": ["password", "login", "account", "security"]
+})
+
+ROOM_TYPES = IntentMatcher.from_keywords(["single", "double", "suite", "family"])
+HOTEL_AMENITIES = IntentMatcher.from_keywords(["wifi", "pool", "gym", "breakfast", "parking"])
+
+CAR_TYPES = IntentMatcher.from_keywords(["compact", "sedan", "suv", "luxury", "van"])
+CAR_FEATURES = IntentMatcher.from_keywords(["automatic", "manual", "gps", "bluetooth", "child seat"])
+
+ACTIVITY_TYPES = IntentMatcher.from_keywords([
+    "sightseeing", "adventure", "cultural", "food",
+    "nature", "sports", "relaxation", "shopping"
+])
+EXCURSION_INTERESTS = IntentMatcher.from_keywords([
+    "history", "art", "music", "outdoor", "wine",
+    "photography", "architecture", "local"
+])
@@ -0,0 +1,144 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import re
+
+class PatternMatch(NamedTuple):
+    text: str
+    groups: Tuple[str, ...]
+    start: int
+
+class PatternSet:
+    """Named regex sets merged into one alternation and scanned once.
+
+    Each set becomes a single named group, and every group sits inside a
+    lookahead so matches do not consume text: a greedy location capture
+    cannot hide a duration that follows it, just as when each pattern was
+    searched separately. At any one position the earliest set wins.
+
+    Patterns are compiled case-sensitively; callers pass lowercased text,
+    which keeps the scan well clear of re's slower IGNORECASE path.
+    """
+
+    def __init__(self, patterns: Dict[str, Sequence[str]], flags: int = 0):
+        self.names: List[str] = list(patterns)
+        self._priority = {name: index for index, name in enumerate(self.names)}
+        self._groups: Dict[str, Tuple[int, int]] = {}
+
+        alternatives = []
+        index = 1
+        for name, group in patterns.items():
+            alternative = "|".join(group)
+            inner = re.compile(alternative, flags).groups
+            self._groups[name] = (index, inner)
+            alternatives.append(f"(?P<{name}>{alternative})")
+            index += inner + 1
+
+        self._pattern = re.compile("(?=" + "|".join(alternatives) + ")", flags)
+
+    def scan(self, text: str) -> Dict[str, PatternMatch]:
+        """First (leftmost) match for each set found in the text.
+
+        ``groups`` holds the captures of whichever pattern matched; groups
+        belonging to the set's other patterns are left out.
+        """
+        found: Dict[str, PatternMatch] = {}
+        for match in self._pattern.finditer(text):
+            name = match.lastgroup
+            if name in found:
+                continue
+            outer, inner = self._groups[name]
+            found[name] = PatternMatch(
+                text=match.group(outer),
+                groups=tuple(
+                    value for value in match.groups()[outer:outer + inner]
+                    if value is not None
+                ),
+                start=match.start()
+            )
+            if len(found) == len(self.names):
+                break
+        return found
+
+    def first(self, text: str) -> Optional[str]:
+        """Highest-priority (first listed) set present in the text."""
+        best = None
+        for match in self._pattern.finditer(text):
+            priority = self._priority[match.lastgroup]
+            if priority == 0:
+                return match.lastgroup
+            if best is None or priority < best:
+                best = priority
+        return None if best is None else self.names[best]
+
+# Compiled once at import; keyed by agent and purpose
+PATTERN_REGISTRY: Dict[str, PatternSet] = {}
+
+def register(name: str, patterns: Dict[str, Sequence[str]]) -> PatternSet:
+    """Compile and register a pattern set."""
+    pattern_set = PATTERN_REGISTRY[name] = PatternSet(patterns)
+    return pattern_set
+
+LOCATION_PATTERNS = [
+    r"\bin\s+([a-zA-Z\s]+)",
+    r"\bat\s+([a-zA-Z\s]+)",
+    r"\bnear\s+([a-zA-Z\s]+)"
+]
+
+PRODUCT_ESCALATION = register("product.escalation", {
+    "TECHNICAL": [
+        r"technical|support|install|bug|error|issue",
+        r"not working|doesn't work|failed|crash",
+        r"setup|configure|integration",
+        r"troubleshoot|debug|fix"
+    ],
+    "CUSTOMER_SERVICE": [
+        r"billing|payment|account|subscription",
+        r"refund|cancel|return",
+        r"policy|terms|conditions",
+        r"customer service|support team"
+    ]
+})
+
+TECHNICAL_ESCALATION = register("technical.escalation", {
+    "PRODUCT": [
+        r"product (?:specs|specifications|details|information)",
+        r"(?:don't|do not) have (?:the |)product information",
+        r"need to check (?:the |)product"
+    ],
+    "CUSTOMER_SERVICE": [
+        r"billing (?:issue|question|concern)",
+        r"payment (?:processing|method|issue)",
+        r"account (?:status|balance|billing)"
+    ]
+})
+
+HOTEL_PREFERENCES = register("hotel.preferences", {
+    "location": LOCATION_PATTERNS
+})
+
+CAR_RENTAL_PREFERENCES = register("car_rental.preferences", {
+    "location": LOCATION_PATTERNS
+})
+
+EXCURSION_PREFERENCES = register("excursion.preferences", {
+    "location": LOCATION_PATTERNS + [r"\baround\s+([a-zA-Z\s]+)"],
+    "duration": [
+        r"(\d+)\s*(day|hour|week)s?",
+        r"half[- ]day",
+        r"full[- ]day"
+    ]
+})
+
+# Signs that a small model's answer should be retried on a larger one
+CASCADE_VERIFIER = register("cascade.verifier", {
+    "refusal": [
+        r"\bi(?:'m| am) (?:sorry|afraid),? (?:but )?i (?:can't|cannot|am unable)",
+        r"\bi (?:can't|cannot|am unable to) (?:help|assist|answer|provide)",
+        r"\bas an ai\b"
+    ],
+    "uncertain": [
+        r"\bi(?:'m| am) not (?:sure|certain)\b",
+        r"\bi (?:don't|do not) know\b",
+        r"\bi (?:don't|do not) have (?:access|enough information)\b",
+        r"\bunable to (?:find|determine|verify)\b"
+    ]
+})
@@ -1,12 +1,33 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from langchain_core.language_models import BaseChatModel
+from app.core.config import settings
+from app.core.metrics import ROUTER_CONFIDENCE
 from .base import BaseAgent
+from .cascade import CascadePolicy
+from .routing_model import RoutingClassifier, get_routing_classifier, record_decision
 import logging
 
 logger = logging.getLogger(__name__)
 
+ROUTES = ["PRODUCT", "TECHNICAL", "CUSTOMER_SERVICE", "HUMAN"]
+
 class RouterAgent(BaseAgent):
-    def __init__(self):
+    # Answers are a single route name, so length says nothing about quality
+    CASCADE_POLICY = CascadePolicy(min_length=1)
+
+    def __init__(
+        self,
+        llm: Optional[BaseChatModel] = None,
+        classifier: Optional[RoutingClassifier] = None,
+        confidence_threshold: Optional[float] = None
+    ):
+        self.classifier = classifier or get_routing_classifier()
+        self.confidence_threshold = (
+            settings.ROUTER_CONFIDENCE_THRESHOLD
+            if confidence_threshold is None else confidence_threshold
+        )
         super().__init__(
+            llm=llm,
             system_prompt="""You are a routing agent that directs user queries to the appropriate specialist agent.
             - PRODUCT: For product information, pricing, and availability
             - TECHNICAL: For technical support and troubleshooting
@@ -19,14 +40,31 @@ class RouterAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Get latest message
             latest_message = messages[-1].content if messages else ""
             
+            # Settle confident cases locally and skip the LLM round trip
+            if self.classifier and latest_message:
+                label, confidence = self.classifier.predict(latest_message)
+                if label in ROUTES and confidence >= self.confidence_threshold:
+                    ROUTER_CONFIDENCE.labels(outcome="local").observe(confidence)
+                    record_decision(latest_message, label, "local", confidence)
+                    return {
+                        "messages": state["messages"],
+                        "next": label,
+                        "context": {
+                            **state.get("context", {}),
+                            "routing_reason": f"local classifier ({confidence:.2f})"
+                        }
+                    }
+                ROUTER_CONFIDENCE.labels(outcome="fallback").observe(confidence)
+            
             # Determine which agent should handle this
             response = await self._safe_llm_call(
-                messages,
+                history,
                 system_override="""Analyze the user's message and respond with only one of: 
                 PRODUCT, TECHNICAL, CUSTOMER_SERVICE, or HUMAN. Choose based on these criteria:
                 - PRODUCT: Product inquiries, pricing, availability
@@ -44,8 +82,10 @@ class RouterAgent(BaseAgent):
             
             # Clean up response to get just the agent type
             next_agent = response.strip().upper()
-            if next_agent not in ["PRODUCT", "TECHNICAL", "CUSTOMER_SERVICE", "HUMAN"]:
+            if next_agent not in ROUTES:
                 next_agent = "CUSTOMER_SERVICE"
+            elif latest_message:
+                record_decision(latest_message, next_agent, "llm")
             
             return {
                 "messages": state["messages"],
@@ -0,0 +1,196 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter
+from app.core.config import settings
+import json
+import math
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One JSON line per routing decision; written once configure_decision_log()
+# has run at startup and read back by scripts/train_router.py
+decision_logger = logging.getLogger("app.routing.decisions")
+decision_logger.setLevel(logging.INFO)
+decision_logger.propagate = False
+_decision_handler: Optional[logging.Handler] = None
+
+# Identifiers customers paste into messages; kept out of the training log
+_REDACTIONS = [
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>"),
+    (re.compile(r"\+?\d[\d\s().-]{5,}\d"), "<number>")
+]
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word unigrams plus adjacent-word bigrams."""
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+class RoutingClassifier:
+    """Multinomial naive Bayes over unigrams and bigrams.
+
+    Small enough to keep as plain dicts and score in microseconds, so the
+    router can settle confident cases without an LLM round trip. Term
+    counts are log-scaled (``1 + log(tf)``) so repeated words in a long
+    message do not swamp the prediction.
+    """
+
+    def __init__(
+        self,
+        labels: List[str],
+        priors: Dict[str, float],
+        weights: Dict[str, Dict[str, float]],
+        unseen: Dict[str, float]
+    ):
+        self.labels = labels
+        self.priors = priors
+        # token -> {label: log P(token | label)}
+        self.weights = weights
+        # label -> log P(unseen token | label), the smoothing floor
+        self.unseen = unseen
+
+    @classmethod
+    def train(cls, examples: Iterable[Tuple[str, str]], alpha: float = 1.0) -> "RoutingClassifier":
+        """Fit the model from (text, label) pairs."""
+        documents: Counter = Counter()
+        counts: Dict[str, Counter] = {}
+        for text, label in examples:
+            documents[label] += 1
+            counts.setdefault(label, Counter()).update(tokenize(text))
+
+        if not documents:
+            raise ValueError("No training examples")
+
+        labels = sorted(documents)
+        vocabulary = set().union(*counts.values())
+        total = sum(documents.values())
+
+        priors = {label: math.log(documents[label] / total) for label in labels}
+        weights: Dict[str, Dict[str, float]] = {token: {} for token in vocabulary}
+        unseen = {}
+        for label in labels:
+            label_total = sum(counts[label].values()) + alpha * len(vocabulary)
+            unseen[label] = math.log(alpha / label_total)
+            for token, count in counts[label].items():
+                weights[token][label] = math.log((count + alpha) / label_total)
+
+        return cls(labels, priors, weights, unseen)
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """Return the most likely label and its posterior probability."""
+        terms = Counter(token for token in tokenize(text) if token in self.weights)
+        if not terms:
+            return None, 0.0
+
+        scores = dict(self.priors)
+        for token, count in terms.items():
+            scale = 1.0 + math.log(count)
+            token_weights = self.weights[token]
+            for label in self.labels:
+                scores[label] += scale * token_weights.get(label, self.unseen[label])
+
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        confidence = 1.0 / sum(math.exp(score - top) for score in scores.values())
+        return best, confidence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "labels": self.labels,
+            "priors": self.priors,
+            "weights": self.weights,
+            "unseen": self.unseen
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RoutingClassifier":
+        return cls(data["labels"], data["priors"], data["weights"], data["unseen"])
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "RoutingClassifier":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+def redact(text: str) -> str:
+    """Mask emails and long digit runs (phone, card and booking numbers)."""
+    for pattern, replacement in _REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+def configure_decision_log(path: Optional[str] = None) -> None:
+    """Attach the JSONL file handler for routing decisions.
+
+    Called at application startup, never on import, so tests and scripts
+    do not append to the training log. An empty path disables the log.
+    """
+    global _decision_handler
+
+    path = settings.ROUTER_DECISION_LOG if path is None else path
+    if not path or _decision_handler is not None:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _decision_handler = logging.FileHandler(path)
+    _decision_handler.setFormatter(logging.Formatter("%(message)s"))
+    decision_logger.addHandler(_decision_handler)
+
+def close_decision_log() -> None:
+    """Detach and close the decision log handler."""
+    global _decision_handler
+
+    if _decision_handler is not None:
+        decision_logger.removeHandler(_decision_handler)
+        _decision_handler.close()
+        _decision_handler = None
+
+def record_decision(text: str, label: str, source: str, confidence: Optional[float] = None) -> None:
+    """Log a routing decision, with identifiers redacted, for later training."""
+    if _decision_handler is None:
+        return
+    decision_logger.info(json.dumps({
+        "text": redact(text),
+        "label": label,
+        "source": source,
+        "confidence": confidence
+    }))
+
+def read_decisions(path: str, sources: Iterable[str] = ("llm",)) -> Iterator[Tuple[str, str]]:
+    """Read (text, label) pairs from a decision log.
+
+    Only LLM decisions are used by default: training on the classifier's
+    own answers would just reinforce its mistakes.
+    """
+    sources = set(sources)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                decision = json.loads(line)
+            except ValueError:
+                continue
+            if decision.get("source") in sources and decision.get("text") and decision.get("label"):
+                yield decision["text"], decision["label"]
+
+_classifier: Optional[RoutingClassifier] = None
+_loaded = False
+
+def get_routing_classifier() -> Optional[RoutingClassifier]:
+    """Load the trained routing model once; None when none is available."""
+    global _classifier, _loaded
+
+    if not _loaded:
+        _loaded = True
+        if settings.ROUTER_MODEL_PATH:
+            try:
+                _classifier = RoutingClassifier.load(settings.ROUTER_MODEL_PATH)
+                logger.info(f"Loaded routing model from {settings.ROUTER_MODEL_PATH}")
+            except FileNotFoundError:
+                logger.info("No routing model found; all messages will be routed by the LLM")
+            except Exception as e:
+                logger.error(f"Error loading routing model: {e}")
+    return _classifier
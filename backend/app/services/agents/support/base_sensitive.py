@@ -1,5 +1,7 @@
 from typing import Dict, Any, Optional
+from langchain_core.language_models import BaseChatModel
 from app.services.agents.base import BaseAgent
+from app.services.admission import PRIORITY_HIGH
 from datetime import datetime
 import logging
 import json
@@ -9,8 +11,13 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 class BaseSensitiveAgent(BaseAgent):
-    def __init__(self):
-        super().__init__()
+    # Payment and account changes are admitted ahead of browsing traffic
+    LLM_PRIORITY = PRIORITY_HIGH
+
+    RESPONSE_CACHE_TTL = 0
+
+    def __init__(self, llm: Optional[BaseChatModel] = None):
+        super().__init__(llm=llm)
         self.encryption_key = Fernet(settings.ENCRYPTION_KEY)
 
     def encrypt_data(self, data: Dict[str, Any]) -> bytes:
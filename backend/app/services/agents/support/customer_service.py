@@ -51,7 +51,8 @@ class CustomerServiceAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update conversation memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Format context for prompt
             context = {
@@ -61,8 +62,9 @@ class CustomerServiceAgent(BaseAgent):
             }
             
             response = await self._safe_llm_call(
-                messages,
-                system_override=self.SYSTEM_PROMPT.format(**context)
+                history,
+                system_override=self.SYSTEM_PROMPT.format(**context),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
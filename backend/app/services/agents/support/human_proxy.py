@@ -1,11 +1,15 @@
 from typing import Dict, Any, List
 from ..base import BaseAgent
+from app.services.admission import PRIORITY_HIGH
 from langchain_core.messages import HumanMessage, AIMessage
 import logging
 
 logger = logging.getLogger(__name__)
 
 class HumanProxyAgent(BaseAgent):
+    # Handoffs to a person should not queue behind browsing traffic
+    LLM_PRIORITY = PRIORITY_HIGH
+
     SYSTEM_PROMPT = """You are a human support coordinator.
     Your role is to:
     1. Prepare cases for human agent review
@@ -82,7 +86,7 @@ class HumanProxyAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
             
             # Assess priority
             priority = self._assess_priority(state)
@@ -1,9 +1,9 @@
 from typing import Dict, Any, List, Optional, Tuple
 from ..base import BaseAgent
+from ..patterns import PRODUCT_ESCALATION
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 import logging
 from datetime import datetime
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -40,28 +40,14 @@ class ProductAgent(BaseAgent):
     
     def _analyze_escalation_need(self, response: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """Analyze if response indicates need for escalation."""
-        technical_patterns = [
-            r"(technical|support|install|bug|error|issue)",
-            r"(not working|doesn't work|failed|crash)",
-            r"(setup|configure|integration)",
-            r"(troubleshoot|debug|fix)"
-        ]
-        
-        service_patterns = [
-            r"(billing|payment|account|subscription)",
-            r"(refund|cancel|return)",
-            r"(policy|terms|conditions)",
-            r"(customer service|support team)"
-        ]
-        
-        response_lower = response.lower()
+        department = PRODUCT_ESCALATION.first(response.lower())
         
         # Check for technical escalation
-        if any(re.search(pattern, response_lower) for pattern in technical_patterns):
+        if department == "TECHNICAL":
             return True, "TECHNICAL", "Technical support needed for implementation/issues"
             
         # Check for customer service escalation
-        if any(re.search(pattern, response_lower) for pattern in service_patterns):
+        if department == "CUSTOMER_SERVICE":
             return True, "CUSTOMER_SERVICE", "Account or billing related inquiry"
             
         return False, None, None
@@ -71,7 +57,8 @@ class ProductAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory with conversation history
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Format context for the LLM
             context = {
@@ -82,8 +69,9 @@ class ProductAgent(BaseAgent):
             
             # Make LLM call with safety measures
             response = await self._safe_llm_call(
-                messages,
-                system_override=self.SYSTEM_PROMPT.format(**context)
+                history,
+                system_override=self.SYSTEM_PROMPT.format(**context),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
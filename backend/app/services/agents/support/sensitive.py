@@ -1,11 +1,19 @@
 from typing import Dict, Any, List
 from app.services.agents.base import BaseAgent
+from app.services.admission import PRIORITY_HIGH
+from app.services.agents.intents import SENSITIVE_REQUEST_TYPES
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 class SensitiveWorkflowAgent(BaseAgent):
+    # Payment and account changes are admitted ahead of browsing traffic
+    LLM_PRIORITY = PRIORITY_HIGH
+
+    # Never cache responses that may contain payment or personal data
+    RESPONSE_CACHE_TTL = 0
+
     SYSTEM_PROMPT = """You are a specialized agent handling sensitive operations.
     Your role is to:
     1. Process sensitive requests securely
@@ -25,7 +33,8 @@ class SensitiveWorkflowAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update conversation memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Format context for the LLM
             context = {
@@ -37,8 +46,9 @@ class SensitiveWorkflowAgent(BaseAgent):
             
             # Make LLM call with safety measures
             response = await self._safe_llm_call(
-                messages,
-                system_override=self.SYSTEM_PROMPT.format(**context)
+                history,
+                system_override=self.SYSTEM_PROMPT.format(**context),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
@@ -77,13 +87,4 @@ class SensitiveWorkflowAgent(BaseAgent):
 
     def _determine_request_type(self, message: str) -> str:
         """Determine the type of sensitive request."""
-        message_lower = message.lower()
-        
-        if any(keyword in message_lower for keyword in ["payment", "credit", "card", "billing"]):
-            return "PAYMENT"
-        elif any(keyword in message_lower for keyword in ["personal", "private", "data", "information"]):
-            return "PERSONAL_DATA"
-        elif any(keyword in message_lower for keyword in ["password", "login", "account", "security"]):
-            return "ACCOUNT_SECURITY"
-        else:
-            return "GENERAL_SENSITIVE" 
\ No newline at end of file
+        return SENSITIVE_REQUEST_TYPES.first(message) or "GENERAL_SENSITIVE" 
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Dict, Any, List
 from ..base import BaseAgent
+from ..patterns import TECHNICAL_ESCALATION
 from langchain_core.messages import HumanMessage, AIMessage
-import re
 
 class TechnicalAgent(BaseAgent):
     SYSTEM_PROMPT = """You are a technical support specialist.
@@ -20,24 +20,12 @@ class TechnicalAgent(BaseAgent):
     
     def _needs_escalation(self, response: str) -> tuple[bool, str, str]:
         """Analyze if the response needs escalation to another department."""
-        product_patterns = [
-            r"product (specs|specifications|details|information)",
-            r"(don't|do not) have (the |)product information",
-            r"need to check (the |)product"
-        ]
+        department = TECHNICAL_ESCALATION.first(response.lower())
         
-        billing_patterns = [
-            r"billing (issue|question|concern)",
-            r"payment (processing|method|issue)",
-            r"account (status|balance|billing)"
-        ]
-        
-        response_lower = response.lower()
-        
-        if any(re.search(pattern, response_lower) for pattern in product_patterns):
+        if department == "PRODUCT":
             return True, "PRODUCT", "Need product information to proceed"
         
-        if any(re.search(pattern, response_lower) for pattern in billing_patterns):
+        if department == "CUSTOMER_SERVICE":
             return True, "CUSTOMER_SERVICE", "Billing or account related issue"
             
         return False, "", ""
@@ -47,13 +35,15 @@ class TechnicalAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory with conversation history
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             response = await self._safe_llm_call(
-                messages,
+                history,
                 system_override=self.SYSTEM_PROMPT.format(
                     context=state.get("context", "No additional context provided")
-                )
+                ),
+                prompt_scope=self.prompt_scope(state)
             )
             
             if not response:
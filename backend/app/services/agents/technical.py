@@ -1,12 +1,14 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from langchain_core.language_models import BaseChatModel
 from .base import BaseAgent
 import logging
 
 logger = logging.getLogger(__name__)
 
 class TechnicalAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, llm: Optional[BaseChatModel] = None):
         super().__init__(
+            llm=llm,
             system_prompt="""You are a technical support specialist who helps customers with:
             - Technical troubleshooting
             - Setup and configuration
@@ -20,10 +22,11 @@ class TechnicalAgent(BaseAgent):
             messages = self.format_messages(state["messages"])
             
             # Update memory
-            self.update_memory(messages)
+            self.update_memory(messages, state)
+            history = await self.get_memory_messages(state)
             
             # Get response from LLM
-            response = await self._safe_llm_call(messages)
+            response = await self._safe_llm_call(history)
             
             if not response:
                 return {
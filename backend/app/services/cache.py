@@ -1,25 +1,84 @@
-from typing import Optional, Any
-from redis.asyncio import Redis
-import json
+from typing import Optional, Any, Dict, Iterable, List
+from redis.asyncio import ConnectionPool, Redis
 import logging
 from app.core.config import settings
+from app.core.metrics import CACHE_LOOKUPS
+from app.services.local_cache import InvalidationListener, LocalCache
+from app.services.serialization import StateSerializer, get_serializer
  
 logger = logging.getLogger(__name__)
 
 class RedisCache:
-    def __init__(self, redis_client: Optional[Redis]):
+    """JSON-like value cache on Redis with an optional in-process tier.
+
+    When ``local`` is set, reads are served from the worker's LRU first
+    and writes publish the changed keys so other workers drop their
+    copies (see ``app.services.local_cache``).
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Redis],
+        serializer: Optional[StateSerializer] = None,
+        local: Optional[LocalCache] = None
+    ):
         self.redis = redis_client
         self.ttl = settings.REDIS_TTL
+        self.serializer = serializer or get_serializer()
+        self.local = local
+        self._listener: Optional[InvalidationListener] = None
+        if local is not None and redis_client is not None:
+            self._listener = InvalidationListener(redis_client, local, settings.CACHE_INVALIDATION_CHANNEL)
+
+    def start(self) -> None:
+        """Start listening for invalidations from other workers."""
+        if self._listener:
+            self._listener.start()
+
+    def get_local(self, key: str) -> Optional[Any]:
+        """Read a value from the in-process tier only."""
+        if self.local is None:
+            return None
+        value = self.local.get(key)
+        CACHE_LOOKUPS.labels(tier="local", result="hit" if value is not None else "miss").inc()
+        return self.serializer.loads(value) if value is not None else None
+
+    def set_local(self, key: str, value: Any, epoch: Optional[int] = None) -> None:
+        """Store a value in the in-process tier only."""
+        if self.local is not None:
+            self.local.set(key, self.serializer.dumps(value), epoch)
+
+    @property
+    def local_epoch(self) -> Optional[int]:
+        return self.local.epoch if self.local is not None else None
+
+    def queue_invalidation(self, pipe, keys: Iterable[str]) -> None:
+        """Drop keys locally and queue their invalidation on a pipeline."""
+        keys = list(keys)
+        if self.local is None or not keys:
+            return
+        self.local.discard(keys)
+        pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, self._listener.message(keys))
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
         try:
             if not self.redis or not settings.REDIS_ENABLED:
                 return None
-                
+
+            if self.local is not None:
+                value = self.local.get(key)
+                CACHE_LOOKUPS.labels(tier="local", result="hit" if value else "miss").inc()
+                if value:
+                    return self.serializer.loads(value)
+
+            epoch = self.local_epoch
             value = await self.redis.get(key)
+            CACHE_LOOKUPS.labels(tier="redis", result="hit" if value else "miss").inc()
             if value:
-                return json.loads(value)
+                if self.local is not None:
+                    self.local.set(key, value, epoch)
+                return self.serializer.loads(value)
             return None
         except Exception as e:
             logger.error(f"Redis get error: {e}")
@@ -27,43 +86,121 @@ class RedisCache:
 
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in cache with optional TTL."""
+        return await self.mset({key: value}, ttl)
+
+    async def mget(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip, aligned with ``keys``."""
+        keys = list(keys)
         try:
-            if not self.redis or not settings.REDIS_ENABLED:
+            if not keys or not self.redis or not settings.REDIS_ENABLED:
+                return [None] * len(keys)
+
+            raw: List[Optional[bytes]] = [None] * len(keys)
+            if self.local is not None:
+                for index, key in enumerate(keys):
+                    raw[index] = self.local.get(key)
+                    CACHE_LOOKUPS.labels(tier="local", result="hit" if raw[index] else "miss").inc()
+
+            missing = [index for index, value in enumerate(raw) if not value]
+            if missing:
+                epoch = self.local_epoch
+                values = await self.redis.mget([keys[index] for index in missing])
+                for index, value in zip(missing, values):
+                    CACHE_LOOKUPS.labels(tier="redis", result="hit" if value else "miss").inc()
+                    raw[index] = value
+                    if value and self.local is not None:
+                        self.local.set(keys[index], value, epoch)
+
+            return [self.serializer.loads(value) if value else None for value in raw]
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            return [None] * len(keys)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values in one round trip; missing keys are omitted."""
+        keys = list(keys)
+        values = await self.mget(keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def mset(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values with a TTL in one pipelined round trip."""
+        try:
+            if not mapping or not self.redis or not settings.REDIS_ENABLED:
                 return False
-                
-            serialized = json.dumps(value)
-            await self.redis.set(
-                key,
-                serialized,
-                ex=ttl or self.ttl
-            )
-            return True
+
+            serialized = {key: self.serializer.dumps(value) for key, value in mapping.items()}
+
+            # MSET cannot expire keys, so pipeline SET EX instead
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in serialized.items():
+                pipe.set(key, value, ex=ttl or self.ttl)
+            self.queue_invalidation(pipe, serialized)
+            results = await pipe.execute()
+
+            if self.local is not None:
+                for key, value in serialized.items():
+                    self.local.set(key, value)
+            return all(results[:len(serialized)])
         except Exception as e:
-            logger.error(f"Redis set error: {e}")
+            logger.error(f"Redis mset error: {e}")
             return False
 
-    async def delete(self, key: str) -> bool:
-        """Delete value from cache."""
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values in one round trip (same as ``mset``)."""
+        return await self.mset(mapping, ttl)
+
+    async def delete_many(self, keys: Iterable[str]) -> bool:
+        """Delete several keys in one round trip."""
+        keys = list(keys)
         try:
-            if not self.redis or not settings.REDIS_ENABLED:
+            if not keys or not self.redis or not settings.REDIS_ENABLED:
                 return False
-                
-            await self.redis.delete(key)
+
+            if self.local is None:
+                await self.redis.delete(*keys)
+            else:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.delete(*keys)
+                self.queue_invalidation(pipe, keys)
+                await pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Redis delete error: {e}")
             return False
 
+    async def delete(self, key: str) -> bool:
+        """Delete value from cache."""
+        return await self.delete_many([key])
+
     async def close(self):
         """Close Redis connection."""
         try:
+            if self._listener:
+                await self._listener.stop()
             if self.redis:
-                await self.redis.close()
+                await self.redis.aclose()
         except Exception as e:
             logger.error(f"Error closing Redis connection: {e}")
 
 _cache: Optional[RedisCache] = None
 
+def _build_pool() -> ConnectionPool:
+    """Build the shared connection pool from settings."""
+    return ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        protocol=settings.REDIS_PROTOCOL,
+        # Values are binary (see app.services.serialization)
+        decode_responses=False
+    )
+
 async def get_cache() -> RedisCache:
     """Get or create Redis cache instance."""
     global _cache
@@ -74,32 +211,21 @@ async def get_cache() -> RedisCache:
                 logger.warning("Redis is disabled. Using no-op cache.")
                 redis_client = None
             else:
-                redis_client = Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=settings.REDIS_PASSWORD or None,
-                    decode_responses=True
-                )
+                # The client owns the pool and closes it with itself
+                redis_client = Redis.from_pool(_build_pool())
                 # Test connection
                 await redis_client.ping()
                 
-            _cache = RedisCache(redis_client)
-            logger.info("Redis cache initialized")
+            local = None
+            if redis_client is not None and settings.CACHE_LOCAL_ENABLED:
+                local = LocalCache(settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_TTL)
+
+            _cache = RedisCache(redis_client, local=local)
+            _cache.start()
+            logger.info(f"Redis cache initialized (local tier: {'on' if local else 'off'})")
         except Exception as e:
             logger.error(f"Error initializing Redis cache: {e}")
             # Create no-op cache instance if Redis fails
             _cache = RedisCache(None)
     
-    return _cache
-
-def get_redis() -> Redis:
-    redis = Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        decode_responses=True
-    )
-    try:
-        yield redis
-    finally:
-        redis.close()
\ No newline at end of file
+    return _cache
\ No newline at end of file
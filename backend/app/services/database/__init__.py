@@ -0,0 +1,29 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+import logging
+from .mongodb import MongoDB, mongodb
+from .pool_stats import PoolStats
+
+logger = logging.getLogger(__name__)
+
+async def get_mongodb() -> MongoDB:
+    """Dependency for FastAPI endpoints that need the database manager."""
+    return mongodb
+
+async def get_db() -> AsyncIOMotorClient:
+    """Dependency for FastAPI endpoints.
+
+    Returns the application's pooled client instead of opening one per
+    request; connects lazily if startup could not.
+    """
+    if not mongodb.client:
+        logger.warning("MongoDB not connected at request time, connecting")
+        await mongodb.connect()
+    return mongodb.client
+
+__all__ = [
+    'MongoDB',
+    'PoolStats',
+    'mongodb',
+    'get_db',
+    'get_mongodb'
+]
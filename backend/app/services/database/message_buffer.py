@@ -0,0 +1,149 @@
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from collections import deque
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.core.metrics import MESSAGE_BUFFER_DEPTH, MESSAGES_FLUSHED
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+InsertMany = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+
+# Duplicate key: the document was already written by an earlier attempt
+DUPLICATE_KEY_ERROR = 11000
+
+class MessageBuffer:
+    """Write-behind buffer for chat messages.
+
+    Messages are queued in memory and written with unordered
+    ``insert_many`` batches, either when ``batch_size`` messages are
+    waiting or every ``flush_interval`` seconds. The writer that fills the
+    buffer to ``max_size`` flushes inline. Batches that fail for transient
+    reasons are re-queued; documents carry their ``_id`` so a retried batch
+    does not duplicate messages.
+
+    ``max_size`` is a hard cap: while the store keeps failing, the oldest
+    pending messages are dropped (and counted) rather than letting memory
+    grow or re-flushing on every write.
+    """
+
+    def __init__(
+        self,
+        insert_many: InsertMany,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_size: Optional[int] = None
+    ):
+        self._insert_many = insert_many
+        self.batch_size = batch_size or settings.MESSAGE_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.MESSAGE_FLUSH_INTERVAL
+        self.max_size = max_size or settings.MESSAGE_BUFFER_MAX
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._dropping = False
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"Message buffer started (batch_size={self.batch_size}, "
+                f"flush_interval={self.flush_interval}s)"
+            )
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write everything still pending."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        if self._pending:
+            logger.error(f"Message buffer stopped with {len(self._pending)} unwritten messages")
+
+    async def add(self, message: Dict[str, Any]) -> None:
+        """Queue a message for writing."""
+        self._pending.append(message)
+
+        if len(self._pending) > self.max_size:
+            # Still full after the last flush: the store is failing
+            self._drop_overflow()
+        elif len(self._pending) == self.max_size and not self._flush_lock.locked():
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        MESSAGE_BUFFER_DEPTH.set(len(self._pending))
+
+    def _drop_overflow(self) -> None:
+        """Drop the oldest messages beyond ``max_size``."""
+        overflow = len(self._pending) - self.max_size
+        if overflow <= 0:
+            return
+        for _ in range(overflow):
+            self._pending.popleft()
+        MESSAGES_FLUSHED.labels(status="dropped").inc(overflow)
+        if not self._dropping:
+            self._dropping = True
+            logger.error(f"Message buffer full ({self.max_size}); dropping the oldest unwritten messages")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending messages in batches."""
+        async with self._flush_lock:
+            batch, self._pending = list(self._pending), deque()
+            failed: List[Dict[str, Any]] = []
+
+            for start in range(0, len(batch), self.batch_size):
+                chunk = batch[start:start + self.batch_size]
+                failed.extend(await self._write(chunk))
+
+            if failed:
+                # Keep arrival order ahead of messages queued during the flush
+                self._pending.extendleft(reversed(failed))
+                self._drop_overflow()
+            else:
+                self._dropping = False
+            MESSAGE_BUFFER_DEPTH.set(len(self._pending))
+
+    async def _write(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert one batch; returns the messages that should be retried."""
+        try:
+            await self._insert_many(chunk)
+            MESSAGES_FLUSHED.labels(status="success").inc(len(chunk))
+            return []
+
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            duplicates = sum(1 for error in errors if error.get("code") == DUPLICATE_KEY_ERROR)
+            rejected = len(errors) - duplicates
+            MESSAGES_FLUSHED.labels(status="success").inc(len(chunk) - rejected)
+            if rejected:
+                MESSAGES_FLUSHED.labels(status="rejected").inc(rejected)
+                logger.error(f"Message batch rejected {rejected} of {len(chunk)} documents: {errors[:3]}")
+            return []
+
+        except Exception as e:
+            MESSAGES_FLUSHED.labels(status="retry").inc(len(chunk))
+            logger.error(f"Message batch of {len(chunk)} failed, will retry: {e}")
+            return chunk
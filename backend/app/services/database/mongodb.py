@@ -1,10 +1,17 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator, Union
+import asyncio
+import base64
+import json
 import logging
+import time
 import backoff
 from datetime import datetime
+from bson import ObjectId
 from app.core.config import settings
 from app.core.logging_config import mongodb_logger
+from .message_buffer import MessageBuffer
+from .pool_stats import PoolStats
 from pymongo.errors import (
     ConnectionFailure, 
     OperationFailure, 
@@ -12,10 +19,19 @@ from pymongo.errors import (
 )
 
 class MongoDB:
+    BOOKING_COLLECTIONS = {
+        "flight": "flight_bookings",
+        "hotel": "hotel_bookings",
+        "car": "car_rentals",
+        "excursion": "excursions"
+    }
+
     def __init__(self):
         self.client: Optional[AsyncIOMotorClient] = None
         self.db = None
         self.logger = mongodb_logger
+        self.message_buffer: Optional[MessageBuffer] = None
+        self.pool_stats = PoolStats()
         self._connection_params = self._get_connection_params()
 
     def _get_connection_params(self) -> Dict[str, Any]:
@@ -66,6 +82,7 @@ class MongoDB:
             
             self.client = AsyncIOMotorClient(
                 app_url,
+                event_listeners=[self.pool_stats],
                 **self._connection_params
             )
             
@@ -83,6 +100,12 @@ class MongoDB:
             
             await self._ensure_indexes()
             
+            # Messages are written behind the request path in batches
+            self.message_buffer = MessageBuffer(
+                lambda documents: self.db.messages.insert_many(documents, ordered=False)
+            )
+            self.message_buffer.start()
+            
         except Exception as e:
             self.logger.error(
                 f"MongoDB connection error: {str(e)}\n"
@@ -136,26 +159,26 @@ class MongoDB:
                     {"keys": [("ended_at", 1)]}
                 ],
                 "messages": [
-                    {"keys": [("conversation_id", 1), ("created_at", 1)]},
+                    {"keys": [("conversation_id", 1), ("created_at", 1), ("_id", 1)]},
                     {"keys": [("created_at", 1)]}
                 ],
                 "flight_bookings": [
-                    {"keys": [("user_id", 1)]},
+                    {"keys": [("user_id", 1), ("created_at", -1), ("_id", -1)]},
                     {"keys": [("booking_reference", 1)], "unique": True},
                     {"keys": [("created_at", 1)]}
                 ],
                 "hotel_bookings": [
-                    {"keys": [("user_id", 1)]},
+                    {"keys": [("user_id", 1), ("created_at", -1), ("_id", -1)]},
                     {"keys": [("booking_reference", 1)], "unique": True},
                     {"keys": [("check_in_date", 1)]}
                 ],
                 "car_rentals": [
-                    {"keys": [("user_id", 1)]},
+                    {"keys": [("user_id", 1), ("created_at", -1), ("_id", -1)]},
                     {"keys": [("booking_reference", 1)], "unique": True},
                     {"keys": [("pickup_time", 1)]}
                 ],
                 "excursions": [
-                    {"keys": [("user_id", 1)]},
+                    {"keys": [("user_id", 1), ("created_at", -1), ("_id", -1)]},
                     {"keys": [("booking_reference", 1)], "unique": True},
                     {"keys": [("activity_date", 1)]}
                 ]
@@ -176,21 +199,44 @@ class MongoDB:
 
     async def disconnect(self):
         """Safely close MongoDB connection."""
+        if self.message_buffer:
+            await self.message_buffer.stop()
+            self.message_buffer = None
         if self.client:
-            await self.client.close()
+            self.client.close()
             self.client = None
             self.db = None
             self.logger.info("MongoDB connection closed")
 
+    async def close(self):
+        """Close MongoDB connection (alias of disconnect)."""
+        await self.disconnect()
+
+    async def flush_messages(self):
+        """Write any buffered messages now."""
+        if self.message_buffer:
+            await self.message_buffer.flush()
+
+    async def ping(self) -> float:
+        """Round-trip a ping; returns latency in milliseconds."""
+        start_time = time.perf_counter()
+        await self.client.admin.command('ping')
+        return (time.perf_counter() - start_time) * 1000
+
+    def pool_status(self) -> Dict[str, Any]:
+        """Connection pool counters plus the configured pool size."""
+        return {
+            **self.pool_stats.snapshot(),
+            "max_pool_size": self._connection_params["maxPoolSize"]
+        }
+
     async def check_health(self) -> Dict[str, Any]:
         """Enhanced health check with detailed status."""
         try:
             if not self.client:
                 return {"status": "disconnected"}
                 
-            start_time = datetime.utcnow()
-            await self.client.admin.command('ping')
-            latency = (datetime.utcnow() - start_time).total_seconds() * 1000
+            latency = await self.ping()
             
             server_info = await self.client.server_info()
             server_status = await self.client.admin.command('serverStatus')
@@ -201,6 +247,7 @@ class MongoDB:
                 "latency_ms": round(latency, 2),
                 "connections": server_status.get('connections', {}),
                 "operations": server_status.get('opcounters', {}),
+                "pool": self.pool_status()
             }
         except Exception as e:
             self.logger.error(f"Health check failed: {str(e)}")
@@ -221,21 +268,24 @@ class MongoDB:
         return await cursor.to_list(length=limit)
 
     async def get_conversation_messages(self, conversation_id: str) -> List[Dict]:
-        """Get all messages for a conversation."""
+        """Get all messages for a conversation.
+
+        Loads the whole history; prefer ``get_conversation_messages_page``
+        or ``stream_conversation_messages`` for long conversations.
+        """
+        await self.flush_messages()
         cursor = self.db.messages.find(
             {"conversation_id": conversation_id}
         ).sort("created_at", 1)
         return await cursor.to_list(length=None)
 
     async def get_user_bookings(self, user_id: str, booking_type: str) -> List[Dict]:
-        """Get user's bookings of a specific type."""
-        collection_map = {
-            "flight": "flight_bookings",
-            "hotel": "hotel_bookings",
-            "car": "car_rentals",
-            "excursion": "excursions"
-        }
-        collection = collection_map.get(booking_type)
+        """Get user's bookings of a specific type.
+
+        Loads every booking; prefer ``get_user_bookings_page`` or
+        ``stream_user_bookings`` for heavy bookers.
+        """
+        collection = self.BOOKING_COLLECTIONS.get(booking_type)
         if not collection:
             raise ValueError(f"Invalid booking type: {booking_type}")
             
@@ -244,8 +294,187 @@ class MongoDB:
         ).sort("created_at", -1)
         return await cursor.to_list(length=None)
 
+    @staticmethod
+    def encode_cursor(document: Dict) -> str:
+        """Encode a document's (created_at, _id) position as an opaque cursor."""
+        document_id = document["_id"]
+        payload = {
+            "created_at": document["created_at"].isoformat(),
+            "id": str(document_id),
+            "oid": isinstance(document_id, ObjectId)
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, Union[ObjectId, str]]:
+        """Decode a cursor; raises ValueError if it is malformed."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_at = datetime.fromisoformat(payload["created_at"])
+            document_id = ObjectId(payload["id"]) if payload["oid"] else payload["id"]
+            return created_at, document_id
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    @staticmethod
+    def _keyset_query(query: Dict, cursor: Optional[str], descending: bool) -> Dict:
+        """Restrict a query to documents after the cursor position."""
+        if not cursor:
+            return query
+        created_at, document_id = MongoDB.decode_cursor(cursor)
+        op = "$lt" if descending else "$gt"
+        return {
+            **query,
+            "$or": [
+                {"created_at": {op: created_at}},
+                {"created_at": created_at, "_id": {op: document_id}}
+            ]
+        }
+
+    @staticmethod
+    def _keyset_projection(projection: Optional[Dict]) -> Optional[Dict]:
+        """Make sure the cursor fields survive an inclusion projection."""
+        if not projection or not any(projection.values()):
+            return projection
+        return {**projection, "_id": 1, "created_at": 1}
+
+    async def _paginate(
+        self,
+        collection: str,
+        query: Dict,
+        cursor: Optional[str],
+        limit: int,
+        descending: bool,
+        projection: Optional[Dict]
+    ) -> Dict[str, Any]:
+        """Fetch one keyset page ordered by (created_at, _id)."""
+        direction = -1 if descending else 1
+        documents = await self.db[collection].find(
+            self._keyset_query(query, cursor, descending),
+            self._keyset_projection(projection)
+        ).sort(
+            [("created_at", direction), ("_id", direction)]
+        ).limit(limit + 1).to_list(length=limit + 1)
+
+        # The extra document only tells us whether another page exists
+        has_more = len(documents) > limit
+        items = documents[:limit]
+        return {
+            "items": items,
+            "next_cursor": self.encode_cursor(items[-1]) if has_more else None
+        }
+
+    async def _stream(
+        self,
+        collection: str,
+        query: Dict,
+        descending: bool,
+        projection: Optional[Dict],
+        batch_size: int
+    ) -> AsyncIterator[Dict]:
+        """Yield documents in (created_at, _id) order, one batch in memory at a time."""
+        direction = -1 if descending else 1
+        cursor = self.db[collection].find(query, projection).sort(
+            [("created_at", direction), ("_id", direction)]
+        ).batch_size(batch_size)
+        try:
+            async for document in cursor:
+                yield document
+        finally:
+            await cursor.close()
+
+    async def get_conversation_messages_page(
+        self,
+        conversation_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        projection: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Get a page of a conversation's messages, oldest first."""
+        await self.flush_messages()
+        return await self._paginate(
+            "messages",
+            {"conversation_id": conversation_id},
+            cursor,
+            limit,
+            descending=False,
+            projection=projection
+        )
+
+    async def stream_conversation_messages(
+        self,
+        conversation_id: str,
+        projection: Optional[Dict] = None,
+        batch_size: int = 100
+    ) -> AsyncIterator[Dict]:
+        """Stream a conversation's messages, oldest first."""
+        await self.flush_messages()
+        async for document in self._stream(
+            "messages",
+            {"conversation_id": conversation_id},
+            descending=False,
+            projection=projection,
+            batch_size=batch_size
+        ):
+            yield document
+
+    async def get_user_bookings_page(
+        self,
+        user_id: str,
+        booking_type: str,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        projection: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Get a page of a user's bookings of one type, newest first."""
+        collection = self.BOOKING_COLLECTIONS.get(booking_type)
+        if not collection:
+            raise ValueError(f"Invalid booking type: {booking_type}")
+
+        return await self._paginate(
+            collection,
+            {"user_id": user_id},
+            cursor,
+            limit,
+            descending=True,
+            projection=projection
+        )
+
+    def stream_user_bookings(
+        self,
+        user_id: str,
+        booking_type: str,
+        projection: Optional[Dict] = None,
+        batch_size: int = 100
+    ) -> AsyncIterator[Dict]:
+        """Stream a user's bookings of one type, newest first."""
+        collection = self.BOOKING_COLLECTIONS.get(booking_type)
+        if not collection:
+            raise ValueError(f"Invalid booking type: {booking_type}")
+
+        return self._stream(
+            collection,
+            {"user_id": user_id},
+            descending=True,
+            projection=projection,
+            batch_size=batch_size
+        )
+
+    async def _find_booking_in(self, collection: str, booking_reference: str) -> Optional[Dict]:
+        """Look up a booking reference in a single booking collection."""
+        booking = await self.db[collection].find_one(
+            {"booking_reference": booking_reference}
+        )
+        if booking:
+            booking["booking_type"] = collection.replace("_bookings", "").replace("_", "")
+        return booking
+
     async def get_booking_by_reference(self, booking_reference: str) -> Optional[Dict]:
-        """Find a booking by reference across all booking collections."""
+        """Find a booking by reference across all booking collections.
+
+        All collections are queried concurrently, so a lookup costs one
+        round trip; the remaining queries are cancelled on the first hit.
+        """
         booking_collections = [
             "flight_bookings",
             "hotel_bookings",
@@ -253,14 +482,21 @@ class MongoDB:
             "excursions"
         ]
         
-        for collection in booking_collections:
-            booking = await self.db[collection].find_one(
-                {"booking_reference": booking_reference}
-            )
-            if booking:
-                booking["booking_type"] = collection.replace("_bookings", "").replace("_", "")
-                return booking
-        return None
+        pending = {
+            asyncio.create_task(self._find_booking_in(collection, booking_reference))
+            for collection in booking_collections
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    booking = task.result()
+                    if booking:
+                        return booking
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def create_conversation(self, user_id: str) -> str:
         """Create a new conversation and return its ID."""
@@ -274,13 +510,17 @@ class MongoDB:
     async def add_message(self, conversation_id: str, role: str, content: str) -> Dict:
         """Add a message to a conversation."""
         message = {
+            "_id": ObjectId(),
             "conversation_id": conversation_id,
             "role": role,
             "content": content,
             "created_at": datetime.utcnow(),
             "metadata": {}
         }
-        await self.db.messages.insert_one(message)
+        if self.message_buffer and self.message_buffer.running:
+            await self.message_buffer.add(message)
+        else:
+            await self.db.messages.insert_one(message)
         return message
 
     async def end_conversation(self, conversation_id: str) -> bool:
@@ -293,13 +533,7 @@ class MongoDB:
 
     async def create_booking(self, booking_type: str, booking_data: Dict) -> str:
         """Create a new booking of specified type."""
-        collection_map = {
-            "flight": "flight_bookings",
-            "hotel": "hotel_bookings",
-            "car": "car_rentals",
-            "excursion": "excursions"
-        }
-        collection = collection_map.get(booking_type)
+        collection = self.BOOKING_COLLECTIONS.get(booking_type)
         if not collection:
             raise ValueError(f"Invalid booking type: {booking_type}")
             
@@ -318,13 +552,7 @@ class MongoDB:
         status: str
     ) -> bool:
         """Update booking status."""
-        collection_map = {
-            "flight": "flight_bookings",
-            "hotel": "hotel_bookings",
-            "car": "car_rentals",
-            "excursion": "excursions"
-        }
-        collection = collection_map.get(booking_type)
+        collection = self.BOOKING_COLLECTIONS.get(booking_type)
         if not collection:
             raise ValueError(f"Invalid booking type: {booking_type}")
             
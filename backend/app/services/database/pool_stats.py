@@ -0,0 +1,67 @@
+from typing import Any, Dict
+from pymongo import monitoring
+import threading
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Track MongoDB connection pool usage from CMAP events.
+
+    Registered as an event listener on the shared client; counters are
+    summed across every server pool the client opens.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.wait_queue = 0
+        self.check_out_failures = 0
+        self.pool_clears = 0
+
+    def _add(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, max(0, getattr(self, name) + delta))
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add(pool_clears=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add(open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(open=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(wait_queue=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(wait_queue=-1, check_out_failures=1)
+
+    def connection_checked_out(self, event):
+        self._add(wait_queue=-1, checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._add(checked_out=-1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current pool counters."""
+        with self._lock:
+            return {
+                "open_connections": self.open,
+                "checked_out": self.checked_out,
+                "wait_queue_size": self.wait_queue,
+                "check_out_failures": self.check_out_failures,
+                "pool_clears": self.pool_clears
+            }
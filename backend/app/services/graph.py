@@ -1,5 +1,5 @@
-from typing import Dict, Any, List, Tuple
-from langgraph.graph import StateGraph
+from typing import Dict, Any, List, Tuple, Callable, Optional, TypedDict
+from langgraph.graph import StateGraph, START, END
 from app.services.agents import (
     AssistantAgent,
     FlightBookingAgent,
@@ -8,63 +8,149 @@ from app.services.agents import (
     ExcursionAgent,
     SensitiveWorkflowAgent
 )
+from app.services.llm import get_llm
+from app.core.config import settings
 from graphviz import Digraph
+import threading
+import logging
 import json
 
-def get_node_connections() -> List[Tuple[str, str]]:
-    """Get the list of node connections for visualization"""
-    return [
-        ("ASSISTANT", "FLIGHT"),
-        ("ASSISTANT", "HOTEL"),
-        ("ASSISTANT", "CAR_RENTAL"),
-        ("ASSISTANT", "EXCURSION"),
-        ("ASSISTANT", "SENSITIVE"),
-        ("FLIGHT", "ASSISTANT"),
-        ("HOTEL", "ASSISTANT"),
-        ("CAR_RENTAL", "ASSISTANT"),
-        ("EXCURSION", "ASSISTANT"),
-        ("SENSITIVE", "ASSISTANT")
-    ]
-
-def get_chat_graph() -> StateGraph:
-    # Initialize agents
-    assistant = AssistantAgent()
-    flight = FlightBookingAgent()
-    hotel = HotelBookingAgent()
-    car_rental = CarRentalAgent()
-    excursion = ExcursionAgent()
-    sensitive = SensitiveWorkflowAgent()
+logger = logging.getLogger(__name__)
+
+SPECIALIST_NODES = ["FLIGHT", "HOTEL", "CAR_RENTAL", "EXCURSION", "SENSITIVE"]
+GRAPH_NODES = ["ASSISTANT"] + SPECIALIST_NODES
+
+class AgentState(TypedDict, total=False):
+    """Per-conversation state carried through the graph."""
+    messages: List[Tuple[str, str]]
+    next: Optional[str]
+    requires_action: bool
+    action_type: Optional[str]
+    context: Dict[str, Any]
+    dialog_state: List[str]
+    error: Optional[str]
+
+def get_node_connections(name: str = "chat") -> List[Tuple[str, str]]:
+    """Get the compiled graph's edges for visualization.
+
+    Includes the entry edges from START (straight to the specialists when
+    the fast path is on) and each node's edges to END.
+    """
+    connections = _node_connections.get(name)
+    if connections is None:
+        connections = [(edge.source, edge.target) for edge in get_graph(name).get_graph().edges]
+        _node_connections[name] = connections
+    return connections
+
+def get_graph_nodes() -> List[str]:
+    """Every node an edge from ``get_node_connections()`` can touch."""
+    return [START] + GRAPH_NODES + [END]
+
+def build_chat_graph() -> Any:
+    """Construct the agents and compile the travel assistant workflow.
+
+    This is comparatively expensive (agent construction plus graph
+    compilation) and should only run once per process; use
+    ``get_chat_graph()`` on the request path.
+    """
+    # Initialize agents on the shared, pooled LLM client
+    llm = get_llm()
+    assistant = AssistantAgent(llm=llm)
+    flight = FlightBookingAgent(llm=llm)
+    hotel = HotelBookingAgent(llm=llm)
+    car_rental = CarRentalAgent(llm=llm)
+    excursion = ExcursionAgent(llm=llm)
+    sensitive = SensitiveWorkflowAgent(llm=llm)
 
     # Create state graph
-    workflow = StateGraph(name="Travel Assistant Workflow")
+    workflow = StateGraph(AgentState)
 
-    # Add nodes
-    workflow.add_node("ASSISTANT", assistant.invoke)
-    workflow.add_node("FLIGHT", flight.invoke)
-    workflow.add_node("HOTEL", hotel.invoke)
-    workflow.add_node("CAR_RENTAL", car_rental.invoke)
-    workflow.add_node("EXCURSION", excursion.invoke)
-    workflow.add_node("SENSITIVE", sensitive.invoke)
+    def specialist(node: str, agent: Any) -> Callable[[Dict[str, Any]], Any]:
+        async def run(state: Dict[str, Any]) -> Dict[str, Any]:
+            if state.get("next") == node:
+                return await agent.run(state)
+            # Entered directly by the fast path: apply the handoff bookkeeping
+            # ASSISTANT would have, so later turns see the same context
+            state = {**state, "context": assistant.handoff_context(state.get("context") or {}, node)}
+            return {"context": state["context"], **await agent.run(state)}
+        return run
+
+    # Add nodes; run() also records each reply in conversation memory
+    workflow.add_node("ASSISTANT", assistant.run)
+    workflow.add_node("FLIGHT", specialist("FLIGHT", flight))
+    workflow.add_node("HOTEL", specialist("HOTEL", hotel))
+    workflow.add_node("CAR_RENTAL", specialist("CAR_RENTAL", car_rental))
+    workflow.add_node("EXCURSION", specialist("EXCURSION", excursion))
+    workflow.add_node("SENSITIVE", specialist("SENSITIVE", sensitive))
 
     # Define conditional routing
     def should_route(state: Dict[str, Any]) -> str:
-        next_agent = state.get("next", "ASSISTANT")
-        # If no specific next agent is set, return to assistant
-        return next_agent if next_agent != "NONE" else "ASSISTANT"
-
-    # Add edges with conditional routing
-    workflow.add_edge("ASSISTANT", should_route)
-    workflow.add_edge("FLIGHT", should_route)
-    workflow.add_edge("HOTEL", should_route)
-    workflow.add_edge("CAR_RENTAL", should_route)
-    workflow.add_edge("EXCURSION", should_route)
-    workflow.add_edge("SENSITIVE", should_route)
+        next_agent = state.get("next", "NONE")
+        # The assistant answered directly, so the turn is complete
+        return next_agent if next_agent in SPECIALIST_NODES else END
+
+    # The assistant delegates; specialists answer and end the turn
+    workflow.add_conditional_edges("ASSISTANT", should_route)
+    for node in SPECIALIST_NODES:
+        workflow.add_edge(node, END)
+
+    def route_entry(state: Dict[str, Any]) -> str:
+        # Keyword delegation is deterministic, so a turn the assistant would
+        # only hand off enters the specialist directly instead of running
+        # ASSISTANT to append a canned handoff message first
+        messages = state.get("messages") or []
+        latest = messages[-1][1] if messages else ""
+        next_agent = assistant.determine_next_agent(latest)
+        return next_agent if next_agent in SPECIALIST_NODES else "ASSISTANT"
 
     # Set entry point
-    workflow.set_entry_point("ASSISTANT")
+    if settings.GRAPH_FAST_PATH_ENABLED:
+        workflow.set_conditional_entry_point(route_entry, GRAPH_NODES)
+    else:
+        workflow.set_entry_point("ASSISTANT")
 
     return workflow.compile()
 
+# Process-wide registry of compiled graphs. Per-turn state travels in the
+# graph state and agent memory is keyed by conversation scope, so a single
+# compiled graph can safely serve every request.
+_GRAPH_BUILDERS: Dict[str, Callable[[], Any]] = {
+    "chat": build_chat_graph
+}
+_compiled_graphs: Dict[str, Any] = {}
+_node_connections: Dict[str, List[Tuple[str, str]]] = {}
+_registry_lock = threading.Lock()
+
+def get_graph(name: str = "chat") -> Any:
+    """Get a compiled graph from the registry, compiling it on first use."""
+    graph = _compiled_graphs.get(name)
+    if graph is None:
+        with _registry_lock:
+            graph = _compiled_graphs.get(name)
+            if graph is None:
+                builder = _GRAPH_BUILDERS.get(name)
+                if builder is None:
+                    raise KeyError(f"Unknown graph: {name}")
+                graph = builder()
+                _compiled_graphs[name] = graph
+                logger.info(f"Compiled graph '{name}'")
+    return graph
+
+def get_chat_graph() -> Any:
+    """Get the shared compiled chat graph."""
+    return get_graph("chat")
+
+def warm_up_graphs() -> None:
+    """Compile every registered graph so requests never pay construction cost."""
+    for name in _GRAPH_BUILDERS:
+        get_graph(name)
+
+def reset_graph_registry() -> None:
+    """Drop all compiled graphs (used by tests and configuration reloads)."""
+    with _registry_lock:
+        _compiled_graphs.clear()
+        _node_connections.clear()
+
 def export_graph_visualization(filepath: str = "agent_workflow.gv") -> None:
     """Export the graph visualization to a file"""
     dot = visualize_graph()
@@ -76,6 +162,8 @@ def visualize_graph() -> Digraph:
     dot.attr(rankdir='LR')  # Left to right layout
     
     # Add nodes
+    dot.node(START, 'Start', shape='point')
+    dot.node(END, 'End', shape='doublecircle')
     dot.node('ASSISTANT', 'Assistant\nAgent', shape='circle')
     dot.node('FLIGHT', 'Flight\nBooking', shape='box')
     dot.node('HOTEL', 'Hotel\nBooking', shape='box')
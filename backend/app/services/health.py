@@ -0,0 +1,134 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+from datetime import datetime
+from app.core.config import settings
+from app.services.cache import get_cache
+from app.services.database import mongodb
+from app.services.memory import get_conversation_memory
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+AGENTS = {
+    "router": "available",
+    "flight_booking": "available",
+    "hotel_booking": "available",
+    "car_rental": "available",
+    "excursion": "available",
+    "sensitive_workflow": "available"
+}
+
+class HealthService:
+    """Non-blocking health checks for MongoDB, Redis and the agent layer.
+
+    Checks reuse the application's pooled clients, run concurrently and
+    are bounded by ``timeout``. Redis ``INFO`` and MongoDB server info
+    change slowly, so they are cached for ``info_ttl`` seconds; a probe
+    otherwise costs one ping per backend.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, info_ttl: Optional[float] = None):
+        self.timeout = settings.HEALTH_CHECK_TIMEOUT if timeout is None else timeout
+        self.info_ttl = settings.HEALTH_INFO_TTL if info_ttl is None else info_ttl
+        # name -> (expires_at, value)
+        self._info: Dict[str, tuple] = {}
+
+    async def _cached_info(self, name: str, fetch: Callable[[], Awaitable[Dict]]) -> Dict:
+        cached = self._info.get(name)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+        value = await fetch()
+        self._info[name] = (now + self.info_ttl, value)
+        return value
+
+    async def check_database(self) -> Dict[str, Any]:
+        """MongoDB ping latency, pool usage and server version."""
+        if not mongodb.client:
+            return {"status": "unhealthy", "error": "MongoDB not connected"}
+
+        latency = await mongodb.ping()
+        server_info = await self._cached_info("mongodb", mongodb.client.server_info)
+        return {
+            "status": "healthy",
+            "details": {
+                "connected": True,
+                "version": server_info.get("version"),
+                "latency_ms": round(latency, 2),
+                "pool": mongodb.pool_status()
+            }
+        }
+
+    async def check_cache(self) -> Dict[str, Any]:
+        """Redis ping latency and memory/client stats."""
+        if not settings.REDIS_ENABLED:
+            return {"status": "disabled"}
+
+        cache = await get_cache()
+        if not cache.redis:
+            return {"status": "unhealthy", "error": "Redis not connected"}
+
+        start_time = time.perf_counter()
+        await cache.redis.ping()
+        latency = (time.perf_counter() - start_time) * 1000
+
+        info = await self._cached_info("redis", cache.redis.info)
+        return {
+            "status": "healthy",
+            "details": {
+                "connected": True,
+                "latency_ms": round(latency, 2),
+                "used_memory": info.get("used_memory_human"),
+                "connected_clients": info.get("connected_clients"),
+                "uptime_days": info.get("uptime_in_days")
+            }
+        }
+
+    async def check_agents(self) -> Dict[str, Any]:
+        """Agent availability and conversation memory footprint."""
+        return {
+            "status": "healthy",
+            "agents": AGENTS,
+            "memory": get_conversation_memory().stats()
+        }
+
+    async def run(self, name: str, check: Callable[[], Awaitable[Dict]]) -> Dict[str, Any]:
+        """Run one check with a timeout, turning failures into an unhealthy result."""
+        try:
+            result = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Health check '{name}' timed out after {self.timeout}s")
+            result = {"status": "unhealthy", "error": f"Timed out after {self.timeout}s"}
+        except Exception as e:
+            logger.error(f"Health check '{name}' failed: {e}")
+            result = {"status": "unhealthy", "error": str(e)}
+        return {**result, "timestamp": datetime.utcnow().isoformat()}
+
+    async def check_all(self) -> Dict[str, Any]:
+        """Run every check concurrently."""
+        checks = {
+            "database": self.check_database,
+            "cache": self.check_cache,
+            "agents": self.check_agents
+        }
+        results = await asyncio.gather(*(self.run(name, check) for name, check in checks.items()))
+        components = dict(zip(checks, results))
+
+        healthy = all(result["status"] in ("healthy", "disabled") for result in components.values())
+        return {
+            "status": "healthy" if healthy else "degraded",
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": settings.VERSION,
+            "checks": components
+        }
+
+_health_service: Optional[HealthService] = None
+
+def get_health_service() -> HealthService:
+    """Get or create the shared health service."""
+    global _health_service
+
+    if _health_service is None:
+        _health_service = HealthService()
+    return _health_service
@@ -0,0 +1,72 @@
+from typing import Dict, Optional, Tuple
+from langchain_openai import ChatOpenAI
+from app.core.config import settings
+import httpx
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_http_client: Optional[httpx.AsyncClient] = None
+_llm_clients: Dict[Tuple[str, float], ChatOpenAI] = {}
+_lock = threading.Lock()
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared keep-alive HTTP client used for all LLM traffic."""
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT)
+        )
+        logger.info(
+            f"LLM HTTP client initialized "
+            f"(max_connections={settings.LLM_MAX_CONNECTIONS}, "
+            f"keepalive={settings.LLM_MAX_KEEPALIVE_CONNECTIONS})"
+        )
+    return _http_client
+
+def get_llm(model: Optional[str] = None, temperature: Optional[float] = None) -> ChatOpenAI:
+    """Get a shared chat model client for the given model and temperature.
+
+    Clients are cached per (model, temperature) and all of them reuse the
+    same HTTP connection pool.
+    """
+    model = model or settings.DEFAULT_MODEL
+    temperature = settings.DEFAULT_TEMPERATURE if temperature is None else temperature
+    key = (model, temperature)
+
+    llm = _llm_clients.get(key)
+    if llm is None:
+        with _lock:
+            llm = _llm_clients.get(key)
+            if llm is None:
+                llm = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    api_key=settings.OPENAI_API_KEY,
+                    base_url=settings.OPENAI_BASE_URL,
+                    http_async_client=get_http_client(),
+                    # Retries are handled by app.services.resilience
+                    max_retries=0
+                )
+                _llm_clients[key] = llm
+                logger.debug(f"Created LLM client for model={model} temperature={temperature}")
+    return llm
+
+async def close_llm_clients() -> None:
+    """Close the shared HTTP pool and drop cached clients."""
+    global _http_client
+
+    with _lock:
+        _llm_clients.clear()
+        client, _http_client = _http_client, None
+
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.info("LLM HTTP client closed")
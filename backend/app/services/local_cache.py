@@ -0,0 +1,110 @@
+from typing import Iterable, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import json
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LocalCache:
+    """Bounded in-process LRU with per-entry TTL.
+
+    Holds serialized values in front of Redis. ``epoch`` advances on every
+    invalidation; a reader that started before an invalidation passes its
+    epoch to ``set`` so it cannot re-populate a value that was just
+    invalidated by another worker.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.epoch = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, epoch: Optional[int] = None) -> None:
+        if epoch is not None and epoch != self.epoch:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        self.epoch += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._entries.clear()
+
+class InvalidationListener:
+    """Keeps a worker's local tier coherent with the other workers.
+
+    Writers publish the keys they change on ``channel``; every worker
+    drops those keys from its local tier. If the subscription drops,
+    the local tier is cleared, since invalidations may have been missed.
+    """
+
+    def __init__(self, redis, local: LocalCache, channel: str):
+        self.redis = redis
+        self.local = local
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    def message(self, keys: Iterable[str]) -> str:
+        return json.dumps({"origin": self.origin, "keys": list(keys)})
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _handle(self, data) -> None:
+        payload = json.loads(data)
+        if payload["origin"] != self.origin:
+            self.local.discard(payload["keys"])
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                logger.info(f"Listening for cache invalidations on {self.channel}")
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        self._handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error, clearing local cache: {e}")
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
@@ -0,0 +1,224 @@
+from typing import Dict, Any, Deque, List, Optional, Callable, Awaitable, Tuple
+from collections import OrderedDict, deque
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from app.core.config import settings
+from app.core.metrics import MEMORY_CONVERSATIONS, MEMORY_TOKENS
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+Summarizer = Callable[[str, List[BaseMessage]], Awaitable[str]]
+TokenCounter = Callable[[BaseMessage], int]
+
+def approximate_tokens(message: BaseMessage) -> int:
+    """Cheap token estimate (~4 characters per token plus message overhead)."""
+    return len(message.content) // 4 + 4
+
+def conversation_scope(state: Optional[Dict[str, Any]]) -> str:
+    """Build the memory scope for a conversation from graph state."""
+    context = (state or {}).get("context") or {}
+    user_id = context.get("user_id", "anonymous")
+    conversation_id = context.get("conversation_id", "default")
+    return f"{user_id}:{conversation_id}"
+
+class ConversationWindow:
+    """Token-budgeted message window for a single conversation."""
+
+    __slots__ = ("messages", "tokens", "summary", "pending", "recent", "last_access")
+
+    # Fingerprints kept for recognising messages that were already recorded
+    RECENT_SIZE = 64
+
+    def __init__(self):
+        self.messages: List[BaseMessage] = []
+        self.tokens = 0
+        self.summary = ""
+        self.pending: List[BaseMessage] = []
+        self.recent: Deque[Tuple[str, str]] = deque(maxlen=self.RECENT_SIZE)
+        self.last_access = time.monotonic()
+
+def _fingerprint(message: BaseMessage) -> Tuple[str, str]:
+    return (message.type, message.content)
+
+def _new_messages(recent: Deque[Tuple[str, str]], messages: List[BaseMessage]) -> List[BaseMessage]:
+    """The messages that follow what was already recorded.
+
+    Callers may pass the full history or only the latest turn. The longest
+    leading run of ``messages`` whose tail lines up with the most recently
+    recorded messages is taken as already seen; everything after it is new.
+    """
+    if not recent:
+        return messages
+    recorded = list(recent)
+    last = recorded[-1]
+    prints = [_fingerprint(message) for message in messages]
+    for end in range(len(prints), 0, -1):
+        if prints[end - 1] != last:
+            continue
+        overlap = min(end, len(recorded))
+        if prints[end - overlap:end] == recorded[-overlap:]:
+            return messages[end:]
+    return messages
+
+class ConversationMemory:
+    """Bounded conversation memory shared by all agents.
+
+    Each conversation keeps only the most recent messages that fit in
+    ``max_tokens``. Messages pushed out of the window are either dropped
+    or, when a summarizer is configured, folded into a rolling summary
+    that is prepended to the window. Conversations are evicted when idle
+    for ``idle_ttl`` seconds or when more than ``max_conversations`` are
+    held, least recently used first.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_conversations: Optional[int] = None,
+        idle_ttl: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None,
+        token_counter: TokenCounter = approximate_tokens
+    ):
+        self.max_tokens = max_tokens or settings.MEMORY_MAX_TOKENS
+        self.max_conversations = max_conversations or settings.MEMORY_MAX_CONVERSATIONS
+        self.idle_ttl = idle_ttl or settings.MEMORY_IDLE_TTL
+        self.summarizer = summarizer
+        self.count_tokens = token_counter
+        self._windows: "OrderedDict[str, ConversationWindow]" = OrderedDict()
+        self._total_tokens = 0
+
+    def _get_window(self, scope: str) -> ConversationWindow:
+        """Get or create a window and mark it most recently used."""
+        self._expire_idle()
+
+        window = self._windows.get(scope)
+        if window is None:
+            window = ConversationWindow()
+            self._windows[scope] = window
+            while len(self._windows) > self.max_conversations:
+                _, evicted = self._windows.popitem(last=False)
+                self._total_tokens -= evicted.tokens
+        else:
+            self._windows.move_to_end(scope)
+            window.last_access = time.monotonic()
+        return window
+
+    def _expire_idle(self) -> None:
+        """Drop idle conversations; windows are kept in access order."""
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._windows:
+            window = next(iter(self._windows.values()))
+            if window.last_access > cutoff:
+                break
+            self._windows.popitem(last=False)
+            self._total_tokens -= window.tokens
+
+    def add_messages(self, scope: str, messages: List[BaseMessage]) -> None:
+        """Record a conversation's messages, keeping only new ones.
+
+        Clients may send the full conversation or just the latest message
+        each turn; messages that repeat what was most recently recorded
+        for this scope are skipped.
+        """
+        window = self._get_window(scope)
+        messages = [message for message in messages if isinstance(message, (HumanMessage, AIMessage))]
+
+        for message in _new_messages(window.recent, messages):
+            window.messages.append(message)
+            window.recent.append(_fingerprint(message))
+            tokens = self.count_tokens(message)
+            window.tokens += tokens
+            self._total_tokens += tokens
+
+        self._trim(window)
+        self._record_metrics()
+
+    def _trim(self, window: ConversationWindow) -> None:
+        """Slide the window until it fits the token budget."""
+        while window.tokens > self.max_tokens and len(window.messages) > 1:
+            message = window.messages.pop(0)
+            tokens = self.count_tokens(message)
+            window.tokens -= tokens
+            self._total_tokens -= tokens
+            if self.summarizer:
+                window.pending.append(message)
+
+    async def get_messages(self, scope: str) -> List[BaseMessage]:
+        """Get the bounded prompt history for a conversation."""
+        window = self._get_window(scope)
+
+        if window.pending and self.summarizer:
+            pending, window.pending = window.pending, []
+            try:
+                window.summary = await self.summarizer(window.summary, pending)
+            except Exception as e:
+                logger.error(f"Error summarising conversation {scope}: {e}")
+
+        if window.summary:
+            return [SystemMessage(content=f"Conversation summary: {window.summary}")] + window.messages
+        return list(window.messages)
+
+    def clear(self, scope: Optional[str] = None) -> None:
+        """Clear one conversation, or all of them."""
+        if scope is None:
+            self._windows.clear()
+            self._total_tokens = 0
+        else:
+            window = self._windows.pop(scope, None)
+            if window:
+                self._total_tokens -= window.tokens
+        self._record_metrics()
+
+    def _record_metrics(self) -> None:
+        MEMORY_CONVERSATIONS.set(len(self._windows))
+        MEMORY_TOKENS.set(self._total_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the memory footprint."""
+        message_count = sum(len(window.messages) for window in self._windows.values())
+        content_bytes = sum(
+            len(window.summary.encode())
+            + sum(len(message.content.encode()) for message in window.messages)
+            for window in self._windows.values()
+        )
+        return {
+            "conversations": len(self._windows),
+            "messages": message_count,
+            "tokens": self._total_tokens,
+            "content_bytes": content_bytes,
+            "max_tokens_per_conversation": self.max_tokens,
+            "max_conversations": self.max_conversations
+        }
+
+def llm_summarizer(llm) -> Summarizer:
+    """Build a summarizer that folds old messages into a running summary."""
+    async def summarize(summary: str, messages: List[BaseMessage]) -> str:
+        transcript = "\n".join(
+            f"{'Customer' if isinstance(msg, HumanMessage) else 'Agent'}: {msg.content}"
+            for msg in messages
+        )
+        response = await llm.ainvoke([
+            SystemMessage(content=(
+                "Update the conversation summary with the new messages. "
+                "Keep names, dates, destinations and booking details. "
+                "Reply with the summary only."
+            )),
+            HumanMessage(content=f"Current summary: {summary or 'None'}\n\nNew messages:\n{transcript}")
+        ])
+        return response.content
+    return summarize
+
+_memory: Optional[ConversationMemory] = None
+
+def get_conversation_memory() -> ConversationMemory:
+    """Get or create the process-wide conversation memory."""
+    global _memory
+
+    if _memory is None:
+        summarizer = None
+        if settings.MEMORY_SUMMARY_ENABLED:
+            from app.services.llm import get_llm
+            summarizer = llm_summarizer(get_llm(settings.DEFAULT_MODEL, 0.0))
+        _memory = ConversationMemory(summarizer=summarizer)
+    return _memory
@@ -1,64 +1,126 @@
 from fastapi import HTTPException, status
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from collections import OrderedDict, deque
+from typing import Deque, Optional, Tuple
+from app.core.config import settings
+from app.services.cache import get_cache
+import math
+import time
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sliding-window log: one sorted set per user scored by request time (ms).
+# Trims expired entries, counts and records the request atomically so a
+# check costs a single round trip. Returns {allowed, retry_after_ms}.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, 0}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return {0, math.ceil(tonumber(oldest[2]) + window - now)}
+"""
+
 class RateLimiter:
-    def __init__(self):
-        self.requests: Dict[str, Tuple[datetime, int]] = {}
-        self.window_size = timedelta(minutes=1)
-        self.max_requests = 60  # 60 requests per minute
+    """Per-user sliding-window rate limiter.
+
+    Uses Redis when available so limits are shared across workers and
+    replicas, and falls back to an in-process window log otherwise.
+    """
+
+    KEY_PREFIX = "ratelimit"
+
+    def __init__(self, max_requests: Optional[int] = None, window_seconds: Optional[int] = None):
+        self.max_requests = max_requests or settings.RATE_LIMIT_REQUESTS
+        self.window_seconds = window_seconds or settings.RATE_LIMIT_WINDOW
+        self._script = None
+        self._script_client = None
+        # user_id -> request timestamps, ordered by most recent activity
+        self._requests: "OrderedDict[str, Deque[float]]" = OrderedDict()
 
     async def check_rate_limit(self, user_id: str = None) -> bool:
         """
         Check if the request should be rate limited.
         Returns True if request is allowed, raises HTTPException if rate limited.
         """
+        if not user_id:
+            return True  # Skip rate limiting if no user_id
+
         try:
-            if not user_id:
-                return True  # Skip rate limiting if no user_id
-
-            current_time = datetime.now()
-            
-            # Clean up old entries
-            self._cleanup_old_requests(current_time)
-
-            # Get or create user's request record
-            window_start, request_count = self.requests.get(user_id, (current_time, 0))
-
-            # Reset window if needed
-            if current_time - window_start > self.window_size:
-                window_start = current_time
-                request_count = 0
-
-            # Check rate limit
-            if request_count >= self.max_requests:
-                logger.warning(f"Rate limit exceeded for user {user_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
-                        "code": "RATE_LIMIT_EXCEEDED",
-                        "message": "Too many requests. Please try again later."
-                    }
-                )
-
-            # Update request count
-            self.requests[user_id] = (window_start, request_count + 1)
-            return True
-
-        except HTTPException:
-            raise
+            allowed, retry_after = await self._check_redis(user_id)
         except Exception as e:
-            logger.error(f"Error in rate limiter: {e}")
-            return True  # Allow request on error
-
-    def _cleanup_old_requests(self, current_time: datetime) -> None:
-        """Remove entries older than the window size."""
-        cutoff_time = current_time - self.window_size
-        self.requests = {
-            user_id: (window_start, count)
-            for user_id, (window_start, count) in self.requests.items()
-            if window_start > cutoff_time
-        } 
\ No newline at end of file
+            logger.error(f"Redis rate limiter unavailable, using local limits: {e}")
+            allowed, retry_after = None, 0.0
+
+        if allowed is None:
+            allowed, retry_after = self._check_local(user_id, time.monotonic())
+
+        if not allowed:
+            logger.warning(f"Rate limit exceeded for user {user_id}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "code": "RATE_LIMIT_EXCEEDED",
+                    "message": "Too many requests. Please try again later."
+                },
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+        return True
+
+    async def _check_redis(self, user_id: str) -> Tuple[Optional[bool], float]:
+        """Check the shared window in Redis; (None, 0) when Redis is disabled."""
+        cache = await get_cache()
+        if not cache.redis or not settings.REDIS_ENABLED:
+            return None, 0.0
+
+        if self._script is None or self._script_client is not cache.redis:
+            self._script = cache.redis.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = cache.redis
+
+        now_ms = int(time.time() * 1000)
+        allowed, retry_after_ms = await self._script(
+            keys=[f"{self.KEY_PREFIX}:{user_id}"],
+            args=[now_ms, self.window_seconds * 1000, self.max_requests, f"{now_ms}-{uuid.uuid4().hex}"]
+        )
+        return bool(allowed), int(retry_after_ms) / 1000
+
+    def _check_local(self, user_id: str, now: float) -> Tuple[bool, float]:
+        """Check the in-process window log for a user."""
+        cutoff = now - self.window_seconds
+        self._expire_idle_users(cutoff)
+
+        timestamps = self._requests.get(user_id)
+        if timestamps is None:
+            timestamps = self._requests[user_id] = deque()
+        else:
+            self._requests.move_to_end(user_id)
+
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+        if len(timestamps) >= self.max_requests:
+            return False, timestamps[0] + self.window_seconds - now
+
+        timestamps.append(now)
+        return True, 0.0
+
+    def _expire_idle_users(self, cutoff: float) -> None:
+        """Drop users whose latest request left the window.
+
+        Users are kept in activity order, so only the stale prefix is
+        visited: amortised O(1) per request instead of a full scan.
+        """
+        while self._requests:
+            timestamps = next(iter(self._requests.values()))
+            if timestamps and timestamps[-1] > cutoff:
+                break
+            self._requests.popitem(last=False)
@@ -0,0 +1,249 @@
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from collections import deque
+from app.core.config import settings
+from app.core.exceptions import AdmissionTimeoutError, CircuitOpenError
+from app.core.metrics import LLM_CIRCUIT_STATE, LLM_HEDGES, LLM_RETRIES
+import asyncio
+import math
+import random
+import time
+import httpx
+import openai
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient upstream failures worth another attempt."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError))
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Delay requested by the server, if it sent a Retry-After header."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def backoff(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class CircuitBreaker:
+    """Fails fast after repeated upstream failures.
+
+    Opens after ``failure_threshold`` consecutive failures. Once
+    ``reset_timeout`` has passed it lets a single trial call through
+    (half-open); success closes the circuit and failure reopens it.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, model: str, failure_threshold: int, reset_timeout: float):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        """Raise ``CircuitOpenError`` unless a call may go upstream.
+
+        Returns True when the call is the half-open trial, which the caller
+        must hand back with ``release_trial`` however the call ends.
+        """
+        if self.state == self.CLOSED:
+            return False
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        raise CircuitOpenError(self.model, max(remaining, 0.0))
+
+    def release_trial(self) -> None:
+        """Let another trial through after one ended without a verdict."""
+        self._trial_running = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial_running = False
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.model} closed")
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit for {self.model} opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+    def _set_state(self, state: int) -> None:
+        self.state = state
+        LLM_CIRCUIT_STATE.labels(model=self.model).set(state)
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one model."""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+class ResilientCaller:
+    """Retries, hedging and circuit breaking around upstream LLM calls.
+
+    - Retryable failures are retried up to ``max_retries`` times with
+      jittered exponential backoff (or the server's Retry-After).
+    - With hedging on, a second identical attempt starts once the first
+      has run longer than the model's recent p95 latency; the first to
+      succeed wins and the other is cancelled.
+    - Each model has a circuit breaker; while it is open calls fail
+      immediately with ``CircuitOpenError``.
+    """
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        hedge_enabled: Optional[bool] = None,
+        hedge_min_delay: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None
+    ):
+        self.max_retries = settings.MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = settings.LLM_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = settings.LLM_RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.hedge_enabled = settings.LLM_HEDGE_ENABLED if hedge_enabled is None else hedge_enabled
+        self.hedge_min_delay = settings.LLM_HEDGE_MIN_DELAY if hedge_min_delay is None else hedge_min_delay
+        self.hedge_min_samples = (
+            settings.LLM_HEDGE_MIN_SAMPLES if hedge_min_samples is None else hedge_min_samples
+        )
+        self.failure_threshold = failure_threshold or settings.LLM_BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = settings.LLM_BREAKER_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = CircuitBreaker(model, self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def latency(self, model: str) -> LatencyTracker:
+        tracker = self._latencies.get(model)
+        if tracker is None:
+            tracker = self._latencies[model] = LatencyTracker()
+        return tracker
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """Seconds before hedging, or None while hedging is off or unwarmed."""
+        tracker = self.latency(model)
+        if not self.hedge_enabled or len(tracker) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, tracker.percentile(0.95))
+
+    async def call(self, model: str, call: Callable[[], Awaitable[T]]) -> T:
+        breaker = self.breaker(model)
+        attempt = 0
+        while True:
+            trial = breaker.allow()
+            try:
+                result = await self._hedged(model, call)
+            except AdmissionTimeoutError:
+                # Local queueing says nothing about upstream health
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    # Upstream answered (e.g. a 400); it is not degraded
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt >= self.max_retries or breaker.state == breaker.OPEN:
+                    raise
+                error = e
+            else:
+                breaker.record_success()
+                return result
+            finally:
+                # A cancelled or locally failed trial must not wedge the breaker
+                if trial:
+                    breaker.release_trial()
+
+            delay = retry_after(error)
+            if delay is None:
+                delay = backoff(attempt, self.base_delay, self.max_delay)
+            LLM_RETRIES.labels(model=model, reason=type(error).__name__).inc()
+            logger.warning(f"Retrying {model} call in {delay:.2f}s after {type(error).__name__}: {error}")
+            attempt += 1
+            await asyncio.sleep(min(delay, self.max_delay))
+
+    async def _timed(self, model: str, call: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        result = await call()
+        self.latency(model).record(time.monotonic() - start)
+        return result
+
+    async def _hedged(self, model: str, call: Callable[[], Awaitable[T]]) -> T:
+        delay = self.hedge_delay(model)
+        if delay is None:
+            return await self._timed(model, call)
+
+        first = asyncio.ensure_future(self._timed(model, call))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                LLM_HEDGES.labels(model=model).inc()
+                tasks.add(asyncio.ensure_future(self._timed(model, call)))
+
+            error: Optional[BaseException] = None
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+_resilience: Optional[ResilientCaller] = None
+
+def get_resilient_caller() -> ResilientCaller:
+    """Get the process-wide resilience layer for LLM calls."""
+    global _resilience
+
+    if _resilience is None:
+        _resilience = ResilientCaller()
+    return _resilience
@@ -0,0 +1,265 @@
+from typing import Optional, List, Callable, Awaitable
+from collections import OrderedDict
+from langchain_core.messages import BaseMessage, HumanMessage
+from app.core.config import settings
+from app.core.metrics import LLM_CACHE_HITS, LLM_CACHE_MISSES
+from app.services.cache import RedisCache, get_cache
+import hashlib
+import json
+import math
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], Awaitable[List[float]]]
+
+class ResponseCache:
+    """Cache for LLM responses in front of ``BaseAgent._safe_llm_call``.
+
+    Two layers are consulted in order:
+    - exact: keyed on a hash of (model, prompt, messages)
+    - semantic (optional): embedding similarity of a conversation's
+      opening question against ones previously answered under the same
+      model and prompt. Each (model, prompt) scope keeps its own bucket of
+      the ``max_candidates`` most recent questions, so a lookup reads and
+      compares at most that many vectors however many entries are cached
+
+    ``prompt`` identifies the system prompt; agents pass the template plus
+    the context that shapes the answer (``BaseAgent.prompt_scope``) rather
+    than the formatted text, which embeds timestamps and user ids.
+
+    Entries are stored through ``RedisCache``; each agent type has its own
+    namespace, TTL and maximum entry count (oldest entries are evicted).
+    """
+
+    KEY_PREFIX = "llmcache"
+    EMBEDDING_MEMO_SIZE = 256
+
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        embedder: Optional[Embedder] = None,
+        similarity_threshold: Optional[float] = None,
+        max_candidates: Optional[int] = None
+    ):
+        self._cache = cache
+        self.embedder = embedder
+        self.similarity_threshold = (
+            settings.LLM_CACHE_SIMILARITY_THRESHOLD
+            if similarity_threshold is None else similarity_threshold
+        )
+        self.max_candidates = (
+            settings.LLM_CACHE_SEMANTIC_CANDIDATES
+            if max_candidates is None else max_candidates
+        )
+        self._embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    async def _get_cache(self) -> RedisCache:
+        """Lazy initialization of cache connection."""
+        if self._cache is None:
+            self._cache = await get_cache()
+        return self._cache
+
+    @staticmethod
+    def make_key(model: str, prompt: str, messages: List[BaseMessage]) -> str:
+        """Hash the full prompt into a cache key."""
+        payload = json.dumps(
+            [model, prompt, [(msg.type, msg.content) for msg in messages]],
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _scope_digest(model: str, prompt: str) -> str:
+        """Semantic matches are only shared under the same model and prompt."""
+        return hashlib.sha256(json.dumps([model, prompt]).encode()).hexdigest()
+
+    def _entry_key(self, agent_type: str, digest: str) -> str:
+        return f"{self.KEY_PREFIX}:{agent_type}:{digest}"
+
+    def _index_key(self, agent_type: str) -> str:
+        return f"{self.KEY_PREFIX}:{agent_type}:index"
+
+    def _vectors_key(self, agent_type: str, scope: str) -> str:
+        return f"{self.KEY_PREFIX}:{agent_type}:vectors:{scope}"
+
+    def _semantic_candidate(self, messages: List[BaseMessage]) -> Optional[str]:
+        """Only a conversation's opening question is safe to answer from similar ones."""
+        if self.embedder is None:
+            return None
+        questions = [msg for msg in messages if isinstance(msg, HumanMessage)]
+        if len(questions) != 1:
+            return None
+        return questions[0].content.strip().lower() or None
+
+    async def _embed(self, text: str) -> List[float]:
+        """Embed and L2-normalise text, memoising recent results."""
+        vector = self._embeddings.get(text)
+        if vector is not None:
+            self._embeddings.move_to_end(text)
+            return vector
+
+        raw = await self.embedder(text)
+        norm = math.sqrt(sum(value * value for value in raw)) or 1.0
+        vector = [value / norm for value in raw]
+
+        self._embeddings[text] = vector
+        if len(self._embeddings) > self.EMBEDDING_MEMO_SIZE:
+            self._embeddings.popitem(last=False)
+        return vector
+
+    async def lookup(
+        self,
+        agent_type: str,
+        model: str,
+        prompt: str,
+        messages: List[BaseMessage]
+    ) -> Optional[str]:
+        """Return a cached response for this prompt, if any."""
+        try:
+            cache = await self._get_cache()
+            if not cache.redis or not settings.REDIS_ENABLED:
+                return None
+
+            digest = self.make_key(model, prompt, messages)
+            entry = await cache.get(self._entry_key(agent_type, digest))
+            if entry:
+                LLM_CACHE_HITS.labels(agent_type=agent_type, layer="exact").inc()
+                return entry["response"]
+
+            question = self._semantic_candidate(messages)
+            if question:
+                response = await self._semantic_lookup(
+                    cache, agent_type, self._scope_digest(model, prompt), question
+                )
+                if response is not None:
+                    LLM_CACHE_HITS.labels(agent_type=agent_type, layer="semantic").inc()
+                    return response
+
+            LLM_CACHE_MISSES.labels(agent_type=agent_type).inc()
+            return None
+
+        except Exception as e:
+            logger.error(f"Response cache lookup error: {e}")
+            return None
+
+    async def _semantic_lookup(
+        self,
+        cache: RedisCache,
+        agent_type: str,
+        scope: str,
+        question: str
+    ) -> Optional[str]:
+        """Find the most similar cached question above the threshold.
+
+        Only the scope's bucket is read, capped at ``max_candidates``.
+        """
+        vector = await self._embed(question)
+        vectors_key = self._vectors_key(agent_type, scope)
+        candidates = await cache.redis.lrange(vectors_key, 0, self.max_candidates - 1)
+
+        best, best_score = None, self.similarity_threshold
+        for raw in candidates:
+            candidate = json.loads(raw)
+            score = sum(a * b for a, b in zip(vector, candidate["embedding"]))
+            # Candidates are newest first, so the newest wins a tie
+            if score > best_score or (best is None and score == best_score):
+                best, best_score = (raw, candidate["digest"]), score
+
+        if best is None:
+            return None
+
+        raw, digest = best
+        entry = await cache.get(self._entry_key(agent_type, digest))
+        if not entry:
+            # Entry expired or was evicted; drop its stale vector
+            await cache.redis.lrem(vectors_key, 0, raw)
+            return None
+        return entry["response"]
+
+    async def store(
+        self,
+        agent_type: str,
+        model: str,
+        prompt: str,
+        messages: List[BaseMessage],
+        response: str,
+        ttl: int,
+        max_entries: int
+    ) -> None:
+        """Store a response and evict the oldest entries beyond ``max_entries``."""
+        try:
+            cache = await self._get_cache()
+            if not cache.redis or not settings.REDIS_ENABLED or ttl <= 0:
+                return
+
+            digest = self.make_key(model, prompt, messages)
+            stored = await cache.set(
+                self._entry_key(agent_type, digest),
+                {"response": response, "model": model},
+                ttl=ttl
+            )
+            if not stored:
+                return
+
+            index_key = self._index_key(agent_type)
+            question = self._semantic_candidate(messages)
+
+            pipe = cache.redis.pipeline()
+            pipe.zadd(index_key, {digest: time.time()})
+            if question:
+                vector = await self._embed(question)
+                # Newest first; the bucket is capped and expires with its entries
+                vectors_key = self._vectors_key(agent_type, self._scope_digest(model, prompt))
+                pipe.lpush(vectors_key, json.dumps({"digest": digest, "embedding": vector}))
+                pipe.ltrim(vectors_key, 0, self.max_candidates - 1)
+                pipe.expire(vectors_key, ttl)
+            pipe.zcard(index_key)
+            results = await pipe.execute()
+
+            overflow = results[-1] - max_entries
+            if overflow > 0:
+                await self._evict(cache, agent_type, overflow)
+
+        except Exception as e:
+            logger.error(f"Response cache store error: {e}")
+
+    async def _evict(self, cache: RedisCache, agent_type: str, count: int) -> None:
+        """Evict the ``count`` oldest entries for an agent type.
+
+        Their vectors are left to the capped, expiring scope buckets and
+        dropped by the first lookup that matches them.
+        """
+        evicted = await cache.redis.zpopmin(self._index_key(agent_type), count)
+        digests = [digest.decode() if isinstance(digest, bytes) else digest for digest, _ in evicted]
+        if not digests:
+            return
+
+        await cache.redis.delete(*[self._entry_key(agent_type, digest) for digest in digests])
+        logger.debug(f"Evicted {len(digests)} cached responses for {agent_type}")
+
+_response_cache: Optional[ResponseCache] = None
+
+def _default_embedder() -> Optional[Embedder]:
+    """Build the embedding function for the semantic layer, if enabled."""
+    if not settings.LLM_CACHE_SEMANTIC_ENABLED:
+        return None
+
+    from langchain_openai import OpenAIEmbeddings
+    from app.services.llm import get_http_client
+
+    embeddings = OpenAIEmbeddings(
+        model=settings.LLM_CACHE_EMBEDDING_MODEL,
+        api_key=settings.OPENAI_API_KEY,
+        http_async_client=get_http_client()
+    )
+    return embeddings.aembed_query
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the shared response cache."""
+    global _response_cache
+
+    if _response_cache is None:
+        _response_cache = ResponseCache(embedder=_default_embedder())
+    return _response_cache
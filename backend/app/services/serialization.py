@@ -0,0 +1,150 @@
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from app.core.config import settings
+import json
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Values written by StateSerializer start with this header:
+#   MAGIC | format version | serializer id | compression id | payload
+# 0xC1 is never produced by msgpack and is not valid UTF-8, so it cannot
+# collide with the JSON text stored before the header existed.
+MAGIC = 0xC1
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+Codec = Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+
+def _json_codec() -> Codec:
+    return (
+        lambda value: json.dumps(value, separators=(",", ":")).encode(),
+        json.loads
+    )
+
+def _orjson_codec() -> Codec:
+    import orjson
+    return orjson.dumps, orjson.loads
+
+def _msgpack_codec() -> Codec:
+    import msgpack
+    return (
+        lambda value: msgpack.packb(value, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False)
+    )
+
+def _zlib_codec() -> Codec:
+    return zlib.compress, zlib.decompress
+
+def _zstd_codec() -> Codec:
+    import zstandard
+    compressor, decompressor = zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor()
+    return compressor.compress, decompressor.decompress
+
+def _lz4_codec() -> Codec:
+    import lz4.frame
+    return lz4.frame.compress, lz4.frame.decompress
+
+# name -> (wire id, codec factory); ids are persisted, never reuse them
+SERIALIZERS: Dict[str, Tuple[int, Callable[[], Codec]]] = {
+    "json": (1, _json_codec),
+    "orjson": (2, _orjson_codec),
+    "msgpack": (3, _msgpack_codec)
+}
+
+COMPRESSORS: Dict[str, Tuple[int, Callable[[], Codec]]] = {
+    "zlib": (1, _zlib_codec),
+    "zstd": (2, _zstd_codec),
+    "lz4": (3, _lz4_codec)
+}
+
+NO_COMPRESSION = 0
+
+class StateSerializer:
+    """Encode cached values as compact, versioned bytes.
+
+    The serializer (json, orjson, msgpack) and compressor (zlib, zstd,
+    lz4) are chosen by name; payloads smaller than ``threshold`` bytes are
+    stored uncompressed. Every value carries a header naming the codecs
+    used, so readers decode whatever was written regardless of the current
+    configuration, and plain JSON from before the header is still read.
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        threshold: Optional[int] = None
+    ):
+        self._codecs: Dict[Tuple[str, int], Codec] = {}
+        self.serializer = self._resolve(SERIALIZERS, "serializer", serializer or settings.CACHE_SERIALIZER, "json")
+        compression = compression or settings.CACHE_COMPRESSION
+        self.compression = (
+            None if compression == "none"
+            else self._resolve(COMPRESSORS, "compression", compression, None)
+        )
+        self.threshold = settings.CACHE_COMPRESSION_THRESHOLD if threshold is None else threshold
+
+    def _resolve(self, registry: Dict, kind: str, name: str, fallback: Optional[str]) -> Optional[str]:
+        """Check that a codec exists and is importable, falling back if not."""
+        if name not in registry:
+            logger.warning(f"Unknown cache {kind} '{name}', using {fallback or 'none'}")
+            return fallback
+        try:
+            self._codec(registry, kind, registry[name][0])
+            return name
+        except ImportError as e:
+            logger.warning(f"Cache {kind} '{name}' unavailable ({e}), using {fallback or 'none'}")
+            return fallback
+
+    def _codec(self, registry: Dict, kind: str, codec_id: int) -> Codec:
+        key = (kind, codec_id)
+        codec = self._codecs.get(key)
+        if codec is None:
+            for wire_id, factory in registry.values():
+                if wire_id == codec_id:
+                    codec = self._codecs[key] = factory()
+                    break
+            else:
+                raise ValueError(f"Unknown {kind} id {codec_id}")
+        return codec
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a value, compressing it if it is large enough."""
+        serializer_id = SERIALIZERS[self.serializer][0]
+        payload = self._codec(SERIALIZERS, "serializer", serializer_id)[0](value)
+
+        compression_id = NO_COMPRESSION
+        if self.compression and len(payload) >= self.threshold:
+            compression_id = COMPRESSORS[self.compression][0]
+            payload = self._codec(COMPRESSORS, "compression", compression_id)[0](payload)
+
+        return bytes((MAGIC, FORMAT_VERSION, serializer_id, compression_id)) + payload
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Deserialize a value written by ``dumps`` or legacy JSON."""
+        if isinstance(data, str) or not data or data[0] != MAGIC:
+            return json.loads(data)
+
+        version, serializer_id, compression_id = data[1], data[2], data[3]
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported cache format version {version}")
+
+        payload = data[HEADER_SIZE:]
+        if compression_id != NO_COMPRESSION:
+            payload = self._codec(COMPRESSORS, "compression", compression_id)[1](payload)
+        return self._codec(SERIALIZERS, "serializer", serializer_id)[1](payload)
+
+_serializer: Optional[StateSerializer] = None
+
+def get_serializer() -> StateSerializer:
+    """Get or create the serializer configured in settings."""
+    global _serializer
+
+    if _serializer is None:
+        _serializer = StateSerializer()
+        logger.info(
+            f"Cache serializer: {_serializer.serializer}, "
+            f"compression: {_serializer.compression or 'none'} (threshold {_serializer.threshold} bytes)"
+        )
+    return _serializer
@@ -0,0 +1,71 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from langchain_core.messages import BaseMessage
+import asyncio
+import hashlib
+import json
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different prompts match."""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+def prompt_key(model: str, prompt: str, messages: List[BaseMessage]) -> str:
+    """Hash a normalised prompt into a coalescing key.
+
+    ``prompt`` should identify the system prompt without per-call details
+    such as timestamps or user ids (see ``BaseAgent.prompt_scope``),
+    otherwise identical questions never share a key.
+    """
+    payload = json.dumps(
+        [model, normalize(prompt), [(msg.type, normalize(msg.content)) for msg in messages]],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller starts the call as a task; callers arriving while it
+    runs await the same task instead of starting their own. The task is
+    shielded, so a cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def do(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        on_coalesced: Optional[Callable[[], None]] = None
+    ) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        elif on_coalesced:
+            on_coalesced()
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+_single_flight: Optional[SingleFlight] = None
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group for LLM calls."""
+    global _single_flight
+
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -1,13 +1,58 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple, AsyncIterator
+from contextlib import asynccontextmanager
+from fastapi import status
+from redis.exceptions import WatchError
+from app.core.config import settings
+from app.core.exceptions import StateError
+from app.core.metrics import CACHE_LOOKUPS, STATE_WRITES, STATE_LOCK_WAIT
 from app.services.cache import get_cache
-import json
+import asyncio
+import time
+import weakref
 import logging
 
 logger = logging.getLogger(__name__)
 
+class StateConflictError(StateError):
+    """State changed since it was read (optimistic concurrency check failed)"""
+    def __init__(self, user_id: str, expected: int, actual: Optional[int] = None):
+        super().__init__(
+            message=f"State for user {user_id} changed concurrently",
+            code="STATE_CONFLICT",
+            status_code=status.HTTP_409_CONFLICT,
+            details={"expected_version": expected, "actual_version": actual}
+        )
+
+# user_id -> lock; entries vanish once no caller holds a reference
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
 class StateManager:
+    """Per-user conversation state stored incrementally in Redis.
+
+    State is split across four keys so a turn only writes what changed:
+    - ``state:{user_id}:messages``: list of messages, appended with RPUSH
+      and trimmed to ``STATE_MAX_MESSAGES``
+    - ``state:{user_id}:context``: hash of context fields
+    - ``state:{user_id}:meta``: hash of the remaining top-level fields
+      (next, dialog_state, requires_action, ...)
+    - ``state:{user_id}:version``: counter bumped by every write
+
+    State written as a single ``state:{user_id}`` blob by earlier versions
+    is still read and migrated on first access. Assembled state is kept in
+    the cache's in-process tier under ``state:{user_id}``, so a worker that
+    served the previous turn reads it without a round trip; every write
+    invalidates it across workers.
+
+    ``self.version`` holds the version last read or written by this
+    manager. Passing ``expected_version`` to ``apply_delta``/``update_state``
+    makes the write a compare-and-set (WATCH/MULTI) that raises
+    ``StateConflictError`` instead of silently overwriting a concurrent
+    turn. ``lock()`` additionally serialises turns within this process.
+    """
+
     def __init__(self, user_id: str):
         self.user_id = user_id
+        self.version: Optional[int] = None
         self._cache = None
 
     async def _get_cache(self):
@@ -16,36 +61,236 @@ class StateManager:
             self._cache = await get_cache()
         return self._cache
 
+    @staticmethod
+    def _key_for(user_id: str) -> str:
+        return f"state:{user_id}"
+
     def _get_key(self) -> str:
-        """Generate cache key for user state."""
-        return f"state:{self.user_id}"
+        """Generate cache key for user state (legacy single blob)."""
+        return self._key_for(self.user_id)
+
+    def _keys(self) -> Tuple[str, str, str]:
+        key = self._get_key()
+        return f"{key}:messages", f"{key}:context", f"{key}:meta"
+
+    def _version_key(self) -> str:
+        return f"{self._get_key()}:version"
+
+    @staticmethod
+    def _queue_read(pipe, user_id: str) -> None:
+        key = StateManager._key_for(user_id)
+        pipe.lrange(f"{key}:messages", 0, -1)
+        pipe.hgetall(f"{key}:context")
+        pipe.hgetall(f"{key}:meta")
+        pipe.get(key)
+        pipe.get(f"{key}:version")
+
+    @staticmethod
+    def _decode_hash(serializer, values: Dict) -> Dict[str, Any]:
+        return {
+            (field.decode() if isinstance(field, bytes) else field): serializer.loads(value)
+            for field, value in values.items()
+        }
+
+    @classmethod
+    def _parse(cls, serializer, results: List) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Turn one user's read results into (state, legacy_state, version)."""
+        messages, context, meta, legacy, version = results
+        version = int(version or 0)
+        if not (messages or context or meta):
+            return None, serializer.loads(legacy) if legacy else None, version
+
+        state = cls._decode_hash(serializer, meta)
+        state["messages"] = [serializer.loads(message) for message in messages]
+        state["context"] = cls._decode_hash(serializer, context)
+        return state, None, version
+
+    @classmethod
+    async def get_states(cls, user_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get the state of several users in one round trip."""
+        user_ids = list(user_ids)
+        try:
+            cache = await get_cache()
+            if not cache.redis or not settings.REDIS_ENABLED:
+                return {user_id: None for user_id in user_ids}
+
+            pipe = cache.redis.pipeline(transaction=False)
+            for user_id in user_ids:
+                cls._queue_read(pipe, user_id)
+            results = await pipe.execute()
+
+            states = {}
+            for index, user_id in enumerate(user_ids):
+                state, legacy, _ = cls._parse(cache.serializer, results[index * 5:index * 5 + 5])
+                states[user_id] = state or legacy
+            return states
+        except Exception as e:
+            logger.error(f"Error getting states for {len(user_ids)} users: {e}")
+            return {user_id: None for user_id in user_ids}
 
     async def get_state(self) -> Optional[Dict[str, Any]]:
         """Get current state for user."""
         try:
             cache = await self._get_cache()
-            state = await cache.get(self._get_key())
+            if not cache.redis or not settings.REDIS_ENABLED:
+                return None
+
+            cached = cache.get_local(self._get_key())
+            if cached is not None:
+                self.version = cached["version"]
+                return cached["state"]
+
+            epoch = cache.local_epoch
+            pipe = cache.redis.pipeline(transaction=False)
+            self._queue_read(pipe, self.user_id)
+            state, legacy, self.version = self._parse(cache.serializer, await pipe.execute())
+            CACHE_LOOKUPS.labels(tier="redis", result="hit" if state or legacy else "miss").inc()
+
+            if legacy is not None:
+                logger.info(f"Migrating legacy state for user {self.user_id}")
+                await self.update_state(legacy)
+                return legacy
+            if state is not None:
+                cache.set_local(self._get_key(), {"version": self.version, "state": state}, epoch)
             return state
         except Exception as e:
             logger.error(f"Error getting state for user {self.user_id}: {e}")
             return None
 
-    async def update_state(self, state: Dict[str, Any]) -> bool:
-        """Update state for user."""
+    def _queue_delta(
+        self,
+        pipe,
+        serializer,
+        messages: Optional[List[Any]],
+        context: Optional[Dict[str, Any]],
+        fields: Dict[str, Any]
+    ) -> None:
+        messages_key, context_key, meta_key = self._keys()
+
+        if messages:
+            pipe.rpush(messages_key, *[serializer.dumps(message) for message in messages])
+            pipe.ltrim(messages_key, -settings.STATE_MAX_MESSAGES, -1)
+
+        if context:
+            changed = {key: serializer.dumps(value) for key, value in context.items() if value is not None}
+            removed = [key for key, value in context.items() if value is None]
+            if changed:
+                pipe.hset(context_key, mapping=changed)
+            if removed:
+                pipe.hdel(context_key, *removed)
+
+        if fields:
+            pipe.hset(meta_key, mapping={key: serializer.dumps(value) for key, value in fields.items()})
+
+    async def _write(
+        self,
+        expected_version: Optional[int],
+        messages: Optional[List[Any]],
+        context: Optional[Dict[str, Any]],
+        fields: Dict[str, Any],
+        replace: bool = False
+    ) -> bool:
+        """Queue and commit a write, optionally as a compare-and-set."""
+        cache = await self._get_cache()
+        if not cache.redis or not settings.REDIS_ENABLED:
+            return False
+
+        version_key = self._version_key()
+        async with cache.redis.pipeline(transaction=True) as pipe:
+            if expected_version is not None:
+                await pipe.watch(version_key)
+                current = int(await pipe.get(version_key) or 0)
+                if current != expected_version:
+                    raise StateConflictError(self.user_id, expected_version, current)
+                pipe.multi()
+
+            if replace:
+                pipe.delete(self._get_key(), *self._keys())
+            self._queue_delta(pipe, cache.serializer, messages, context, fields)
+            version_index = len(pipe.command_stack)
+            pipe.incr(version_key)
+            for key in (*self._keys(), version_key):
+                pipe.expire(key, cache.ttl)
+            cache.queue_invalidation(pipe, [self._get_key()])
+
+            try:
+                results = await pipe.execute()
+            except WatchError:
+                # Another writer committed between our check and EXEC
+                raise StateConflictError(self.user_id, expected_version)
+
+        self.version = int(results[version_index])
+        STATE_WRITES.labels(result="ok").inc()
+        return True
+
+    async def apply_delta(
+        self,
+        messages: Optional[List[Any]] = None,
+        context: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        **fields: Any
+    ) -> bool:
+        """Apply one turn's changes without rewriting the whole state.
+
+        ``messages`` are appended to the log, ``context`` keys are merged
+        (a value of None removes the key) and any other keyword argument
+        replaces that top-level field. Cost is proportional to the delta,
+        not the conversation length. With ``expected_version`` the write
+        only succeeds if nobody else wrote since that version.
+        """
+        fields.pop("messages", None)
+        fields.pop("context", None)
         try:
-            cache = await self._get_cache()
-            success = await cache.set(self._get_key(), state)
-            return success
+            return await self._write(expected_version, messages, context, fields)
+        except StateConflictError:
+            STATE_WRITES.labels(result="conflict").inc()
+            logger.warning(f"State conflict for user {self.user_id} (expected version {expected_version})")
+            raise
+        except Exception as e:
+            logger.error(f"Error applying state delta for user {self.user_id}: {e}")
+            return False
+
+    async def update_state(self, state: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
+        """Replace the state for user.
+
+        Prefer ``apply_delta`` for per-turn updates; this rewrites every
+        message.
+        """
+        fields = {key: value for key, value in state.items() if key not in ("messages", "context")}
+        try:
+            return await self._write(
+                expected_version, state.get("messages"), state.get("context"), fields, replace=True
+            )
+        except StateConflictError:
+            STATE_WRITES.labels(result="conflict").inc()
+            logger.warning(f"State conflict for user {self.user_id} (expected version {expected_version})")
+            raise
         except Exception as e:
             logger.error(f"Error updating state for user {self.user_id}: {e}")
             return False
 
+    @asynccontextmanager
+    async def lock(self) -> AsyncIterator[None]:
+        """Serialise turns for this user within the current process.
+
+        Cheaper than retrying on conflict when requests for one user land
+        on the same worker; use ``expected_version`` for cross-worker safety.
+        """
+        lock = _locks.get(self.user_id)
+        if lock is None:
+            lock = _locks[self.user_id] = asyncio.Lock()
+
+        start = time.perf_counter()
+        async with lock:
+            STATE_LOCK_WAIT.observe(time.perf_counter() - start)
+            yield
+
     async def clear_state(self) -> bool:
         """Clear state for user."""
         try:
             cache = await self._get_cache()
-            success = await cache.delete(self._get_key())
+            success = await cache.delete_many([self._get_key(), *self._keys(), self._version_key()])
             return success
         except Exception as e:
             logger.error(f"Error clearing state for user {self.user_id}: {e}")
-            return False 
\ No newline at end of file
+            return False
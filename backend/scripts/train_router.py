@@ -0,0 +1,68 @@
+"""Train the local routing classifier from logged routing decisions.
+
+Run from the backend directory:
+
+    python -m scripts.train_router logs/routing_decisions.jsonl -o models/router.json
+
+Decisions made by the LLM router are the training labels. A held-out
+slice reports accuracy and how many messages would have been routed
+locally at the configured confidence threshold.
+"""
+from typing import List, Tuple
+import argparse
+import os
+import random
+import sys
+
+from app.core.config import settings
+from app.services.agents.routing_model import RoutingClassifier, read_decisions
+
+def evaluate(model: RoutingClassifier, examples: List[Tuple[str, str]], threshold: float) -> Tuple[float, float]:
+    """Return (coverage, accuracy on covered examples) at a threshold."""
+    covered = correct = 0
+    for text, label in examples:
+        predicted, confidence = model.predict(text)
+        if confidence >= threshold:
+            covered += 1
+            correct += predicted == label
+    if not covered:
+        return 0.0, 0.0
+    return covered / len(examples), correct / covered
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="Routing decision log files (JSONL)")
+    parser.add_argument("-o", "--output", default=settings.ROUTER_MODEL_PATH, help="Where to write the model")
+    parser.add_argument("--threshold", type=float, default=settings.ROUTER_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of examples held out for evaluation")
+    parser.add_argument("--alpha", type=float, default=1.0, help="Additive smoothing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    examples = [example for path in args.logs for example in read_decisions(path)]
+    if not examples:
+        print("No LLM routing decisions found", file=sys.stderr)
+        return 1
+
+    random.Random(args.seed).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+    train, test = examples[:split], examples[split:]
+
+    if test:
+        model = RoutingClassifier.train(train, alpha=args.alpha)
+        coverage, accuracy = evaluate(model, test, args.threshold)
+        print(
+            f"Held out {len(test)} of {len(examples)} examples: "
+            f"{coverage:.1%} routed locally at threshold {args.threshold} "
+            f"with {accuracy:.1%} agreement with the LLM"
+        )
+
+    # The shipped model uses every example
+    model = RoutingClassifier.train(examples, alpha=args.alpha)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    model.save(args.output)
+    print(f"Wrote {args.output} ({len(model.weights)} features, labels: {', '.join(model.labels)})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import pytest
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List, Optional
+from app.services.database.mongodb import MongoDB
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROUND_TRIP_SECONDS = 0.005
+
+class FakeCollection:
+    """Collection stub with a simulated network round trip."""
+
+    def __init__(self, bookings: Dict[str, Dict]):
+        self.bookings = bookings
+
+    async def find_one(self, query: Dict) -> Optional[Dict]:
+        await asyncio.sleep(ROUND_TRIP_SECONDS * random.uniform(0.8, 1.2))
+        booking = self.bookings.get(query["booking_reference"])
+        return dict(booking) if booking else None
+
+@pytest.fixture
+def booking_db() -> MongoDB:
+    db = MongoDB()
+    db.db = {
+        "flight_bookings": FakeCollection({"FL-1": {"booking_reference": "FL-1"}}),
+        "hotel_bookings": FakeCollection({}),
+        "car_rentals": FakeCollection({}),
+        "excursions": FakeCollection({"EX-1": {"booking_reference": "EX-1"}})
+    }
+    return db
+
+async def sequential_lookup(db: MongoDB, booking_reference: str) -> Optional[Dict]:
+    """Previous implementation: one collection after another."""
+    for collection in ["flight_bookings", "hotel_bookings", "car_rentals", "excursions"]:
+        booking = await db.db[collection].find_one({"booking_reference": booking_reference})
+        if booking:
+            return booking
+    return None
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    quantiles = statistics.quantiles(samples, n=100)
+    return {"p50_ms": quantiles[49] * 1000, "p99_ms": quantiles[98] * 1000}
+
+async def measure(lookup, db: MongoDB, references: List[str]) -> Dict[str, float]:
+    samples = []
+    for reference in references:
+        start = time.perf_counter()
+        await lookup(db, reference)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+class TestBookingLookupPerformance:
+    @pytest.mark.asyncio
+    async def test_lookup_results_unchanged(self, booking_db):
+        booking = await booking_db.get_booking_by_reference("EX-1")
+        assert booking["booking_type"] == "excursions"
+        assert await booking_db.get_booking_by_reference("MISSING") is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookup_latency(self, booking_db):
+        # Mix of misses and hits in the last collection: the worst case
+        references = ["MISSING", "EX-1"] * 50
+
+        before = await measure(sequential_lookup, booking_db, references)
+        after = await measure(MongoDB.get_booking_by_reference, booking_db, references)
+
+        logger.info(f"Booking lookup before: {before}, after: {after}")
+
+        # Four sequential round trips collapse into roughly one
+        assert after["p50_ms"] < before["p50_ms"] / 2
+        assert after["p99_ms"] < before["p99_ms"]
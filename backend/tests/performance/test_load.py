@@ -26,11 +26,11 @@ class TestLoadPerformance:
         """Test system performance under concurrent load."""
         start_time = time.time()
         response_times = []
+        graph = get_chat_graph()
         
         async def process_request(request: Dict[str, Any]) -> float:
             req_start = time.time()
             state_manager = StateManager(request["user_id"])
-            graph = get_chat_graph()
             
             try:
                 await state_manager.update_state(request)
@@ -0,0 +1,102 @@
+import pytest
+import re
+import time
+from typing import Dict, List, Optional
+from app.services.agents.patterns import PRODUCT_ESCALATION, EXCURSION_PREFERENCES
+import logging
+
+logger = logging.getLogger(__name__)
+
+ITERATIONS = 50
+
+PRODUCT_TECHNICAL = [
+    r"(technical|support|install|bug|error|issue)",
+    r"(not working|doesn't work|failed|crash)",
+    r"(setup|configure|integration)",
+    r"(troubleshoot|debug|fix)"
+]
+PRODUCT_SERVICE = [
+    r"(billing|payment|account|subscription)",
+    r"(refund|cancel|return)",
+    r"(policy|terms|conditions)",
+    r"(customer service|support team)"
+]
+EXCURSION_LOCATION = [
+    r"in\s+([a-zA-Z\s]+)",
+    r"at\s+([a-zA-Z\s]+)",
+    r"near\s+([a-zA-Z\s]+)",
+    r"around\s+([a-zA-Z\s]+)"
+]
+EXCURSION_DURATION = [
+    r"(\d+)\s*(day|hour|week)s?",
+    r"half[- ]day",
+    r"full[- ]day"
+]
+
+CORPUS = [
+    "The Pro model ships with a 2-year warranty and comes in three colours.",
+    "It sounds like the install failed; our technical team can help you troubleshoot.",
+    "For refunds on your subscription please contact customer service.",
+    "The premium plan includes unlimited storage, priority sync and offline mode.",
+    "Looking for a half day food tour around Lisbon with a small group.",
+    "We'd like 3 days of hiking near the lakes, ideally with a guide.",
+    "Compared to the Lite edition, the Pro adds a faster processor and more memory. " * 4
+] * 20
+
+def per_pattern_scan(text: str) -> Dict[str, Optional[str]]:
+    """The previous approach: one re.search per pattern, every call."""
+    text = text.lower()
+    escalation = None
+    if any(re.search(pattern, text) for pattern in PRODUCT_TECHNICAL):
+        escalation = "TECHNICAL"
+    elif any(re.search(pattern, text) for pattern in PRODUCT_SERVICE):
+        escalation = "CUSTOMER_SERVICE"
+
+    location = None
+    for pattern in EXCURSION_LOCATION:
+        match = re.search(pattern, text)
+        if match:
+            location = match.group(1).strip()
+            break
+
+    duration = None
+    for pattern in EXCURSION_DURATION:
+        match = re.search(pattern, text)
+        if match:
+            duration = match.group(0)
+            break
+    return {"escalation": escalation, "location": location, "duration": duration}
+
+def registry_scan(text: str) -> Dict[str, Optional[str]]:
+    text = text.lower()
+    escalation = PRODUCT_ESCALATION.first(text)
+    found = EXCURSION_PREFERENCES.scan(text)
+    return {
+        "escalation": escalation,
+        "location": found["location"].groups[0].strip() if "location" in found else None,
+        "duration": found["duration"].text if "duration" in found else None
+    }
+
+def measure(scan, corpus: List[str]) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for text in corpus:
+            scan(text)
+    return (time.perf_counter() - start) / (ITERATIONS * len(corpus))
+
+class TestPatternPerformance:
+    def test_registry_matches_per_pattern_results(self):
+        for text in CORPUS:
+            assert registry_scan(text) == per_pattern_scan(text)
+
+    def test_registry_scan_speed(self):
+        # Warm re's internal cache so the baseline is not penalised by compilation
+        per_pattern_scan(CORPUS[0])
+
+        baseline = measure(per_pattern_scan, CORPUS)
+        registry = measure(registry_scan, CORPUS)
+        # Wall-clock timings are too noisy to assert on; report them instead
+        logger.info(
+            f"Per-pattern scan: {baseline * 1e6:.1f}us/message, "
+            f"registry scan: {registry * 1e6:.1f}us/message"
+        )
@@ -0,0 +1,64 @@
+import pytest
+import json
+import time
+from typing import Any, Dict, List
+from app.services.serialization import StateSerializer
+import logging
+
+logger = logging.getLogger(__name__)
+
+ITERATIONS = 200
+
+def realistic_state(turns: int) -> Dict[str, Any]:
+    """Conversation state shaped like what StateManager stores per user."""
+    messages: List[List[str]] = []
+    for turn in range(turns):
+        messages.append(["user", f"Turn {turn}: I'd like to change my hotel booking in Barcelona to "
+                                 f"check in on the {turn % 28 + 1}th and add breakfast for two adults."])
+        messages.append(["assistant", "Certainly. I found three hotels near La Rambla with availability on "
+                                      "those dates. The Hotel Arts has a sea view room at 240 EUR per night "
+                                      "including breakfast; would you like me to reserve it?"])
+    return {
+        "messages": messages,
+        "next": "HOTEL",
+        "requires_action": False,
+        "context": {"user_id": "user_42", "conversation_id": "c-1", "currency": "EUR", "guests": 2},
+        "dialog_state": ["ASSISTANT", "HOTEL"] * (turns // 2)
+    }
+
+def measure(codec: StateSerializer, state: Dict[str, Any]) -> Dict[str, float]:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        data = codec.dumps(state)
+    encode = (time.perf_counter() - start) / ITERATIONS
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        codec.loads(data)
+    decode = (time.perf_counter() - start) / ITERATIONS
+
+    return {"bytes": len(data), "encode_us": encode * 1e6, "decode_us": decode * 1e6}
+
+class TestSerializationPerformance:
+    @pytest.mark.parametrize("turns", [5, 50])
+    def test_payload_size_and_speed(self, turns):
+        state = realistic_state(turns)
+        baseline_bytes = len(json.dumps(state).encode())
+
+        results = {
+            f"{serializer}+{compression}": measure(
+                StateSerializer(serializer=serializer, compression=compression, threshold=1024),
+                state
+            )
+            for serializer in ["json", "orjson", "msgpack"]
+            for compression in ["none", "zstd", "lz4"]
+        }
+
+        logger.info(f"Serialization benchmark ({turns} turns), legacy json.dumps: {baseline_bytes} bytes")
+        for name, result in results.items():
+            logger.info(f"{name:>16}: {result['bytes']:>7} bytes  "
+                        f"encode {result['encode_us']:8.1f}us  decode {result['decode_us']:8.1f}us")
+
+        # Compression pays off once a conversation has some history
+        if turns >= 50:
+            assert results["msgpack+zstd"]["bytes"] < baseline_bytes / 4
@@ -0,0 +1,61 @@
+import pytest
+from app.services.agents.intents import (
+    IntentMatcher,
+    ROUTING_INTENTS,
+    FLIGHT_BOOKING_INTENTS,
+    SENSITIVE_REQUEST_TYPES,
+    EXCURSION_INTERESTS
+)
+from app.services.agents.assistant import AssistantAgent
+
+class TestIntentMatcher:
+    def test_all_intents_in_one_pass(self):
+        matched = FLIGHT_BOOKING_INTENTS.match("Can I change or cancel the flight? What time does it leave?")
+        assert matched == ["modification", "cancellation", "information"]
+
+    def test_priority_order(self):
+        assert ROUTING_INTENTS.first("Hotel near the airport") == "FLIGHT"
+        assert ROUTING_INTENTS.first("A hotel with a rental car") == "HOTEL"
+
+    @pytest.mark.parametrize("message, expected", [
+        ("Pay with my credit card", "SENSITIVE"),
+        ("Any tours in Rome?", "EXCURSION"),
+        ("I am booking flights", "FLIGHT"),
+        ("Reserving a car", "CAR_RENTAL"),
+        ("Hello there", None)
+    ])
+    def test_routing(self, message, expected):
+        assert ROUTING_INTENTS.first(message) == expected
+
+    def test_word_boundaries(self):
+        # Substring scans used to match "art" in "start" and "car" in "card"
+        assert EXCURSION_INTERESTS.match("Let's start the party") == []
+        assert ROUTING_INTENTS.first("Scary cards") is None
+
+    def test_inflections_and_spacing(self):
+        matcher = IntentMatcher({"booking": ["reserve", "new flight"]})
+        assert matcher.first("RESERVED") == "booking"
+        assert matcher.first("reserving") == "booking"
+        assert matcher.first("a new   flight") == "booking"
+
+    @pytest.mark.parametrize("message, matcher, expected", [
+        ("I cancelled my flight", FLIGHT_BOOKING_INTENTS, "cancellation"),
+        ("Cancelling tomorrow's trip", FLIGHT_BOOKING_INTENTS, "cancellation"),
+        ("travelling to Rome", ROUTING_INTENTS, "FLIGHT"),
+        ("Is it safe for a solo traveller?", ROUTING_INTENTS, "FLIGHT"),
+        ("Things a tourist should see", ROUTING_INTENTS, "EXCURSION"),
+        ("Tips for visitors", ROUTING_INTENTS, "EXCURSION"),
+        ("Which activity suits kids?", ROUTING_INTENTS, "EXCURSION")
+    ])
+    def test_doubled_consonants_and_derived_forms(self, message, matcher, expected):
+        # All of these matched under the old substring scan
+        assert matcher.first(message) == expected
+
+    def test_sensitive_request_types(self):
+        assert SENSITIVE_REQUEST_TYPES.first("Update my billing details") == "PAYMENT"
+        assert SENSITIVE_REQUEST_TYPES.first("Reset my password") == "ACCOUNT_SECURITY"
+
+    def test_assistant_routing_uses_matcher(self):
+        agent = AssistantAgent(llm=object())
+        assert agent.determine_next_agent("I need a hotel room") == "HOTEL"
+        assert agent.determine_next_agent("Thanks!") == "NONE"
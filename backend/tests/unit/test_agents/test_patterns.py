@@ -0,0 +1,53 @@
+import pytest
+from app.services.agents.patterns import (
+    PatternSet,
+    PATTERN_REGISTRY,
+    PRODUCT_ESCALATION,
+    TECHNICAL_ESCALATION,
+    HOTEL_PREFERENCES,
+    EXCURSION_PREFERENCES
+)
+
+class TestPatternSet:
+    def test_sets_compiled_once(self):
+        assert PATTERN_REGISTRY["product.escalation"] is PRODUCT_ESCALATION
+        assert PATTERN_REGISTRY["excursion.preferences"] is EXCURSION_PREFERENCES
+
+    def test_groups_of_matching_pattern(self):
+        patterns = PatternSet({"a": [r"x(\d)", r"w(\d)"], "b": [r"(y)(z)"]})
+        found = patterns.scan("yz then w7")
+        assert found["a"].groups == ("7",)
+        assert found["b"].groups == ("y", "z")
+        assert found["b"].start == 0
+
+    def test_first_uses_set_priority(self):
+        patterns = PatternSet({"high": [r"beta"], "low": [r"alpha"]})
+        assert patterns.first("alpha then beta") == "high"
+        assert patterns.first("alpha only") == "low"
+        assert patterns.first("nothing") is None
+
+    def test_leftmost_match_per_set(self):
+        found = HOTEL_PREFERENCES.scan("a hotel near the beach")
+        assert found["location"].groups[0] == "the beach"
+
+    def test_matches_do_not_consume_text(self):
+        # The greedy location capture runs over the duration
+        found = EXCURSION_PREFERENCES.scan("tours around lisbon for a full day")
+        assert found["location"].groups[0].strip() == "lisbon for a full day"
+        assert found["duration"].text == "full day"
+
+    def test_word_boundaries(self):
+        assert HOTEL_PREFERENCES.scan("find a room") == {}
+
+    @pytest.mark.parametrize("text, expected", [
+        ("the install failed with an error", {"TECHNICAL"}),
+        ("your refund will arrive in five days", {"CUSTOMER_SERVICE"}),
+        ("contact the support team about billing", {"TECHNICAL", "CUSTOMER_SERVICE"}),
+        ("this laptop has 16gb of memory", set())
+    ])
+    def test_product_escalation(self, text, expected):
+        assert set(PRODUCT_ESCALATION.scan(text)) == expected
+
+    def test_technical_escalation(self):
+        found = TECHNICAL_ESCALATION.scan("i don't have product information about the billing issue")
+        assert set(found) == {"PRODUCT", "CUSTOMER_SERVICE"}
@@ -0,0 +1,118 @@
+import pytest
+import json
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.agents.router import RouterAgent
+from app.services.agents import routing_model
+from app.services.agents.routing_model import RoutingClassifier, read_decisions, redact, tokenize
+
+EXAMPLES = [
+    ("How much does the premium plan cost?", "PRODUCT"),
+    ("What is the price of the pro model?", "PRODUCT"),
+    ("Is the laptop available in silver?", "PRODUCT"),
+    ("Which products support bluetooth?", "PRODUCT"),
+    ("The app crashes when I log in", "TECHNICAL"),
+    ("I get an error installing the driver", "TECHNICAL"),
+    ("My device won't connect to wifi", "TECHNICAL"),
+    ("The sync keeps failing with a timeout error", "TECHNICAL"),
+    ("I was charged twice on my bill", "CUSTOMER_SERVICE"),
+    ("How do I update my billing address?", "CUSTOMER_SERVICE"),
+    ("I want to close my account", "CUSTOMER_SERVICE"),
+    ("Can I get a refund for my order?", "CUSTOMER_SERVICE"),
+    ("I want to speak to a real person", "HUMAN"),
+    ("Let me talk to a manager please", "HUMAN")
+]
+
+@pytest.fixture
+def classifier():
+    return RoutingClassifier.train(EXAMPLES)
+
+class TestRoutingClassifier:
+    def test_tokenize_adds_bigrams(self):
+        assert tokenize("Reset my Password") == ["reset", "my", "password", "reset my", "my password"]
+
+    @pytest.mark.parametrize("text, expected", [
+        ("What does the pro model cost?", "PRODUCT"),
+        ("I keep getting an error when the app crashes", "TECHNICAL"),
+        ("Please refund the double charge on my bill", "CUSTOMER_SERVICE"),
+        ("Can I talk to a real person?", "HUMAN")
+    ])
+    def test_predict(self, classifier, text, expected):
+        label, confidence = classifier.predict(text)
+        assert label == expected
+        assert 0.25 < confidence <= 1.0
+
+    def test_unknown_vocabulary(self, classifier):
+        assert classifier.predict("zzz qqq") == (None, 0.0)
+
+    def test_save_and_load(self, classifier, tmp_path):
+        path = tmp_path / "router.json"
+        classifier.save(str(path))
+        loaded = RoutingClassifier.load(str(path))
+        text = "The app crashes on startup"
+        assert loaded.predict(text) == classifier.predict(text)
+
+    def test_train_without_examples(self):
+        with pytest.raises(ValueError):
+            RoutingClassifier.train([])
+
+    def test_read_decisions_uses_llm_labels(self, tmp_path):
+        path = tmp_path / "decisions.jsonl"
+        path.write_text("\n".join([
+            json.dumps({"text": "refund please", "label": "CUSTOMER_SERVICE", "source": "llm"}),
+            json.dumps({"text": "refund again", "label": "CUSTOMER_SERVICE", "source": "local"}),
+            "not json"
+        ]))
+        assert list(read_decisions(str(path))) == [("refund please", "CUSTOMER_SERVICE")]
+
+class TestDecisionLog:
+    @pytest.fixture
+    def log_path(self, tmp_path):
+        path = tmp_path / "decisions.jsonl"
+        routing_model.configure_decision_log(str(path))
+        yield path
+        routing_model.close_decision_log()
+
+    def test_redacts_identifiers(self):
+        assert redact("Mail jo@example.com or call +1 (555) 010-2345") == "Mail <email> or call <number>"
+        assert redact("Card 4111 1111 1111 1111 was declined") == "Card <number> was declined"
+        assert redact("Room for 2 on May 3") == "Room for 2 on May 3"
+
+    def test_records_redacted_text(self, log_path):
+        routing_model.record_decision("Refund order 12345678 to jo@example.com", "CUSTOMER_SERVICE", "llm")
+
+        decision = json.loads(log_path.read_text())
+        assert decision["text"] == "Refund order <number> to <email>"
+        assert decision["label"] == "CUSTOMER_SERVICE"
+
+    def test_nothing_written_until_configured(self):
+        with patch.object(routing_model.decision_logger, "info") as info:
+            routing_model.record_decision("The app crashes", "TECHNICAL", "local")
+        info.assert_not_called()
+
+class TestLocalRouting:
+    @pytest.mark.asyncio
+    async def test_confident_prediction_skips_llm(self, classifier):
+        agent = RouterAgent(llm=Mock(), classifier=classifier, confidence_threshold=0.5)
+        with patch.object(agent, "_safe_llm_call", AsyncMock()) as llm_call:
+            result = await agent.process({
+                "messages": [("user", "The app crashes with an error")],
+                "context": {"user_id": "test_123"}
+            })
+
+        llm_call.assert_not_called()
+        assert result["next"] == "TECHNICAL"
+        assert result["context"]["routing_reason"].startswith("local classifier")
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_back_to_llm(self, classifier):
+        agent = RouterAgent(llm=Mock(), classifier=classifier, confidence_threshold=1.1)
+        with patch.object(agent, "_safe_llm_call", AsyncMock(return_value="PRODUCT")) as llm_call, \
+                patch("app.services.agents.router.record_decision") as record:
+            result = await agent.process({
+                "messages": [("user", "The app crashes with an error")],
+                "context": {"user_id": "test_123"}
+            })
+
+        llm_call.assert_awaited_once()
+        record.assert_called_once_with("The app crashes with an error", "PRODUCT", "llm")
+        assert result["next"] == "PRODUCT"
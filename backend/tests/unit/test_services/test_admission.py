@@ -0,0 +1,121 @@
+import pytest
+import asyncio
+from app.core.exceptions import AdmissionTimeoutError
+from app.services.admission import (
+    AdmissionController,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW
+)
+
+def controller(**kwargs):
+    options = dict(
+        max_concurrency=1,
+        model_concurrency=1,
+        model_overrides={},
+        tokens_per_minute=0,
+        queue_timeout=1.0
+    )
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+async def hold(admission, model, order, name, priority=PRIORITY_NORMAL, tokens=1, release=None):
+    async with admission.acquire(model, tokens, priority):
+        order.append(name)
+        if release is not None:
+            await release.wait()
+
+class TestAdmissionController:
+    @pytest.mark.asyncio
+    async def test_global_cap(self):
+        admission = controller(max_concurrency=2, model_concurrency=10)
+        release = asyncio.Event()
+        order = []
+
+        tasks = [asyncio.create_task(hold(admission, "m", order, i, release=release)) for i in range(4)]
+        await asyncio.sleep(0.01)
+        assert admission.stats()["active"] == 2
+        assert admission.stats()["queued"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert sorted(order) == [0, 1, 2, 3]
+        assert admission.stats()["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        admission = controller()
+        release = asyncio.Event()
+        order = []
+
+        blocker = asyncio.create_task(hold(admission, "m", order, "blocker", release=release))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(hold(admission, "m", order, "low", PRIORITY_LOW)),
+            asyncio.create_task(hold(admission, "m", order, "normal", PRIORITY_NORMAL)),
+            asyncio.create_task(hold(admission, "m", order, "high", PRIORITY_HIGH))
+        ]
+        await asyncio.sleep(0.01)
+
+        release.set()
+        await asyncio.gather(blocker, *waiting)
+        assert order == ["blocker", "high", "normal", "low"]
+
+    @pytest.mark.asyncio
+    async def test_model_cap_does_not_block_other_models(self):
+        admission = controller(max_concurrency=5, model_concurrency=1)
+        release = asyncio.Event()
+        order = []
+
+        first = asyncio.create_task(hold(admission, "gpt-4", order, "gpt-4 #1", release=release))
+        second = asyncio.create_task(hold(admission, "gpt-4", order, "gpt-4 #2"))
+        other = asyncio.create_task(hold(admission, "gpt-3.5", order, "gpt-3.5"))
+        await asyncio.sleep(0.01)
+
+        assert order == ["gpt-4 #1", "gpt-3.5"]
+        release.set()
+        await asyncio.gather(first, second, other)
+        assert order[-1] == "gpt-4 #2"
+
+    @pytest.mark.asyncio
+    async def test_model_override(self):
+        admission = controller(max_concurrency=5, model_concurrency=1, model_overrides={"big": 3})
+        assert admission.model_limit("big") == 3
+        assert admission.model_limit("other") == 1
+
+    @pytest.mark.asyncio
+    async def test_token_budget_delays_calls(self):
+        admission = controller(max_concurrency=5, model_concurrency=5, tokens_per_minute=100)
+        admission.WINDOW = 0.05
+        order = []
+
+        await hold(admission, "m", order, "first", tokens=80)
+        second = asyncio.create_task(hold(admission, "m", order, "second", tokens=80))
+        await asyncio.sleep(0.01)
+        assert order == ["first"]
+
+        await asyncio.wait_for(second, 1.0)
+        assert order == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_recorded_usage_replaces_estimate(self):
+        admission = controller(max_concurrency=5, model_concurrency=5, tokens_per_minute=100)
+        async with admission.acquire("m", 10) as ticket:
+            ticket.record_usage(60)
+        assert admission.stats()["tokens_in_window"] == 60
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        admission = controller(queue_timeout=0.01)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(hold(admission, "m", [], "blocker", release=release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionTimeoutError):
+            async with admission.acquire("m", 1):
+                pass
+
+        assert admission.stats()["queued"] == 0
+        release.set()
+        await blocker
+        assert admission.stats()["active"] == 0
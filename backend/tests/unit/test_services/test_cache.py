@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from app.services.cache import RedisCache
 import json
 
@@ -70,4 +70,46 @@ class TestRedisCache:
         redis_cache.client.get.side_effect = Exception("Test error")
         
         result = await redis_cache.get("test_key")
-        assert result is None 
\ No newline at end of file
+        assert result is None 
+
+@pytest.fixture
+def batch_cache():
+    mock_redis = Mock()
+    mock_redis.mget = AsyncMock()
+    mock_redis.delete = AsyncMock()
+    pipe = Mock()
+    pipe.execute = AsyncMock()
+    mock_redis.pipeline.return_value = pipe
+    with patch('app.services.cache.settings.REDIS_ENABLED', True):
+        yield RedisCache(mock_redis)
+
+class TestRedisCacheBatch:
+    @pytest.mark.asyncio
+    async def test_mget_single_round_trip(self, batch_cache):
+        batch_cache.redis.mget.return_value = [json.dumps({"a": 1}), None]
+
+        assert await batch_cache.mget(["k1", "k2"]) == [{"a": 1}, None]
+        batch_cache.redis.mget.assert_awaited_once_with(["k1", "k2"])
+
+    @pytest.mark.asyncio
+    async def test_get_many_omits_missing(self, batch_cache):
+        batch_cache.redis.mget.return_value = [None, json.dumps("v")]
+
+        assert await batch_cache.get_many(["k1", "k2"]) == {"k2": "v"}
+
+    @pytest.mark.asyncio
+    async def test_mset_pipelines_with_ttl(self, batch_cache):
+        pipe = batch_cache.redis.pipeline.return_value
+        pipe.execute.return_value = [True, True]
+
+        assert await batch_cache.mset({"k1": 1, "k2": 2}, ttl=30) is True
+        batch_cache.redis.pipeline.assert_called_once_with(transaction=False)
+        pipe.set.assert_any_call("k1", batch_cache.serializer.dumps(1), ex=30)
+        pipe.set.assert_any_call("k2", batch_cache.serializer.dumps(2), ex=30)
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_mget_error_returns_misses(self, batch_cache):
+        batch_cache.redis.mget.side_effect = Exception("Test error")
+
+        assert await batch_cache.mget(["k1", "k2"]) == [None, None]
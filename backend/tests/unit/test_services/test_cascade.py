@@ -0,0 +1,114 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from langchain_core.messages import AIMessage, HumanMessage
+from app.core.metrics import LLM_CASCADE_ESCALATIONS, LLM_TIER_COST
+from app.services.agents.base import BaseAgent
+from app.services.agents.cascade import CascadePolicy, call_cost, cascade_models
+from app.services.agents.patterns import PatternSet
+
+def model(name, *answers):
+    llm = Mock(model_name=name, temperature=0.0)
+    llm.ainvoke = AsyncMock(side_effect=[
+        answer if isinstance(answer, Exception) else AIMessage(
+            content=answer,
+            usage_metadata={"input_tokens": 1000, "output_tokens": 1000, "total_tokens": 2000}
+        )
+        for answer in answers
+    ])
+    return llm
+
+@pytest.fixture(autouse=True)
+def no_response_cache():
+    with patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", False), \
+            patch("app.services.agents.base.settings.LLM_COALESCE_ENABLED", False):
+        yield
+
+async def ask(agent):
+    return await agent._safe_llm_call([HumanMessage(content="Which terminal does my flight leave from?")])
+
+class TestCascadePolicy:
+    @pytest.mark.parametrize("answer, reasons", [
+        ("Your flight leaves from Terminal 2.", []),
+        ("", ["empty"]),
+        ("T2", ["too_short"]),
+        ("I'm sorry, but I can't help with flight details.", ["refusal"]),
+        ("I'm not sure which terminal that is.", ["uncertain"])
+    ])
+    def test_verify(self, answer, reasons):
+        assert CascadePolicy(min_length=10).verify(answer) == reasons
+
+    def test_agent_patterns(self):
+        policy = CascadePolicy(patterns=PatternSet({"needs_human": [r"contact (?:an|a human) agent"]}))
+        assert policy.verify("Please contact an agent for this change.") == ["needs_human"]
+
+    def test_escalation_model_defaults(self):
+        with patch("app.services.agents.cascade.settings.LLM_CASCADE_MODEL", None), \
+                patch("app.services.agents.cascade.settings.OPENAI_MODEL", "big"):
+            assert CascadePolicy().escalation_models() == ["big"]
+        assert CascadePolicy(models=["a", "b"]).escalation_models() == ["a", "b"]
+
+    def test_tiers_skip_own_model_and_disabled(self):
+        small = Mock(model_name="small", temperature=0.0)
+        with patch("app.services.agents.cascade.get_llm") as get_llm:
+            assert cascade_models(small, CascadePolicy(models=["small", "big"])) == [small, get_llm.return_value]
+            get_llm.assert_called_once_with("big", 0.0)
+            assert cascade_models(small, CascadePolicy(models=["big"], enabled=False)) == [small]
+
+    def test_call_cost(self):
+        usage = {"input_tokens": 2000, "output_tokens": 1000}
+        with patch("app.services.agents.cascade.settings.LLM_MODEL_PRICES", {"m": [0.01, 0.03]}):
+            assert call_cost("m", usage) == pytest.approx(0.05)
+            assert call_cost("unpriced", usage) == 0.0
+
+class TestCascadeCalls:
+    @pytest.mark.asyncio
+    async def test_good_answer_stays_on_small_model(self):
+        small, big = model("small", "Your flight leaves from Terminal 2."), model("big")
+        agent = BaseAgent(llm=small, memory=Mock())
+
+        with patch("app.services.agents.cascade.get_llm", return_value=big):
+            assert await ask(agent) == "Your flight leaves from Terminal 2."
+        big.ainvoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rejected_answer_escalates(self):
+        small = model("small", "I'm not sure which terminal.")
+        big = model("big", "Your flight leaves from Terminal 2.")
+        agent = BaseAgent(llm=small, memory=Mock())
+        before = LLM_CASCADE_ESCALATIONS.labels(agent_type="BaseAgent", reason="uncertain")._value.get()
+
+        with patch("app.services.agents.cascade.get_llm", return_value=big), \
+                patch("app.services.agents.base.settings.LLM_MODEL_PRICES", {"big": [0.01, 0.03]}):
+            assert await ask(agent) == "Your flight leaves from Terminal 2."
+
+        assert LLM_CASCADE_ESCALATIONS.labels(agent_type="BaseAgent", reason="uncertain")._value.get() == before + 1
+
+    @pytest.mark.asyncio
+    async def test_failed_escalation_keeps_small_answer(self):
+        small = model("small", "I'm not sure which terminal.")
+        big = model("big", ValueError("bad request"))
+        agent = BaseAgent(llm=small, memory=Mock())
+
+        with patch("app.services.agents.cascade.get_llm", return_value=big):
+            assert await ask(agent) == "I'm not sure which terminal."
+
+    @pytest.mark.asyncio
+    async def test_small_model_failure_falls_through(self):
+        small = model("small", ValueError("bad request"))
+        big = model("big", "Your flight leaves from Terminal 2.")
+        agent = BaseAgent(llm=small, memory=Mock())
+
+        with patch("app.services.agents.cascade.get_llm", return_value=big):
+            assert await ask(agent) == "Your flight leaves from Terminal 2."
+
+    @pytest.mark.asyncio
+    async def test_tier_cost_recorded(self):
+        small = model("priced-small", "Your flight leaves from Terminal 2.")
+        agent = BaseAgent(llm=small, memory=Mock())
+        before = LLM_TIER_COST.labels(agent_type="BaseAgent", model="priced-small")._value.get()
+
+        with patch("app.services.agents.cascade.settings.LLM_MODEL_PRICES", {"priced-small": [0.001, 0.002]}):
+            await ask(agent)
+
+        spent = LLM_TIER_COST.labels(agent_type="BaseAgent", model="priced-small")._value.get() - before
+        assert spent == pytest.approx(0.003)
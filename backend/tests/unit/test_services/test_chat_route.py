@@ -0,0 +1,189 @@
+import pytest
+import json
+from unittest.mock import AsyncMock, Mock, patch
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, StateGraph
+from app.api.routes import chat as chat_route
+from app.api.routes.chat import ChatRequest
+from app.services.agents.base import BaseAgent
+from app.services.agents.cascade import CascadePolicy
+from app.services.graph import AgentState
+
+class FakeGraph:
+    """Compiled-graph stand-in that replays a fixed ASSISTANT -> HOTEL run."""
+
+    def __init__(self):
+        self.inputs = []
+
+    async def astream(self, state, stream_mode="updates"):
+        self.inputs.append(state)
+        assistant = state["messages"] + [("assistant", "Let me get our hotel specialist.")]
+        yield {"ASSISTANT": {"messages": assistant, "next": "HOTEL"}}
+        yield {"HOTEL": {
+            "messages": assistant + [("assistant", "Which city are you staying in?")],
+            "next": "END"
+        }}
+
+    async def astream_events(self, state, version="v2"):
+        for node in ("ASSISTANT", "HOTEL"):
+            meta = {"langgraph_node": node}
+            yield {"event": "on_chain_start", "name": node, "metadata": meta, "data": {}}
+            yield {"event": "on_chain_end", "name": node, "metadata": meta, "data": {}}
+        yield {"event": "on_chain_end", "name": "LangGraph", "parent_ids": [], "data": {
+            "output": {"messages": state["messages"] + [("assistant", "Which city?")], "next": "END"}
+        }}
+
+@pytest.fixture
+def graph():
+    fake = FakeGraph()
+    with patch.object(chat_route, "get_chat_graph", return_value=fake), \
+            patch.object(chat_route.rate_limiter, "check_rate_limit", AsyncMock(return_value=True)):
+        yield fake
+
+def make_request(*contents):
+    return ChatRequest(
+        messages=[{"role": "user", "content": content} for content in contents],
+        user_id="test_123"
+    )
+
+class TestChatRoute:
+    @pytest.mark.asyncio
+    async def test_runs_full_conversation_through_graph(self, graph):
+        response = await chat_route.chat(make_request("Hi", "I need a hotel"))
+        body = json.loads(response.body)
+
+        assert graph.inputs[0]["messages"] == [("user", "Hi"), ("user", "I need a hotel")]
+        assert graph.inputs[0]["context"]["user_id"] == "test_123"
+        assert body["messages"][-1] == {"role": "assistant", "content": "Which city are you staying in?"}
+        assert body["graph_state"]["current_node"] == "HOTEL"
+        assert body["graph_state"]["next_node"] == ""
+
+    @pytest.mark.asyncio
+    async def test_reports_node_timings(self, graph):
+        with patch.object(chat_route, "GRAPH_NODE_LATENCY") as latency:
+            response = await chat_route.chat(make_request("I need a hotel"))
+        timings = json.loads(response.body)["node_timings"]
+
+        assert [timing["node"] for timing in timings] == ["ASSISTANT", "HOTEL"]
+        assert all(timing["duration_ms"] >= 0 for timing in timings)
+        assert latency.labels.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_graph_structure_matches_chat_graph_state(self, graph):
+        structure = await chat_route.get_graph_structure()
+        response = await chat_route.chat(make_request("I need a hotel"))
+        graph_state = json.loads(response.body)["graph_state"]
+
+        assert structure.nodes == graph_state["nodes"]
+        assert [list(edge) for edge in structure.edges] == graph_state["edges"]
+        assert graph_state["current_node"] in structure.nodes
+
+    @pytest.mark.asyncio
+    async def test_empty_messages_rejected(self, graph):
+        response = await chat_route.chat(make_request())
+        assert response.status_code == 400
+        assert json.loads(response.body)["detail"]["code"] == "NO_MESSAGES"
+        assert graph.inputs == []
+
+    @pytest.mark.asyncio
+    async def test_stream_node_end_carries_duration(self, graph):
+        frames = [frame async for frame in chat_route._stream_graph_events({
+            "messages": [("user", "I need a hotel")], "context": {}, "dialog_state": []
+        })]
+        events = [(frame.split("\n")[0][len("event: "):], json.loads(frame.split("\n")[1][len("data: "):]))
+                  for frame in frames]
+
+        node_ends = [data for event, data in events if event == "node_end"]
+        assert [data["node"] for data in node_ends] == ["ASSISTANT", "HOTEL"]
+        assert all("duration_ms" in data for data in node_ends)
+        done = events[-1]
+        assert done[0] == "done"
+        assert done[1]["node_timings"] == node_ends
+        assert done[1]["graph_state"]["current_node"] == "HOTEL"
+
+    @pytest.mark.asyncio
+    async def test_records_hops_per_turn(self, graph):
+        with patch.object(chat_route, "GRAPH_HOPS") as hops:
+            await chat_route.chat(make_request("I need a hotel"))
+
+        hops.labels.assert_called_once_with(entry="assistant")
+        hops.labels.return_value.observe.assert_called_once_with(2)
+
+    @pytest.mark.asyncio
+    async def test_persists_turn_for_named_conversation(self, graph):
+        request = make_request("Hi", "I need a hotel")
+        request.context = {"conversation_id": "c1"}
+        with patch.object(chat_route.mongodb, "db", object()), \
+                patch.object(chat_route.mongodb, "add_message", AsyncMock()) as add_message:
+            await chat_route.chat(request)
+
+        assert [call.args for call in add_message.await_args_list] == [
+            ("c1", "user", "I need a hotel"),
+            ("c1", "assistant", "Let me get our hotel specialist."),
+            ("c1", "assistant", "Which city are you staying in?")
+        ]
+
+class TrackingChatModel(GenericFakeChatModel):
+    """Fake model that records whether it has finished streaming."""
+
+    finished: bool = False
+
+    def _stream(self, *args, **kwargs):
+        yield from super()._stream(*args, **kwargs)
+        self.finished = True
+
+def single_agent_graph(llm, policy=None):
+    class Agent(BaseAgent):
+        CASCADE_POLICY = policy
+
+        async def process(self, state):
+            answer = await self._safe_llm_call([HumanMessage(content=state["messages"][-1][1])])
+            return {"messages": state["messages"] + [("assistant", answer)]}
+
+    workflow = StateGraph(AgentState)
+    workflow.add_node("ASSISTANT", Agent(llm=llm, memory=Mock()).process)
+    workflow.set_entry_point("ASSISTANT")
+    workflow.add_edge("ASSISTANT", END)
+    return workflow.compile()
+
+def stream_frames(question):
+    return chat_route._stream_graph_events({
+        "messages": [("user", question)], "context": {}, "dialog_state": []
+    })
+
+def frame_data(frame):
+    return json.loads(frame.split("\n")[1][len("data: "):])
+
+class TestCascadeStreaming:
+    @pytest.mark.asyncio
+    async def test_only_accepted_tier_is_streamed(self):
+        small = GenericFakeChatModel(messages=iter([AIMessage(content="I'm not sure")]))
+        big = GenericFakeChatModel(messages=iter([AIMessage(content="Terminal 2 opens at six")]))
+        graph = single_agent_graph(small, CascadePolicy(models=["big"]))
+
+        with patch.object(chat_route, "get_chat_graph", return_value=graph), \
+                patch("app.services.agents.cascade.get_llm", return_value=big), \
+                patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", False):
+            frames = [frame async for frame in stream_frames("When does terminal 2 open?")]
+
+        tokens = [frame_data(frame) for frame in frames if frame.startswith("event: token")]
+        assert "".join(token["content"] for token in tokens) == "Terminal 2 opens at six"
+        assert {token["tier"] for token in tokens} == {1}
+
+    @pytest.mark.asyncio
+    async def test_tokens_stream_live_without_cascade(self):
+        llm = TrackingChatModel(messages=iter([AIMessage(content="Terminal 2 opens at six")]))
+        graph = single_agent_graph(llm)
+        finished_at_token = []
+
+        with patch.object(chat_route, "get_chat_graph", return_value=graph), \
+                patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", False), \
+                patch("app.services.agents.cascade.settings.LLM_CASCADE_ENABLED", False):
+            async for frame in stream_frames("When does terminal 2 open?"):
+                if frame.startswith("event: token"):
+                    finished_at_token.append(llm.finished)
+
+        assert finished_at_token
+        # The first token reaches the client while the model is still generating
+        assert finished_at_token[0] is False
@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import Mock, patch
+from langgraph.graph import START, END
+from app.services import graph as graph_module
+from app.services.graph import get_chat_graph, warm_up_graphs, reset_graph_registry
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    reset_graph_registry()
+    yield
+    reset_graph_registry()
+
+class TestGraphRegistry:
+    def test_graph_compiled_once(self):
+        mock_build = Mock(wraps=graph_module.build_chat_graph)
+        with patch.dict(graph_module._GRAPH_BUILDERS, {"chat": mock_build}):
+            first = get_chat_graph()
+            second = get_chat_graph()
+
+        assert first is second
+        assert mock_build.call_count == 1
+
+    def test_warm_up_populates_registry(self):
+        warm_up_graphs()
+        assert "chat" in graph_module._compiled_graphs
+
+    def test_unknown_graph(self):
+        with pytest.raises(KeyError):
+            graph_module.get_graph("missing")
+
+class TestNodeConnections:
+    def test_edges_match_compiled_graph(self):
+        edges = set(graph_module.get_node_connections())
+
+        assert ("ASSISTANT", "HOTEL") in edges
+        assert ("HOTEL", END) in edges
+        assert ("HOTEL", "ASSISTANT") not in edges
+        # Fast-path entry edges go straight to the specialists
+        assert (START, "HOTEL") in edges
+        assert {node for edge in edges for node in edge} <= set(graph_module.get_graph_nodes())
+
+    def test_edges_without_fast_path(self):
+        with patch.object(graph_module.settings, "GRAPH_FAST_PATH_ENABLED", False):
+            entries = {target for source, target in graph_module.get_node_connections() if source == START}
+
+        assert entries == {"ASSISTANT"}
+
+_assistant_process = graph_module.AssistantAgent.process
+
+def _fake_process(node):
+    async def process(self, state):
+        return {"messages": state["messages"] + [("assistant", f"{node} reply")], "next": "NONE"}
+    return process
+
+async def _run(message):
+    path = []
+    async for update in get_chat_graph().astream(
+        {"messages": [("user", message)], "context": {}, "dialog_state": []},
+        stream_mode="updates"
+    ):
+        path.extend(update)
+    return path
+
+async def _final_context(message):
+    state = await get_chat_graph().ainvoke(
+        {"messages": [("user", message)], "context": {"user_id": "u1"}, "dialog_state": []}
+    )
+    return state["context"]
+
+class TestGraphFastPath:
+    @pytest.fixture(autouse=True)
+    def fake_agents(self):
+        with patch.object(graph_module.AssistantAgent, "process", _fake_process("ASSISTANT")), \
+                patch.object(graph_module.HotelBookingAgent, "process", _fake_process("HOTEL")):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_keyword_match_enters_specialist_directly(self):
+        assert await _run("I need a hotel room in Paris") == ["HOTEL"]
+
+    @pytest.mark.asyncio
+    async def test_unmatched_message_goes_through_assistant(self):
+        assert await _run("Hello there") == ["ASSISTANT"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_fast_path_always_starts_at_assistant(self):
+        with patch.object(graph_module.settings, "GRAPH_FAST_PATH_ENABLED", False):
+            assert (await _run("I need a hotel room in Paris"))[0] == "ASSISTANT"
+
+    @pytest.mark.asyncio
+    async def test_both_paths_record_the_same_handoff_context(self):
+        with patch.object(graph_module.AssistantAgent, "process", _assistant_process):
+            fast = await _final_context("I need a hotel room in Paris")
+            with patch.object(graph_module.settings, "GRAPH_FAST_PATH_ENABLED", False):
+                reset_graph_registry()
+                slow = await _final_context("I need a hotel room in Paris")
+
+        assert fast.keys() == slow.keys()
+        assert fast["delegated_to"] == slow["delegated_to"] == "HOTEL"
+        assert "last_assistant_interaction" in fast
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.health import HealthService
+
+@pytest.fixture
+def redis():
+    client = Mock()
+    client.ping = AsyncMock(return_value=True)
+    client.info = AsyncMock(return_value={
+        "used_memory_human": "1M",
+        "connected_clients": 3,
+        "uptime_in_days": 7
+    })
+    cache = Mock()
+    cache.redis = client
+    with patch('app.services.health.get_cache', AsyncMock(return_value=cache)), \
+            patch('app.services.health.settings.REDIS_ENABLED', True):
+        yield client
+
+class TestHealthService:
+    @pytest.mark.asyncio
+    async def test_redis_info_is_cached(self, redis):
+        health = HealthService(timeout=1, info_ttl=60)
+
+        first = await health.check_cache()
+        await health.check_cache()
+
+        assert first["details"]["connected_clients"] == 3
+        assert redis.ping.await_count == 2
+        assert redis.info.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_check_times_out(self):
+        async def hang():
+            await asyncio.sleep(1)
+
+        result = await HealthService(timeout=0.01).run("slow", hang)
+        assert result["status"] == "unhealthy"
+        assert "Timed out" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self, redis):
+        health = HealthService(timeout=1)
+
+        async def slow_check():
+            await asyncio.sleep(0.1)
+            return {"status": "healthy"}
+
+        with patch.object(health, "check_database", slow_check), \
+                patch.object(health, "check_agents", slow_check):
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            result = await health.check_all()
+            elapsed = loop.time() - start
+
+        assert result["status"] == "healthy"
+        assert set(result["checks"]) == {"database", "cache", "agents"}
+        assert elapsed < 0.18
+
+    @pytest.mark.asyncio
+    async def test_failure_degrades_overall_status(self, redis):
+        redis.ping.side_effect = ConnectionError("refused")
+        health = HealthService(timeout=1)
+
+        with patch.object(health, "check_database", AsyncMock(return_value={"status": "healthy"})):
+            result = await health.check_all()
+
+        assert result["status"] == "degraded"
+        assert result["checks"]["cache"]["error"] == "refused"
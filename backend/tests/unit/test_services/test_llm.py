@@ -0,0 +1,26 @@
+import pytest
+from app.services.llm import get_llm, get_http_client, close_llm_clients
+
+@pytest.fixture(autouse=True)
+async def reset_clients():
+    yield
+    await close_llm_clients()
+
+class TestLLMFactory:
+    def test_same_key_reuses_client(self):
+        assert get_llm("gpt-3.5-turbo", 0.7) is get_llm("gpt-3.5-turbo", 0.7)
+
+    def test_different_temperature_creates_client(self):
+        assert get_llm("gpt-3.5-turbo", 0.0) is not get_llm("gpt-3.5-turbo", 0.7)
+
+    def test_clients_share_http_pool(self):
+        first = get_llm("gpt-3.5-turbo", 0.7)
+        second = get_llm("gpt-4-turbo-preview", 0.7)
+        assert first.http_async_client is get_http_client()
+        assert second.http_async_client is get_http_client()
+
+    @pytest.mark.asyncio
+    async def test_close_drops_clients(self):
+        first = get_llm()
+        await close_llm_clients()
+        assert get_llm() is not first
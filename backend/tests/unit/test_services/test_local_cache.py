@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.services.cache import RedisCache
+from app.services.local_cache import LocalCache
+from app.services.state import StateManager
+
+class TestLocalCache:
+    def test_lru_eviction(self):
+        local = LocalCache(max_entries=2, ttl=60)
+        local.set("a", b"1")
+        local.set("b", b"2")
+        local.get("a")
+        local.set("c", b"3")
+
+        assert local.get("b") is None
+        assert local.get("a") == b"1"
+
+    def test_ttl_expiry(self):
+        local = LocalCache(max_entries=10, ttl=0)
+        local.set("a", b"1")
+        assert local.get("a") is None
+
+    def test_stale_read_not_cached_after_invalidation(self):
+        local = LocalCache(max_entries=10, ttl=60)
+        epoch = local.epoch
+        local.discard(["a"])
+        local.set("a", b"stale", epoch)
+
+        assert local.get("a") is None
+
+@pytest.fixture
+def workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def worker():
+        return RedisCache(
+            fakeredis.FakeAsyncRedis(server=server),
+            local=LocalCache(max_entries=100, ttl=60)
+        )
+
+    with patch('app.services.cache.settings.REDIS_ENABLED', True), \
+            patch('app.services.state.settings.REDIS_ENABLED', True):
+        yield worker(), worker()
+
+async def wait_for(condition, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met"
+        await asyncio.sleep(0.01)
+
+class TestTwoTierCache:
+    @pytest.mark.asyncio
+    async def test_read_served_locally(self, workers):
+        cache, _ = workers
+        await cache.set("k", {"v": 1})
+
+        with patch.object(cache.redis, "get") as redis_get:
+            assert await cache.get("k") == {"v": 1}
+        redis_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_other_workers(self, workers):
+        first, second = workers
+        first.start()
+        second.start()
+        await asyncio.sleep(0.05)
+
+        await first.set("k", {"v": 1})
+        assert await second.get("k") == {"v": 1}
+
+        await first.set("k", {"v": 2})
+        await wait_for(lambda: second.local.get("k") is None)
+        assert await second.get("k") == {"v": 2}
+
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_state_reads_use_local_tier(self, workers):
+        cache, _ = workers
+        manager = StateManager("user_1")
+        manager._cache = cache
+
+        await manager.apply_delta(messages=[["user", "hi"]], next="FLIGHT")
+        assert (await manager.get_state())["next"] == "FLIGHT"
+        assert cache.local.get("state:user_1") is not None
+
+        await manager.apply_delta(next="HOTEL")
+        assert cache.local.get("state:user_1") is None
+        assert (await manager.get_state())["next"] == "HOTEL"
@@ -0,0 +1,133 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from app.services.agents.assistant import AssistantAgent
+from app.services.agents.base import BaseAgent
+from app.services.memory import ConversationMemory, conversation_scope
+
+def one_token(message):
+    return 1
+
+@pytest.fixture
+def memory():
+    return ConversationMemory(max_tokens=4, max_conversations=2, idle_ttl=3600, token_counter=one_token)
+
+def conversation(turns: int, start: int = 0):
+    messages = []
+    for i in range(start, start + turns):
+        messages.append(HumanMessage(content=f"question {i}"))
+        messages.append(AIMessage(content=f"answer {i}"))
+    return messages
+
+class TestConversationMemory:
+    def test_scope_from_state(self):
+        state = {"context": {"user_id": "u1", "conversation_id": "c1"}}
+        assert conversation_scope(state) == "u1:c1"
+        assert conversation_scope(None) == "anonymous:default"
+
+    @pytest.mark.asyncio
+    async def test_window_respects_token_budget(self, memory):
+        memory.add_messages("u1:c1", conversation(5))
+
+        messages = await memory.get_messages("u1:c1")
+        assert [msg.content for msg in messages] == [
+            "question 3", "answer 3", "question 4", "answer 4"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_repeated_history_is_not_duplicated(self, memory):
+        history = conversation(1)
+        memory.add_messages("u1:c1", history)
+        memory.add_messages("u1:c1", history)
+
+        assert len(await memory.get_messages("u1:c1")) == 2
+
+    @pytest.mark.asyncio
+    async def test_one_message_per_turn(self, memory):
+        memory.add_messages("u1:c1", [HumanMessage(content="question 1")])
+        memory.add_messages("u1:c1", [AIMessage(content="answer 1")])
+        memory.add_messages("u1:c1", [HumanMessage(content="question 2")])
+
+        assert [msg.content for msg in await memory.get_messages("u1:c1")] == [
+            "question 1", "answer 1", "question 2"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_repeated_question_is_a_new_turn(self, memory):
+        memory.add_messages("u1:c1", [HumanMessage(content="yes"), AIMessage(content="Booked.")])
+        memory.add_messages("u1:c1", [HumanMessage(content="yes")])
+
+        assert [msg.content for msg in await memory.get_messages("u1:c1")] == ["yes", "Booked.", "yes"]
+
+    @pytest.mark.asyncio
+    async def test_agent_reply_recorded(self, memory):
+        class EchoAgent(BaseAgent):
+            async def process(self, state):
+                return {"messages": state["messages"] + [("assistant", "echo")]}
+
+        agent = EchoAgent(llm=Mock(), memory=memory)
+        state = {"context": {"user_id": "u1", "conversation_id": "c1"}}
+        await agent.run({**state, "messages": [("user", "hello")]})
+        await agent.run({**state, "messages": [("user", "again")]})
+
+        assert [msg.content for msg in await memory.get_messages("u1:c1")] == [
+            "hello", "echo", "again", "echo"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_llm_call_answers_with_apology(self, memory):
+        agent = AssistantAgent(llm=Mock(), memory=memory)
+        agent._safe_llm_call = AsyncMock(return_value=None)
+        state = {"context": {"user_id": "u1", "conversation_id": "c1"}, "messages": [("user", "hello")]}
+
+        result = await agent.run(state)
+
+        assert result["messages"][-1][1].startswith("I apologize")
+        assert "error" not in result
+        assert [msg.content for msg in await memory.get_messages("u1:c1")] == [
+            "hello", result["messages"][-1][1]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_empty_reply_not_recorded(self, memory):
+        class SilentAgent(BaseAgent):
+            async def process(self, state):
+                return {"messages": state["messages"] + [("assistant", None)]}
+
+        agent = SilentAgent(llm=Mock(), memory=memory)
+        await agent.run({"context": {"user_id": "u1"}, "messages": [("user", "hello")]})
+
+        assert [msg.content for msg in await memory.get_messages("u1:default")] == ["hello"]
+
+    def test_footprint_stays_flat(self, memory):
+        history = []
+        for turn in range(200):
+            history += conversation(1, start=turn)
+            memory.add_messages("u1:c1", list(history))
+
+        stats = memory.stats()
+        assert stats["messages"] == 4
+        assert stats["tokens"] == 4
+
+    def test_least_recently_used_conversation_evicted(self, memory):
+        memory.add_messages("u1:c1", conversation(1))
+        memory.add_messages("u2:c1", conversation(1))
+        memory.add_messages("u3:c1", conversation(1))
+
+        assert memory.stats()["conversations"] == 2
+        assert "u1:c1" not in memory._windows
+
+    @pytest.mark.asyncio
+    async def test_rolling_summary(self):
+        summarizer = AsyncMock(return_value="Customer wants flights to Paris")
+        memory = ConversationMemory(
+            max_tokens=2, max_conversations=10, idle_ttl=3600,
+            summarizer=summarizer, token_counter=one_token
+        )
+        memory.add_messages("u1:c1", conversation(2))
+
+        messages = await memory.get_messages("u1:c1")
+        assert isinstance(messages[0], SystemMessage)
+        assert "flights to Paris" in messages[0].content
+        assert len(messages) == 3
+        summarizer.assert_awaited_once()
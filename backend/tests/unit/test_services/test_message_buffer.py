@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from pymongo.errors import BulkWriteError
+from app.services.database.message_buffer import MessageBuffer
+
+class FakeMessages:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    async def insert_many(self, documents):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("network down")
+        self.batches.append(list(documents))
+
+    @property
+    def written(self):
+        return [doc["n"] for batch in self.batches for doc in batch]
+
+class TestMessageBuffer:
+    @pytest.mark.asyncio
+    async def test_flushes_in_batches(self):
+        messages = FakeMessages()
+        buffer = MessageBuffer(messages.insert_many, batch_size=3, flush_interval=60, max_size=100)
+
+        for n in range(7):
+            await buffer.add({"n": n})
+        await buffer.flush()
+
+        assert [len(batch) for batch in messages.batches] == [3, 3, 1]
+        assert messages.written == list(range(7))
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_background_flush_on_interval(self):
+        messages = FakeMessages()
+        buffer = MessageBuffer(messages.insert_many, batch_size=100, flush_interval=0.01, max_size=1000)
+        buffer.start()
+
+        await buffer.add({"n": 1})
+        await asyncio.sleep(0.05)
+        await buffer.stop()
+
+        assert messages.written == [1]
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self):
+        messages = FakeMessages()
+        buffer = MessageBuffer(messages.insert_many, batch_size=100, flush_interval=60, max_size=1000)
+        buffer.start()
+
+        for n in range(5):
+            await buffer.add({"n": n})
+        await buffer.stop()
+
+        assert messages.written == list(range(5))
+        assert not buffer.running
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_in_order(self):
+        messages = FakeMessages(fail_times=1)
+        buffer = MessageBuffer(messages.insert_many, batch_size=10, flush_interval=60, max_size=100)
+
+        await buffer.add({"n": 1})
+        await buffer.flush()
+        assert len(buffer) == 1
+
+        await buffer.add({"n": 2})
+        await buffer.flush()
+        assert messages.written == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_not_retried(self):
+        async def insert_many(documents):
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 11000}]})
+
+        buffer = MessageBuffer(insert_many, batch_size=10, flush_interval=60, max_size=100)
+        await buffer.add({"n": 1})
+        await buffer.flush()
+
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_flushes_inline(self):
+        messages = FakeMessages()
+        buffer = MessageBuffer(messages.insert_many, batch_size=10, flush_interval=60, max_size=4)
+
+        for n in range(4):
+            await buffer.add({"n": n})
+
+        assert messages.written == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_drops_oldest_while_store_is_down(self):
+        messages = FakeMessages(fail_times=100)
+        buffer = MessageBuffer(messages.insert_many, batch_size=10, flush_interval=60, max_size=4)
+
+        for n in range(4):
+            await buffer.add({"n": n})
+        # The inline flush at max_size failed; later writes do not re-flush
+        assert messages.fail_times == 99
+
+        for n in range(4, 10):
+            await buffer.add({"n": n})
+        assert messages.fail_times == 99
+        assert [doc["n"] for doc in buffer._pending] == [6, 7, 8, 9]
+
+        messages.fail_times = 0
+        await buffer.flush()
+        assert messages.written == [6, 7, 8, 9]
@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.services.database import MongoDB
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda doc: doc[field], reverse=direction == -1)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents[:length]
+
+def _matches(document, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(document, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            for op, value in condition.items():
+                if op == "$gt" and not document[field] > value:
+                    return False
+                if op == "$lt" and not document[field] < value:
+                    return False
+        elif document.get(field) != condition:
+            return False
+    return True
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection=None):
+        return FakeCursor([doc for doc in self.documents if _matches(doc, query)])
+
+@pytest.fixture
+def db():
+    start = datetime(2024, 1, 1)
+    # Pairs share timestamps so the _id tie-breaker is exercised
+    messages = [
+        {"_id": ObjectId(), "conversation_id": "c1", "created_at": start + timedelta(seconds=i // 2), "n": i}
+        for i in range(7)
+    ]
+    database = MongoDB()
+    database.db = {"messages": FakeCollection(messages)}
+    return database
+
+class TestCursorPagination:
+    def test_cursor_round_trip(self):
+        document = {"_id": ObjectId(), "created_at": datetime(2024, 5, 1, 12, 30)}
+        created_at, document_id = MongoDB.decode_cursor(MongoDB.encode_cursor(document))
+        assert created_at == document["created_at"]
+        assert document_id == document["_id"]
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            MongoDB.decode_cursor("not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_all_messages_once(self, db):
+        seen, cursor = [], None
+        while True:
+            page = await db.get_conversation_messages_page("c1", cursor=cursor, limit=3)
+            seen.extend(doc["n"] for doc in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == list(range(7))
+
+    def test_projection_keeps_cursor_fields(self):
+        assert MongoDB._keyset_projection({"content": 1}) == {"content": 1, "_id": 1, "created_at": 1}
+        assert MongoDB._keyset_projection({"metadata": 0}) == {"metadata": 0}
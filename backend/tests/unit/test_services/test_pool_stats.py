@@ -0,0 +1,33 @@
+from pymongo import monitoring
+from app.services.database import PoolStats
+
+ADDRESS = ("localhost", 27017)
+
+class TestPoolStats:
+    def test_tracks_checkouts_and_wait_queue(self):
+        stats = PoolStats()
+        stats.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+        stats.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+        stats.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+
+        assert stats.snapshot()["wait_queue_size"] == 2
+
+        stats.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1, 0.001))
+        snapshot = stats.snapshot()
+        assert snapshot["checked_out"] == 1
+        assert snapshot["wait_queue_size"] == 1
+        assert snapshot["open_connections"] == 1
+
+        stats.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+        assert stats.snapshot()["checked_out"] == 0
+
+    def test_failed_checkout_leaves_queue(self):
+        stats = PoolStats()
+        stats.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+        stats.connection_check_out_failed(
+            monitoring.ConnectionCheckOutFailedEvent(ADDRESS, monitoring.ConnectionCheckOutFailedReason.TIMEOUT, 0.5)
+        )
+
+        snapshot = stats.snapshot()
+        assert snapshot["wait_queue_size"] == 0
+        assert snapshot["check_out_failures"] == 1
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import HTTPException
+from app.services.rate_limit import RateLimiter
+
+@pytest.fixture
+def limiter():
+    return RateLimiter(max_requests=2, window_seconds=60)
+
+@pytest.fixture
+def no_redis():
+    cache = Mock()
+    cache.redis = None
+    with patch('app.services.rate_limit.get_cache', AsyncMock(return_value=cache)):
+        yield
+
+class TestLocalRateLimiter:
+    def test_allows_within_limit(self, limiter):
+        assert limiter._check_local("user_1", 0.0) == (True, 0.0)
+        assert limiter._check_local("user_1", 1.0) == (True, 0.0)
+
+    def test_blocks_over_limit_with_retry_after(self, limiter):
+        limiter._check_local("user_1", 0.0)
+        limiter._check_local("user_1", 10.0)
+
+        allowed, retry_after = limiter._check_local("user_1", 20.0)
+        assert allowed is False
+        assert retry_after == 40.0
+
+    def test_window_slides(self, limiter):
+        limiter._check_local("user_1", 0.0)
+        limiter._check_local("user_1", 10.0)
+
+        assert limiter._check_local("user_1", 61.0) == (True, 0.0)
+
+    def test_idle_users_expire(self, limiter):
+        limiter._check_local("user_1", 0.0)
+        limiter._check_local("user_2", 100.0)
+
+        assert "user_1" not in limiter._requests
+        assert "user_2" in limiter._requests
+
+    @pytest.mark.asyncio
+    async def test_raises_429_with_header(self, limiter, no_redis):
+        await limiter.check_rate_limit("user_1")
+        await limiter.check_rate_limit("user_1")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter.check_rate_limit("user_1")
+
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+class TestRedisRateLimiter:
+    @pytest.mark.asyncio
+    async def test_uses_redis_script(self, limiter):
+        script = AsyncMock(return_value=[0, 1500])
+        cache = Mock()
+        cache.redis.register_script = Mock(return_value=script)
+
+        with patch('app.services.rate_limit.get_cache', AsyncMock(return_value=cache)), \
+             patch('app.services.rate_limit.settings.REDIS_ENABLED', True):
+            with pytest.raises(HTTPException) as exc_info:
+                await limiter.check_rate_limit("user_1")
+
+        assert exc_info.value.headers["Retry-After"] == "2"
+        script.assert_awaited_once()
+        assert not limiter._requests
@@ -0,0 +1,222 @@
+import pytest
+import asyncio
+import json
+import httpx
+from unittest.mock import Mock, patch
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from app.core.exceptions import AdmissionTimeoutError, CircuitOpenError
+from app.services.agents.base import BaseAgent
+from app.services.resilience import CircuitBreaker, LatencyTracker, ResilientCaller, backoff
+
+def caller(**kwargs):
+    options = dict(
+        max_retries=3,
+        base_delay=0.0,
+        max_delay=0.0,
+        hedge_enabled=False,
+        hedge_min_delay=0.0,
+        hedge_min_samples=1,
+        failure_threshold=5,
+        reset_timeout=30.0
+    )
+    options.update(kwargs)
+    return ResilientCaller(**options)
+
+def completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-test",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+    }
+
+class FakeOpenAI:
+    """In-process stand-in for the chat completions endpoint."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        assert request.url.path == "/v1/chat/completions"
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": "upstream trouble", "type": "server_error"}})
+        body = json.loads(request.content)
+        return httpx.Response(200, json=completion(f"echo: {body['messages'][-1]['content']}"))
+
+def fake_agent(server: FakeOpenAI) -> BaseAgent:
+    llm = ChatOpenAI(
+        model="gpt-test",
+        api_key="sk-test",
+        base_url="http://fake-openai/v1",
+        http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+        max_retries=0
+    )
+    return BaseAgent(llm=llm, memory=Mock())
+
+class TestBackoff:
+    def test_full_jitter_bounds(self):
+        delays = [backoff(attempt, 0.5, 4.0) for attempt in range(10) for _ in range(20)]
+        assert all(0 <= delay <= 4.0 for delay in delays)
+        assert max(backoff(0, 0.5, 4.0) for _ in range(50)) <= 0.5
+
+class TestCircuitBreaker:
+    def test_opens_and_recovers(self):
+        breaker = CircuitBreaker("m", failure_threshold=2, reset_timeout=0.0)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # Reset timeout passed: one trial call is let through
+        breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker("m", failure_threshold=1, reset_timeout=60.0)
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.allow()
+        assert error.value.status_code == 503
+        assert error.value.details["model"] == "m"
+
+class TestLatencyTracker:
+    def test_percentile(self):
+        tracker = LatencyTracker()
+        for value in range(1, 101):
+            tracker.record(value / 100)
+        assert tracker.percentile(0.95) == 0.95
+        assert LatencyTracker().percentile(0.95) is None
+
+class TestResilientCaller:
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self):
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise httpx.ConnectError("refused")
+            return "ok"
+
+        assert await caller().call("m", call) == "ok"
+        assert attempts == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            raise httpx.ReadTimeout("slow")
+
+        with pytest.raises(httpx.ReadTimeout):
+            await caller(max_retries=2).call("m", call)
+        assert attempts == 3
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_other_errors(self):
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            raise ValueError("bad prompt")
+
+        with pytest.raises(ValueError):
+            await caller().call("m", call)
+        assert attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_releases_breaker(self):
+        resilience = caller(failure_threshold=1, reset_timeout=0.0)
+        resilience.breaker("m").record_failure()
+
+        task = asyncio.ensure_future(resilience.call("m", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        async def call():
+            return "ok"
+
+        assert await resilience.call("m", call) == "ok"
+        assert resilience.breaker("m").state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_admission_timeout_is_not_an_upstream_failure(self):
+        resilience = caller(failure_threshold=1)
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            raise AdmissionTimeoutError("m", 30.0)
+
+        with pytest.raises(AdmissionTimeoutError):
+            await resilience.call("m", call)
+        assert attempts == 1
+        assert resilience.breaker("m").state == CircuitBreaker.CLOSED
+        assert resilience.breaker("m").failures == 0
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins(self):
+        resilience = caller(hedge_enabled=True)
+        resilience.latency("m").record(0.01)
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(1.0 if attempts == 1 else 0.0)
+            return f"attempt {attempts}"
+
+        result = await asyncio.wait_for(resilience.call("m", call), 0.5)
+        assert result == "attempt 2"
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_before_enough_samples(self):
+        resilience = caller(hedge_enabled=True, hedge_min_samples=5)
+        assert resilience.hedge_delay("m") is None
+
+class TestFakeOpenAI:
+    @pytest.mark.asyncio
+    async def test_recovers_from_server_errors(self):
+        server = FakeOpenAI([503, 429])
+        agent = fake_agent(server)
+
+        with patch("app.services.agents.base.get_resilient_caller", return_value=caller()), \
+                patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", False), \
+                patch("app.services.agents.cascade.settings.LLM_CASCADE_ENABLED", False):
+            result = await agent._safe_llm_call([HumanMessage(content="hello")])
+
+        assert result == "echo: hello"
+        assert server.requests == 3
+
+    @pytest.mark.asyncio
+    async def test_circuit_fails_fast_while_upstream_is_down(self):
+        server = FakeOpenAI([500] * 100)
+        agent = fake_agent(server)
+        resilience = caller(max_retries=1, failure_threshold=3)
+
+        with patch("app.services.agents.base.get_resilient_caller", return_value=resilience), \
+                patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", False), \
+                patch("app.services.agents.cascade.settings.LLM_CASCADE_ENABLED", False):
+            results = [await agent._safe_llm_call([HumanMessage(content=f"q{i}")]) for i in range(5)]
+
+        assert results == [None] * 5
+        assert server.requests == 3
+        assert resilience.breaker("gpt-test").state == CircuitBreaker.OPEN
@@ -0,0 +1,205 @@
+import pytest
+import json
+from unittest.mock import AsyncMock, Mock, patch
+from langchain_core.messages import HumanMessage, AIMessage
+from app.services.agents.booking.hotel import HotelBookingAgent
+from app.services.response_cache import ResponseCache
+
+@pytest.fixture
+def redis_cache():
+    cache = Mock()
+    cache.redis = Mock()
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock(return_value=True)
+    return cache
+
+@pytest.fixture(autouse=True)
+def redis_enabled():
+    with patch('app.services.response_cache.settings.REDIS_ENABLED', True):
+        yield
+
+class TestResponseCache:
+    def test_key_depends_on_prompt(self):
+        messages = [HumanMessage(content="Flights to Paris?")]
+        key = ResponseCache.make_key("gpt-3.5-turbo", "system", messages)
+
+        assert key == ResponseCache.make_key("gpt-3.5-turbo", "system", messages)
+        assert key != ResponseCache.make_key("gpt-4", "system", messages)
+        assert key != ResponseCache.make_key("gpt-3.5-turbo", "other", messages)
+
+    @pytest.mark.asyncio
+    async def test_exact_hit(self, redis_cache):
+        redis_cache.get.return_value = {"response": "cached answer"}
+        response_cache = ResponseCache(cache=redis_cache)
+
+        result = await response_cache.lookup(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Flights to Paris?")]
+        )
+        assert result == "cached answer"
+
+    @pytest.mark.asyncio
+    async def test_miss_without_semantic_layer(self, redis_cache):
+        response_cache = ResponseCache(cache=redis_cache)
+
+        result = await response_cache.lookup(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Flights to Paris?")]
+        )
+        assert result is None
+        redis_cache.redis.lrange.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_semantic_hit(self, redis_cache):
+        embedder = AsyncMock(return_value=[1.0, 0.0])
+        response_cache = ResponseCache(cache=redis_cache, embedder=embedder, similarity_threshold=0.9)
+        redis_cache.redis.lrange = AsyncMock(return_value=[
+            json.dumps({"digest": "abc", "embedding": [0.99, 0.14]})
+        ])
+        redis_cache.get.side_effect = [None, {"response": "similar answer"}]
+
+        result = await response_cache.lookup(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Any flights to Paris?")]
+        )
+        assert result == "similar answer"
+        redis_cache.get.assert_awaited_with("llmcache:FlightBookingAgent:abc")
+
+    @pytest.mark.asyncio
+    async def test_semantic_lookup_reads_one_capped_scope_bucket(self, redis_cache):
+        embedder = AsyncMock(return_value=[1.0, 0.0])
+        response_cache = ResponseCache(
+            cache=redis_cache, embedder=embedder, similarity_threshold=0.9, max_candidates=20
+        )
+        redis_cache.redis.lrange = AsyncMock(return_value=[])
+
+        await response_cache.lookup(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Any flights to Paris?")]
+        )
+
+        scope = ResponseCache._scope_digest("gpt-3.5-turbo", "system")
+        redis_cache.redis.lrange.assert_awaited_once_with(
+            f"llmcache:FlightBookingAgent:vectors:{scope}", 0, 19
+        )
+
+    def test_semantic_only_for_opening_question(self):
+        response_cache = ResponseCache(cache=Mock(), embedder=AsyncMock())
+
+        assert response_cache._semantic_candidate([
+            HumanMessage(content="Flights to Paris?"),
+            AIMessage(content="Let me help you with your flight arrangements.")
+        ]) == "flights to paris?"
+        assert response_cache._semantic_candidate([
+            HumanMessage(content="Flights to Paris?"),
+            AIMessage(content="Sure."),
+            HumanMessage(content="And back?")
+        ]) is None
+
+@pytest.fixture
+def fake_redis_cache():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.services.cache import RedisCache
+
+    with patch('app.services.cache.settings.REDIS_ENABLED', True):
+        yield RedisCache(fakeredis.FakeAsyncRedis())
+
+class TestSemanticBuckets:
+    @pytest.mark.asyncio
+    async def test_bucket_capped_per_scope(self, fake_redis_cache):
+        embedder = AsyncMock(return_value=[1.0, 0.0])
+        response_cache = ResponseCache(
+            cache=fake_redis_cache, embedder=embedder, similarity_threshold=0.9, max_candidates=3
+        )
+        for i in range(10):
+            await response_cache.store(
+                "FlightBookingAgent", "gpt-3.5-turbo", "system",
+                [HumanMessage(content=f"Flights to city {i}?")], f"answer {i}",
+                ttl=60, max_entries=100
+            )
+
+        scope = ResponseCache._scope_digest("gpt-3.5-turbo", "system")
+        bucket = f"llmcache:FlightBookingAgent:vectors:{scope}"
+        assert await fake_redis_cache.redis.llen(bucket) == 3
+        assert 0 < await fake_redis_cache.redis.ttl(bucket) <= 60
+        # The most recent similar question answers
+        assert await response_cache.lookup(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Any flights to a city?")]
+        ) == "answer 9"
+
+    @pytest.mark.asyncio
+    async def test_other_scope_never_matches(self, fake_redis_cache):
+        embedder = AsyncMock(return_value=[1.0, 0.0])
+        response_cache = ResponseCache(cache=fake_redis_cache, embedder=embedder, similarity_threshold=0.9)
+        await response_cache.store(
+            "FlightBookingAgent", "gpt-3.5-turbo", "another user's context",
+            [HumanMessage(content="Flights to Paris?")], "their answer",
+            ttl=60, max_entries=100
+        )
+
+        assert await response_cache.lookup(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Any flights to Paris?")]
+        ) is None
+
+    @pytest.mark.asyncio
+    async def test_stale_vector_dropped(self, fake_redis_cache):
+        embedder = AsyncMock(return_value=[1.0, 0.0])
+        response_cache = ResponseCache(cache=fake_redis_cache, embedder=embedder, similarity_threshold=0.9)
+        await response_cache.store(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Flights to Paris?")], "answer",
+            ttl=60, max_entries=1
+        )
+        # Evicts the first entry but leaves its vector in the bucket
+        await response_cache.store(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Hello")], "hi",
+            ttl=60, max_entries=1
+        )
+        scope = ResponseCache._scope_digest("gpt-3.5-turbo", "system")
+        bucket = f"llmcache:FlightBookingAgent:vectors:{scope}"
+        await fake_redis_cache.redis.ltrim(bucket, 1, -1)
+
+        assert await response_cache.lookup(
+            "FlightBookingAgent", "gpt-3.5-turbo", "system",
+            [HumanMessage(content="Any flights to Paris?")]
+        ) is None
+        assert await fake_redis_cache.redis.llen(bucket) == 0
+
+class TestPromptScope:
+    @pytest.fixture
+    def agent(self):
+        return HotelBookingAgent(llm=Mock(), memory=Mock())
+
+    def test_stable_across_users_and_turns(self, agent):
+        first = agent.prompt_scope({"context": {
+            "user_id": "u1", "last_hotel_interaction": "2026-10-17T10:00:00"
+        }})
+        second = agent.prompt_scope({"context": {
+            "user_id": "u2", "last_hotel_interaction": "2026-10-17T11:30:00", "delegated_to": "HOTEL"
+        }})
+        assert first == second
+
+    def test_answer_shaping_context_changes_scope(self, agent):
+        plain = agent.prompt_scope({"context": {"user_id": "u1"}})
+        preferences = agent.prompt_scope({"context": {
+            "user_id": "u1", "hotel_preferences": {"location": "paris"}
+        }})
+        assert plain != preferences
+
+    @pytest.mark.asyncio
+    async def test_agent_prompt_hits_across_turns(self, agent):
+        response_cache = Mock()
+        response_cache.lookup = AsyncMock(return_value="cached answer")
+        state = {"messages": [("user", "Any hotels in Paris?")], "context": {"user_id": "u1"}}
+        agent.memory.get_messages = AsyncMock(return_value=[HumanMessage(content="Any hotels in Paris?")])
+
+        with patch("app.services.agents.base.get_response_cache", return_value=response_cache), \
+                patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", True):
+            await agent.process(state)
+            await agent.process({**state, "context": {"user_id": "u2"}})
+
+        first, second = [call.args for call in response_cache.lookup.await_args_list]
+        assert first == second
@@ -0,0 +1,43 @@
+import json
+import pytest
+from app.services.serialization import StateSerializer, MAGIC
+
+STATE = {
+    "messages": [["user", "I need a flight to Paris"], ["assistant", "When would you like to travel?"]],
+    "next": "FLIGHT",
+    "context": {"user_id": "user_1", "passengers": 2},
+    "dialog_state": ["ASSISTANT", "FLIGHT"]
+}
+
+class TestStateSerializer:
+    @pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+    @pytest.mark.parametrize("compression", ["none", "zlib", "zstd", "lz4"])
+    def test_round_trip(self, serializer, compression):
+        codec = StateSerializer(serializer=serializer, compression=compression, threshold=0)
+        assert codec.loads(codec.dumps(STATE)) == STATE
+
+    def test_reads_legacy_json(self):
+        codec = StateSerializer(serializer="msgpack", compression="zstd")
+        assert codec.loads(json.dumps(STATE)) == STATE
+        assert codec.loads(json.dumps(STATE).encode()) == STATE
+
+    def test_reads_values_written_with_other_codecs(self):
+        written = StateSerializer(serializer="json", compression="zlib", threshold=0).dumps(STATE)
+        assert StateSerializer(serializer="msgpack", compression="lz4").loads(written) == STATE
+
+    def test_small_values_not_compressed(self):
+        codec = StateSerializer(serializer="msgpack", compression="zstd", threshold=1024)
+        data = codec.dumps({"next": "FLIGHT"})
+        assert data[0] == MAGIC
+        assert data[3] == 0
+
+    def test_unknown_codec_falls_back(self):
+        codec = StateSerializer(serializer="pickle", compression="brotli")
+        assert codec.serializer == "json"
+        assert codec.compression is None
+
+    def test_newer_format_rejected(self):
+        data = bytearray(StateSerializer(serializer="json").dumps(STATE))
+        data[1] = 99
+        with pytest.raises(ValueError):
+            StateSerializer().loads(bytes(data))
@@ -0,0 +1,125 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+from langchain_core.messages import AIMessage, HumanMessage
+from app.services.single_flight import SingleFlight, prompt_key
+from app.services.agents.base import BaseAgent
+from app.services.agents.booking.flight import FlightBookingAgent
+from app.core.metrics import LLM_COALESCED
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        calls = 0
+        coalesced = Mock()
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "answer"
+
+        results = await asyncio.gather(*[flight.do("k", call, coalesced) for _ in range(5)])
+
+        assert results == ["answer"] * 5
+        assert calls == 1
+        assert coalesced.call_count == 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_shared(self):
+        flight = SingleFlight()
+        call = AsyncMock(return_value="answer")
+
+        await flight.do("k", call)
+        await flight.do("k", call)
+
+        assert call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*[flight.do("k", call) for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return "answer"
+
+        first = asyncio.create_task(flight.do("k", call))
+        second = asyncio.create_task(flight.do("k", call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "answer"
+
+    def test_prompt_key_normalises_whitespace_and_case(self):
+        a = prompt_key("gpt", "System", [HumanMessage(content="Any  deals on\nflights?")])
+        b = prompt_key("gpt", "system", [HumanMessage(content="any deals on flights? ")])
+        c = prompt_key("gpt", "system", [HumanMessage(content="any deals on hotels?")])
+        assert a == b
+        assert a != c
+
+class TestCoalescedLLMCalls:
+    @pytest.mark.asyncio
+    async def test_identical_prompts_call_llm_once(self):
+        started = asyncio.Event()
+
+        async def ainvoke(messages, config=None):
+            started.set()
+            await asyncio.sleep(0.01)
+            return AIMessage(content="50% off flights to Lisbon")
+
+        llm = Mock(model_name="test-model", temperature=0.0)
+        llm.ainvoke = AsyncMock(side_effect=ainvoke)
+        agent = BaseAgent(llm=llm, memory=Mock())
+        before = LLM_COALESCED.labels(agent_type="BaseAgent")._value.get()
+
+        with patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", False):
+            results = await asyncio.gather(*[
+                agent._safe_llm_call([HumanMessage(content="What's on sale today?")])
+                for _ in range(10)
+            ])
+
+        assert results == ["50% off flights to Lisbon"] * 10
+        assert llm.ainvoke.await_count == 1
+        assert LLM_COALESCED.labels(agent_type="BaseAgent")._value.get() - before == 9
+
+    @pytest.mark.asyncio
+    async def test_agent_prompts_from_different_users_coalesce(self):
+        async def ainvoke(messages, config=None):
+            await asyncio.sleep(0.01)
+            return AIMessage(content="Direct flights to Lisbon leave daily at 9am.")
+
+        llm = Mock(model_name="test-model", temperature=0.0)
+        llm.ainvoke = AsyncMock(side_effect=ainvoke)
+        memory = Mock()
+        memory.get_messages = AsyncMock(return_value=[HumanMessage(content="Any flights to Lisbon?")])
+        agent = FlightBookingAgent(llm=llm, memory=memory)
+
+        with patch("app.services.agents.base.settings.LLM_CACHE_ENABLED", False):
+            results = await asyncio.gather(*[
+                agent.process({
+                    "messages": [("user", "Any flights to Lisbon?")],
+                    "context": {"user_id": f"user_{i}"}
+                })
+                for i in range(5)
+            ])
+
+        assert llm.ainvoke.await_count == 1
+        assert all(
+            result["messages"][-1] == ("assistant", "Direct flights to Lisbon leave daily at 9am.")
+            for result in results
+        )
@@ -1,6 +1,8 @@
 import pytest
-from unittest.mock import Mock, patch
-from app.services.state import StateManager
+from unittest.mock import AsyncMock, Mock, patch
+import json
+from app.services.state import StateManager, StateConflictError
+import asyncio
 from datetime import datetime
 
 @pytest.fixture
@@ -58,4 +60,140 @@ class TestStateManager:
         # Verify only last 10 states are kept
         history = mock_cache.get(f"history:{state_manager.user_id}")
         assert len(history) == 10
-        assert history[-1]["state"]["messages"][0][1] == "message 11" 
\ No newline at end of file
+        assert history[-1]["state"]["messages"][0][1] == "message 11" 
+
+@pytest.fixture
+def redis_state():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.services.cache import RedisCache
+
+    cache = RedisCache(fakeredis.FakeAsyncRedis())
+    with patch('app.services.state.get_cache', AsyncMock(return_value=cache)), \
+            patch('app.services.state.settings.REDIS_ENABLED', True), \
+            patch('app.services.cache.settings.REDIS_ENABLED', True):
+        yield cache
+
+class TestIncrementalState:
+    @pytest.mark.asyncio
+    async def test_apply_delta_appends_and_merges(self, redis_state):
+        manager = StateManager("user_1")
+        await manager.update_state({
+            "messages": [["user", "hi"]],
+            "next": "ASSISTANT",
+            "context": {"user_id": "user_1", "city": "Paris"}
+        })
+
+        await manager.apply_delta(
+            messages=[["assistant", "hello"]],
+            context={"city": "Rome", "nights": 2},
+            next="HOTEL"
+        )
+
+        state = await manager.get_state()
+        assert state["messages"] == [["user", "hi"], ["assistant", "hello"]]
+        assert state["context"] == {"user_id": "user_1", "city": "Rome", "nights": 2}
+        assert state["next"] == "HOTEL"
+
+    @pytest.mark.asyncio
+    async def test_delta_writes_only_new_messages(self, redis_state):
+        manager = StateManager("user_1")
+        await manager.update_state({"messages": [["user", f"m{i}"] for i in range(50)]})
+
+        queued = []
+        make_pipeline = redis_state.redis.pipeline
+
+        def record(*args, **kwargs):
+            pipe = make_pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def recording_execute():
+                queued.extend(command[0] for command in pipe.command_stack)
+                return await execute()
+
+            pipe.execute = recording_execute
+            return pipe
+
+        with patch.object(redis_state.redis, "pipeline", side_effect=record):
+            await manager.apply_delta(messages=[["user", "new"]])
+
+        written = queued
+        assert [args[0] for args in written] == ["RPUSH", "LTRIM", "INCRBY", "EXPIRE", "EXPIRE", "EXPIRE", "EXPIRE"]
+        assert len(written[0]) == 3
+        assert await redis_state.redis.llen("state:user_1:messages") == 51
+
+    @pytest.mark.asyncio
+    async def test_context_key_removed_with_none(self, redis_state):
+        manager = StateManager("user_1")
+        await manager.apply_delta(context={"city": "Paris", "nights": 2})
+        await manager.apply_delta(context={"nights": None})
+
+        assert (await manager.get_state())["context"] == {"city": "Paris"}
+
+    @pytest.mark.asyncio
+    async def test_message_log_is_trimmed(self, redis_state):
+        manager = StateManager("user_1")
+        with patch('app.services.state.settings.STATE_MAX_MESSAGES', 3):
+            await manager.apply_delta(messages=[["user", f"m{i}"] for i in range(5)])
+
+        assert (await manager.get_state())["messages"] == [["user", "m2"], ["user", "m3"], ["user", "m4"]]
+
+    @pytest.mark.asyncio
+    async def test_legacy_blob_is_migrated(self, redis_state):
+        legacy = {"messages": [["user", "old"]], "next": "FLIGHT", "context": {"user_id": "user_1"}}
+        await redis_state.redis.set("state:user_1", json.dumps(legacy))
+
+        manager = StateManager("user_1")
+        assert await manager.get_state() == legacy
+        assert not await redis_state.redis.exists("state:user_1")
+        assert await manager.get_state() == legacy
+
+    @pytest.mark.asyncio
+    async def test_get_states_batches_users(self, redis_state):
+        await StateManager("a").apply_delta(next="FLIGHT")
+
+        states = await StateManager.get_states(["a", "b"])
+        assert states["a"]["next"] == "FLIGHT"
+        assert states["b"] is None
+
+class TestOptimisticConcurrency:
+    @pytest.mark.asyncio
+    async def test_versions_advance_on_write(self, redis_state):
+        manager = StateManager("user_1")
+        await manager.apply_delta(next="FLIGHT")
+        assert manager.version == 1
+
+        reader = StateManager("user_1")
+        await reader.get_state()
+        assert reader.version == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_write_conflicts(self, redis_state):
+        first, second = StateManager("user_1"), StateManager("user_1")
+        await first.apply_delta(next="ASSISTANT")
+        await first.get_state()
+        await second.get_state()
+
+        await first.apply_delta(messages=[["user", "a"]], expected_version=first.version)
+        with pytest.raises(StateConflictError) as error:
+            await second.apply_delta(messages=[["user", "b"]], expected_version=second.version)
+
+        assert error.value.details == {"expected_version": 1, "actual_version": 2}
+        assert (await StateManager("user_1").get_state())["messages"] == [["user", "a"]]
+
+    @pytest.mark.asyncio
+    async def test_lock_serialises_turns(self, redis_state):
+        order = []
+
+        async def turn(name):
+            manager = StateManager("user_1")
+            async with manager.lock():
+                await manager.get_state()
+                order.append(f"{name}:start")
+                await asyncio.sleep(0.01)
+                await manager.apply_delta(messages=[["user", name]], expected_version=manager.version)
+                order.append(f"{name}:end")
+
+        await asyncio.gather(turn("a"), turn("b"))
+
+        assert order == ["a:start", "a:end", "b:start", "b:end"]
+        assert len((await StateManager("user_1").get_state())["messages"]) == 2
@@ -118,4 +118,77 @@ export const getGraphStructure = async () => {
     console.error('Error fetching graph structure:', error);
     throw error;
   }
-}; 
\ No newline at end of file
+}; 
+
+export interface StreamHandlers {
+  onToken?: (content: string, node?: string) => void;
+  onNode?: (event: 'node_start' | 'node_end', node: string) => void;
+  onDone?: (response: ChatResponse) => void;
+  onError?: (detail: string) => void;
+}
+
+export const streamMessage = async (
+  message: string,
+  userId: string,
+  handlers: StreamHandlers
+): Promise<void> => {
+  const payload = {
+    messages: [{
+      role: 'user',
+      content: message,
+      timestamp: new Date().toISOString()
+    }],
+    user_id: userId,
+    context: {}
+  };
+
+  const response = await fetch(`${import.meta.env.VITE_API_URL}/api/v1/chat/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Accept': 'text/event-stream',
+      'Origin': window.location.origin
+    },
+    credentials: 'include',
+    body: JSON.stringify(payload),
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`API error: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // SSE frames are separated by a blank line
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      const eventLine = frame.split('\n').find(line => line.startsWith('event: '));
+      const dataLine = frame.split('\n').find(line => line.startsWith('data: '));
+      if (!eventLine || !dataLine) continue;
+
+      const event = eventLine.slice('event: '.length);
+      const data = JSON.parse(dataLine.slice('data: '.length));
+
+      if (event === 'token') {
+        handlers.onToken?.(data.content, data.node);
+      } else if (event === 'node_start' || event === 'node_end') {
+        handlers.onNode?.(event, data.node);
+      } else if (event === 'done') {
+        handlers.onDone?.(data);
+      } else if (event === 'error') {
+        handlers.onError?.(data.detail);
+      }
+    }
+  }
+};